@@ -1,9 +1,13 @@
+import asyncio
 import os
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.services.database import get_db, Application, ApplicationEvent, Credit, CreditTransaction, ScanHistory, PipelineEntry
+from app.services.database import get_db, Application, ApplicationEvent, Credit, CreditTransaction, ScanHistory, PipelineEntry, Profile, Resume
+from app.services.embeddings import batch_match_scores
 from app.services.auth import get_current_user
+from app.services.blob_store import preload_blobs
+from app.services.serialization import FastJSONResponse
 from pydantic import BaseModel
 from datetime import datetime
 import uuid
@@ -26,8 +30,10 @@ async def list_applications(
         query = query.filter(Application.status == status)
     
     apps = query.order_by(Application.created_at.desc()).all()
+    preload_blobs(db, apps, ["tailored_resume", "cover_letter"])
     
-    return [serialize_application(app) for app in apps]
+    # Rows carry whole tailored resumes; skip jsonable_encoder on the list
+    return FastJSONResponse([serialize_application(app) for app in apps])
 
 
 def serialize_application(app: Application) -> dict:
@@ -420,6 +426,7 @@ async def list_scan_history(
             "location": e.location,
             "portal": e.portal,
             "status": e.status,
+            "match_score": e.match_score,
             "first_seen": e.first_seen.isoformat() if e.first_seen else None,
             "last_seen": e.last_seen.isoformat() if e.last_seen else None,
         }
@@ -443,6 +450,7 @@ async def add_scan_history(
         existing.title = body.get("title", existing.title)
         existing.company = body.get("company", existing.company)
         existing.status = body.get("status", existing.status)
+        existing.description = body.get("description", existing.description)
         db.commit()
         db.refresh(existing)
         return {"id": str(existing.id), "updated": True}
@@ -454,6 +462,7 @@ async def add_scan_history(
         location=body.get("location", ""),
         portal=body.get("portal", ""),
         status=body.get("status", "new"),
+        description=body.get("description"),
         first_seen=datetime.fromisoformat(body["first_seen"]) if body.get("first_seen") else datetime.utcnow(),
         last_seen=datetime.utcnow(),
     )
@@ -481,6 +490,7 @@ async def list_pipeline(
             "company": e.company,
             "section": e.section,
             "location": e.location,
+            "match_score": e.match_score,
             "created_at": e.created_at.isoformat() if e.created_at else None,
         }
         for e in entries
@@ -500,6 +510,7 @@ async def add_pipeline_entry(
         title=body.get("title", ""),
         company=body.get("company", ""),
         section=body.get("section", "pending"),
+        description=body.get("description"),
     )
     db.add(entry)
     db.commit()
@@ -533,5 +544,69 @@ async def update_pipeline_entry(
         entry.title = body["title"]
     if "company" in body:
         entry.company = body["company"]
+    if "description" in body:
+        entry.description = body["description"]
     db.commit()
     return {"id": str(entry.id), "section": entry.section}
+
+
+def _job_text(entry) -> str:
+    """Stored description, or whatever the listing gave us when it was never scraped."""
+    if entry.description:
+        return entry.description
+    return " ".join(part for part in (entry.title, entry.company, entry.location) if part)
+
+
+@router.post("/pipeline/rank")
+async def rank_pipeline(
+    body: dict,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Score all pending pipeline (or scan history) entries against the stored resume"""
+    profile = db.query(Profile).filter(Profile.clerk_id == current_user).first()
+    resume_text = profile.base_resume if profile else None
+    if not resume_text:
+        latest = db.query(Resume).filter(
+            Resume.user_id == current_user, Resume.extracted_text.isnot(None)
+        ).order_by(Resume.created_at.desc()).first()
+        resume_text = latest.extracted_text if latest else None
+    if not resume_text:
+        raise HTTPException(status_code=404, detail="No stored resume to rank against")
+
+    if body.get("source", "pipeline") == "scan_history":
+        model = ScanHistory
+        entries = db.query(ScanHistory).filter(
+            ScanHistory.user_id == current_user,
+            ScanHistory.status.in_(["new", "pending"])
+        ).all()
+    else:
+        model = PipelineEntry
+        entries = db.query(PipelineEntry).filter(
+            PipelineEntry.user_id == current_user,
+            PipelineEntry.section == "pending"
+        ).all()
+
+    # Embedding and scoring every entry is CPU-bound; keep it off the event loop
+    scores = await asyncio.to_thread(batch_match_scores, resume_text, [_job_text(e) for e in entries])
+
+    scored_at = datetime.utcnow()
+    db.bulk_update_mappings(model, [
+        {"id": e.id, "match_score": score, "scored_at": scored_at}
+        for e, score in zip(entries, scores)
+    ])
+    db.commit()
+
+    ranked = sorted(zip(entries, scores), key=lambda pair: pair[1], reverse=True)
+    return [
+        {
+            "id": str(e.id),
+            "job_url": e.job_url,
+            "title": e.title,
+            "company": e.company,
+            "location": e.location,
+            "match_score": score,
+            "has_description": bool(e.description),
+        }
+        for e, score in ranked
+    ]
@@ -3,13 +3,17 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from app.services.database import get_db, Application, get_or_create_credits, Credit, Profile, ApplicationEvent, CreditTransaction
 from app.services.auth import get_current_user
-from app.schemas.application import JobAnalyze, JobApply
-import httpx
+from app.schemas.application import JobAnalyze, JobApply, JobRank
+from app.services.embeddings import rank_jobs
+from app.services.job_analyzer import analyze_job_locally, keyword_match_score
+from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_scheduler import LLMOverloaded, Priority
+from app.services.llm_usage import record_llm_usage
+import asyncio
 import json
 import os
 from datetime import datetime
 import uuid
-from bs4 import BeautifulSoup
 
 router = APIRouter()
 
@@ -51,18 +55,24 @@ async def analyze_job(
         "email": profile.email or ""
     }
     
-    match_score = await get_match_score(job_description, user_profile)
+    # Deterministic analysis covers most postings in milliseconds; the LLM
+    # score is only worth a call when the description is too thin to match on
+    analysis = analyze_job_locally(job_description)
+    if analysis.is_weak_description:
+        match_score = await get_match_score(job_description, user_profile)
+    else:
+        match_score = keyword_match_score(analysis, user_profile["base_resume"])
     
     application = Application(
         user_id=current_user,
         job_url=job.job_url,
-        job_title=job.job_title,
-        company_name=job.company_name,
+        job_title=job.job_title or analysis.job_title or None,
+        company_name=job.company_name or analysis.company_name or None,
         status="analyzed",
         match_score=match_score,
         tailored_resume={
             "summary": f"Matched at {match_score}% to {job.job_title or 'this position'}",
-            "key_skills": ["Python", "JavaScript", "SQL"],
+            "key_skills": analysis.required_skills[:10] or analysis.tools_and_technologies[:10],
             "match_score": match_score
         }
     )
@@ -84,11 +94,110 @@ async def analyze_job(
         "application_id": str(application.id),
         "job_url": job.job_url,
         "match_score": match_score,
+        "job_title": analysis.job_title,
+        "company_name": analysis.company_name,
+        "required_skills": analysis.required_skills,
+        "preferred_skills": analysis.preferred_skills,
+        "tools_and_technologies": analysis.tools_and_technologies,
+        "experience_years_min": analysis.experience_years_min,
+        "is_weak_description": analysis.is_weak_description,
         "credits_remaining": credits.balance,
         "job_description": job_description[:500] if len(job_description) > 500 else job_description
     }
 
 
+@router.post("/jobs/rank")
+async def rank_jobs_for_profile(
+    request: JobRank,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Rank job descriptions against the profile resume; LLM-score only the top K"""
+
+    profile = db.query(Profile).filter(Profile.clerk_id == current_user).first()
+    if not profile or not profile.base_resume:
+        raise HTTPException(status_code=404, detail="No base resume on profile")
+
+    credits = get_or_create_credits(db, current_user)
+    top_k = min(request.top_k, len(request.jobs))
+    if credits.balance < top_k:
+        raise HTTPException(status_code=402, detail="Insufficient credits")
+
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if not openrouter_key:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+
+    # Embedding a few hundred descriptions is CPU-bound
+    ranked = await asyncio.to_thread(
+        rank_jobs,
+        profile.base_resume,
+        [(str(i), job.job_description) for i, job in enumerate(request.jobs)],
+    )
+
+    # Re-score the top K through the orchestrator: one cached resume
+    # extraction, local job analysis and a step-3 match per job, queued at
+    # batch priority behind interactive tailoring
+    top = ranked[:top_k]
+    orchestrator = LLMOrchestrator(api_key=openrouter_key, priority=Priority.BATCH)
+    try:
+        resume = await orchestrator.extract_resume(profile.base_resume)
+        matches = await asyncio.gather(
+            *(
+                orchestrator.step3_calculate_match(
+                    resume, analyze_job_locally(request.jobs[int(i)].job_description)
+                )
+                for i, _ in top
+            ),
+            return_exceptions=True,
+        )
+    except LLMOverloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"AI service busy: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after or 5))},
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
+    finally:
+        record_llm_usage(db, orchestrator.usage, current_user)
+
+    llm_by_index = {
+        int(i): match.overall_score
+        for (i, _), match in zip(top, matches)
+        if not isinstance(match, BaseException)
+    }
+    if llm_by_index:
+        credits.balance -= len(llm_by_index)
+        credits.lifetime_used += len(llm_by_index)
+        db.add(CreditTransaction(
+            user_id=current_user,
+            amount=-len(llm_by_index),
+            type="ranked",
+            description=f"Scored top {len(llm_by_index)} of {len(request.jobs)} jobs"
+        ))
+        db.commit()
+
+    results = []
+    for rank, (i, semantic_score) in enumerate(ranked, start=1):
+        job = request.jobs[int(i)]
+        results.append({
+            "rank": rank,
+            "index": int(i),
+            "job_url": job.job_url,
+            "job_title": job.job_title,
+            "company_name": job.company_name,
+            "semantic_score": semantic_score,
+            "llm_score": llm_by_index.get(int(i)),
+        })
+
+    return {
+        "status": "completed",
+        "total": len(results),
+        "results": results,
+        "credits_remaining": credits.balance,
+    }
+
+
 @router.post("/jobs/apply")
 async def apply_to_job(
     job: JobApply,
@@ -135,6 +244,9 @@ async def apply_to_job(
 
 def scrape_job_description(job_url: str) -> str:
     """Scrape job description from URL"""
+    import httpx
+    from bs4 import BeautifulSoup
+
     try:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -159,6 +271,8 @@ def scrape_job_description(job_url: str) -> str:
 
 async def get_match_score(job_description: str, user_profile: dict) -> int:
     """Get match score from LLM"""
+    import httpx
+
     openrouter_key = os.getenv("OPENROUTER_API_KEY")
     
     if not openrouter_key or openrouter_key == "your_openrouter_key":
@@ -3,7 +3,6 @@ from pydantic import BaseModel, Field, field_validator
 from app.services.opencode_client import get_client
 
 router = APIRouter()
-client = get_client()
 
 
 class TriggerRequest(BaseModel):
@@ -22,31 +21,31 @@ class TriggerRequest(BaseModel):
 
 @router.get("/opencode/health")
 async def opencode_health():
-    health = await client.get_health()
+    health = await get_client().get_health()
     return health
 
 
 @router.get("/opencode/modes")
 async def list_opencode_modes():
-    modes = await client.get_modes()
+    modes = await get_client().get_modes()
     return {"modes": modes}
 
 
 @router.post("/opencode/trigger")
 async def trigger_opencode_mode(body: TriggerRequest):
-    session_id = await client.trigger_mode(body.mode, body.args or {})
+    session_id = await get_client().trigger_mode(body.mode, body.args or {})
     return {"session_id": session_id, "mode": body.mode, "status": "started"}
 
 
 @router.get("/opencode/sessions")
 async def list_opencode_sessions():
-    sessions = await client.list_sessions()
+    sessions = await get_client().list_sessions()
     return {"sessions": sessions}
 
 
 @router.get("/opencode/sessions/{session_id}")
 async def get_opencode_session(session_id: str):
-    session = await client.get_session(session_id)
+    session = await get_client().get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="session not found")
     return {"session": session}
@@ -54,13 +53,13 @@ async def get_opencode_session(session_id: str):
 
 @router.get("/opencode/sessions/{session_id}/events")
 async def get_opencode_session_events(session_id: str, since: int | None = None):
-    events = await client.get_session_events(session_id, since)
+    events = await get_client().get_session_events(session_id, since)
     return {"events": events}
 
 
 @router.get("/opencode/sessions/{session_id}/result")
 async def get_opencode_session_result(session_id: str):
-    result = await client.get_session_result(session_id)
+    result = await get_client().get_session_result(session_id)
     if not result:
         raise HTTPException(status_code=404, detail="session not found")
     return result
@@ -68,5 +67,5 @@ async def get_opencode_session_result(session_id: str):
 
 @router.post("/opencode/sessions/{session_id}/abort")
 async def abort_opencode_session(session_id: str):
-    result = await client.abort_session(session_id)
+    result = await get_client().abort_session(session_id)
     return result
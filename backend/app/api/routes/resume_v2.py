@@ -17,6 +17,8 @@ from app.services.database import get_db, Resume, TailoredResume, ResumeEvent
 from app.services.auth import get_current_user
 from app.services.resume_parser import ResumeParser, extract_text_from_file
 from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.llm_scheduler import LLMOverloaded
+from app.services.llm_usage import record_llm_usage
 from app.services.ats_analyzer import ATSAnalyzer, analyze_resume_for_ats
 from app.services.pdf_generator import generate_resume_pdf
 from app.services.resume_templates import list_templates
@@ -83,6 +85,8 @@ async def tailor_resume_v2(
 
     tailored_id = uuid.uuid4()
 
+    orchestrator = LLMOrchestrator(api_key=openrouter_key)
+
     try:
         log_resume_event(
             db, tailored_id, "started", "Starting resume tailoring pipeline"
@@ -95,7 +99,6 @@ async def tailor_resume_v2(
         structured_resume = parser.parse()
 
         log_resume_event(db, tailored_id, "llm_call", "Calling LLM orchestrator")
-        orchestrator = LLMOrchestrator(api_key=openrouter_key)
 
         job_analysis = await orchestrator.step2_analyze_job(job_description)
         match_result = await orchestrator.step3_calculate_match(
@@ -124,7 +127,6 @@ async def tailor_resume_v2(
             resume_id=resume_id,
             job_description=job_description,
             llm_model="multi-step-orchestrator",
-            llm_raw_response=json.dumps(tailored.model_dump(), indent=2),
             llm_structured_json=tailored.model_dump(),
             template_used=template,
             pdf_path=pdf_path,
@@ -164,8 +166,6 @@ async def tailor_resume_v2(
             resume_id=resume_id,
             job_description=job_description,
             llm_model="multi-step-orchestrator",
-            llm_raw_response="",
-            llm_structured_json={},
             template_used=template,
             pdf_path="",
             status="failed",
@@ -173,8 +173,17 @@ async def tailor_resume_v2(
         db.add(error_record)
         db.commit()
 
+        if isinstance(e, LLMOverloaded):
+            raise HTTPException(
+                status_code=503,
+                detail=f"AI service busy: {str(e)}",
+                headers={"Retry-After": str(int(e.retry_after or 5))},
+            )
         raise HTTPException(status_code=500, detail=f"Tailoring failed: {str(e)}")
 
+    finally:
+        record_llm_usage(db, orchestrator.usage, current_user, tailored_id)
+
 
 @router.post("/resume/analyze-v2")
 async def analyze_resume_v2(
@@ -200,12 +209,12 @@ async def analyze_resume_v2(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
+    orchestrator = LLMOrchestrator(api_key=openrouter_key)
+
     try:
         parser = ResumeParser(resume.extracted_text or "")
         structured_resume = parser.parse()
 
-        orchestrator = LLMOrchestrator(api_key=openrouter_key)
-
         job_analysis = await orchestrator.step2_analyze_job(job_description)
         match_result = await orchestrator.step3_calculate_match(
             structured_resume, job_analysis
@@ -241,9 +250,18 @@ async def analyze_resume_v2(
             },
         }
 
+    except LLMOverloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"AI service busy: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after or 5))},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+    finally:
+        record_llm_usage(db, orchestrator.usage, current_user)
+
 
 @router.get("/resume/{tailored_id}/download")
 async def download_tailored_resume(
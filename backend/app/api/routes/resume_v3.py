@@ -1,6 +1,11 @@
 """
 JSON-Only Resume Tailoring Routes (V3)
 POST /api/resume/tailor-v3 - Full pipeline, returns structured JSON (NO PDF)
+POST /api/resume/tailor-v3/stream - Same pipeline as Server-Sent Events with partial fields
+POST /api/resume/tailor-v3/batch - One resume against many job descriptions, results streamed per job
+POST /api/resume/{id}/retailor - Re-run tailoring after an edit, regenerating only changed sections
+POST /api/resume/{id}/cover-letter - Cover letter from a tailored resume's stored job analysis
+GET /api/resume/v3/{id}/cover-letter - Download the cover letter PDF
 GET /api/resume/templates - List available templates
 GET /api/resume/{id}/json - Retrieve stored TailoredResumeSchema JSON from DB
 
@@ -8,25 +13,31 @@ Key difference from V2: No PDF generation. Returns TailoredResumeSchema + ATSAna
 Frontend handles rendering from the structured JSON response.
 """
 
+import asyncio
 import json
 import os
 import re
 import uuid
-from dataclasses import asdict
 from pathlib import Path
+from typing import List, Optional, Tuple
 
-
-from fastapi import APIRouter, Depends, HTTPException, Form, Query
-from fastapi.responses import HTMLResponse, Response, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Form, Query, Request
+from fastapi.responses import HTMLResponse, Response, FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.services.database import get_db, Resume, TailoredResume, ResumeEvent
+from app.services.database import get_db, Resume, SessionLocal, TailoredResume, ResumeEvent
 from app.services.auth import get_current_user
-from app.services.llm_orchestrator import LLMOrchestrator
+from app.services.json_stream import StreamSink
+from app.services.llm_orchestrator import FanOutResult, LLMOrchestrator
+from app.services.llm_scheduler import LLMOverloaded, Priority
+from app.services.llm_usage import record_llm_usage
 from app.services.ats_analyzer import analyze_resume_for_ats
 from app.services.resume_templates import list_templates, render_resume
-from app.services.resume_schema import TailoredResumeSchema
-from app.services.pdf_generator import generate_resume_pdf
+from app.services.resume_schema import JobAnalysis, MatchScoreResult, TailoredResumeSchema
+from app.services.pdf_generator import generate_cover_letter_pdf, generate_resume_pdf, weasyprint_html
+from app.services.metrics import PDF_RENDER_SECONDS, timed
+from app.services.serialization import FastJSONResponse, dumps, to_jsonable
+from app.services.tracing import span
 
 
 router = APIRouter()
@@ -36,6 +47,8 @@ UPLOAD_DIR = Path(
 )
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+BATCH_MAX_JOBS = int(os.getenv("TAILOR_BATCH_MAX_JOBS", "20"))
+
 
 def log_resume_event(
     db: Session, tailored_resume_id, event_type: str, message: str, payload: dict = None
@@ -222,40 +235,14 @@ async def get_templates():
     return {"templates": list_templates()}
 
 
-@router.post("/resume/tailor-v3")
-async def tailor_resume_v3(
-    resume_id: str = Form(None),
-    job_description: str = Form(...),
-    template: str = Form("modern_tech"),
-    profile_data: str = Form(None),
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user),
-):
-    """
-    Tailor resume using the enhanced pipeline — JSON-only, no PDF.
-
-    Steps:
-    1. Validate resume ownership and API key
-    2. Run full LLM orchestration pipeline (extract → analyze → match → tailor)
-    3. Run real ATS heuristics analysis
-    4. Store structured result in DB
-    5. Return TailoredResumeSchema + ATSAnalysis + MatchScoreResult as JSON
-
-    Frontend receives the complete structured JSON and renders it with the chosen template.
-    """
-    openrouter_key = os.getenv("OPENROUTER_API_KEY")
-    if not openrouter_key:
-        raise HTTPException(status_code=503, detail="AI service not configured")
-
-    # Validate input: must have either resume_id or profile_data
-    if not resume_id and not profile_data:
-        raise HTTPException(
-            status_code=400, detail="Provide either resume_id or profile_data"
-        )
-
-    tailored_id = uuid.uuid4()
-    orchestrator = LLMOrchestrator(api_key=openrouter_key)
-
+def _resolve_resume_text(
+    db: Session,
+    orchestrator: LLMOrchestrator,
+    resume_id: str,
+    profile_data: str,
+    current_user: str,
+) -> str:
+    """Resume text for the pipeline, from a stored resume or a profile_data JSON."""
     # Determine resume text source
     if resume_id:
         # Existing flow: lookup resume in DB
@@ -291,6 +278,49 @@ async def tailor_resume_v3(
         resume_text = LLMOrchestrator.construct_profile_text(profile)
         orchestrator._mock_profile = profile
 
+    return resume_text
+
+
+def _analysis_payload(job_analysis: JobAnalysis, match_result: MatchScoreResult) -> dict:
+    """Step 2/3 results stored with a tailored resume so later steps skip re-analysis."""
+    return {
+        "job_analysis": job_analysis.model_dump(mode="json", exclude={"raw_text"}),
+        "match_result": match_result.model_dump(mode="json"),
+    }
+
+
+def _stored_analysis(record: TailoredResume) -> Optional[Tuple[JobAnalysis, MatchScoreResult]]:
+    """The step 2/3 results stored by _analysis_payload, if both are present."""
+    analysis = record.analysis_json or {}
+    if not analysis.get("job_analysis") or not analysis.get("match_result"):
+        return None
+    return JobAnalysis(**analysis["job_analysis"]), MatchScoreResult(**analysis["match_result"])
+
+
+async def _run_tailoring(
+    db: Session,
+    orchestrator: LLMOrchestrator,
+    tailored_id: uuid.UUID,
+    resume_id: str,
+    resume_text: str,
+    job_description: str,
+    template: str,
+    current_user: str,
+    pipeline_result: Optional[FanOutResult] = None,
+    previous: Optional[TailoredResumeSchema] = None,
+    include_cover_letter: bool = False,
+    previous_analysis: Optional[Tuple[JobAnalysis, MatchScoreResult]] = None,
+) -> dict:
+    """
+    Pipeline → ATS analysis → PDF → persist. Returns the tailor-v3 response
+    body; failures are stored as a failed TailoredResume and raised as HTTPException.
+    A fan-out job passes its finished pipeline_result instead of running the pipeline;
+    with `previous`, only sections changed since that tailored resume are regenerated
+    (and `previous_analysis`, its stored job analysis and match result, skips steps 2-3).
+    With include_cover_letter, a cover letter is written from the same job analysis
+    and match result while the resume PDF renders.
+    """
+    cover_task = None
     try:
         log_resume_event(
             db,
@@ -304,9 +334,16 @@ async def tailor_resume_v3(
             db, tailored_id, "llm_pipeline", "Running full LLM orchestration pipeline"
         )
 
-        tailored, job_analysis, match_result = await orchestrator.full_pipeline(
-            resume_text, job_description
-        )
+        if pipeline_result is not None:
+            tailored, job_analysis, match_result = pipeline_result.unwrap()
+        elif previous is not None:
+            tailored, job_analysis, match_result = await orchestrator.incremental_pipeline(
+                resume_text, job_description, previous, previous_analysis=previous_analysis
+            )
+        else:
+            tailored, job_analysis, match_result = await orchestrator.full_pipeline(
+                resume_text, job_description
+            )
 
         # --- Apply defaults for missing fields ---
         if not tailored.basics or not tailored.basics.name:
@@ -340,30 +377,59 @@ async def tailor_resume_v3(
         tailored.missing_keywords = ats_analysis.missing_keywords
         tailored.optimization_notes = ats_analysis.recommendations
 
+        # --- Cover letter (LLM call overlaps the PDF render below) ---
+        if include_cover_letter:
+            cover_task = asyncio.create_task(
+                orchestrator.generate_cover_letter(tailored, job_analysis, match_result)
+            )
+
         # --- Generate PDF ---
         log_resume_event(
             db, tailored_id, "pdf_generating", "Generating PDF"
         )
         try:
-            pdf_bytes, pdf_path = generate_resume_pdf(tailored, str(tailored_id))
+            pdf_bytes, pdf_path = await asyncio.to_thread(
+                generate_resume_pdf, tailored, str(tailored_id)
+            )
         except Exception as e:
             log_resume_event(
                 db, tailored_id, "pdf_error", str(e), {"error_type": type(e).__name__}
             )
             pdf_path = ""
 
+        cover_letter, cover_letter_pdf_path = None, ""
+        if cover_task is not None:
+            try:
+                cover_letter = await cover_task
+                _, cover_letter_pdf_path = await asyncio.to_thread(
+                    generate_cover_letter_pdf,
+                    cover_letter,
+                    tailored.basics.name if tailored.basics else "",
+                    f"cover_letter_{tailored_id}",
+                )
+            except Exception as e:
+                # The resume is still usable; the letter can be regenerated on its own
+                log_resume_event(
+                    db, tailored_id, "cover_letter_error", str(e), {"error_type": type(e).__name__}
+                )
+
         # --- Persist to DB ---
         log_resume_event(
             db, tailored_id, "saving", "Saving tailored resume to database"
         )
+        # One dump each, shared by the stored record and the response body
+        tailored_json = tailored.model_dump(mode="json")
+        analysis_json = _analysis_payload(job_analysis, match_result)
         tailored_record = TailoredResume(
             id=tailored_id,
             user_id=current_user,
             resume_id=resume_id,
             job_description=job_description,
             llm_model="multi-step-orchestrator",
-            llm_raw_response=tailored.model_dump_json(indent=2),
-            llm_structured_json=tailored.model_dump(mode="json"),
+            llm_structured_json=tailored_json,
+            analysis_json=analysis_json,
+            cover_letter=cover_letter,
+            cover_letter_pdf_path=cover_letter_pdf_path,
             template_used=template,
             pdf_path=pdf_path,
             status="completed",
@@ -379,15 +445,20 @@ async def tailor_resume_v3(
         )
 
         # --- Return structured JSON for frontend rendering ---
-        return {
+        body = {
             "status": "success",
             "tailored_resume_id": str(tailored_id),
-            "tailored_resume": tailored.model_dump(mode="json"),
-            "ats_analysis": asdict(ats_analysis),
-            "match_score": match_result.model_dump(),
+            "tailored_resume": tailored_json,
+            "ats_analysis": to_jsonable(ats_analysis),
+            "match_score": analysis_json["match_result"],
         }
+        if include_cover_letter:
+            body["cover_letter"] = cover_letter
+        return body
 
     except Exception as e:
+        if cover_task is not None and not cover_task.done():
+            cover_task.cancel()
         log_resume_event(
             db, tailored_id, "error", str(e), {"error_type": type(e).__name__}
         )
@@ -398,8 +469,6 @@ async def tailor_resume_v3(
             resume_id=resume_id,
             job_description=job_description,
             llm_model="multi-step-orchestrator",
-            llm_raw_response="",
-            llm_structured_json={},
             template_used=template,
             pdf_path="",
             status="failed",
@@ -407,8 +476,362 @@ async def tailor_resume_v3(
         db.add(error_record)
         db.commit()
 
+        if isinstance(e, LLMOverloaded):
+            raise HTTPException(
+                status_code=503,
+                detail=f"AI service busy: {str(e)}",
+                headers={"Retry-After": str(int(e.retry_after or 5))},
+            )
         raise HTTPException(status_code=500, detail=f"Tailoring failed: {str(e)}")
 
+    finally:
+        usage = pipeline_result.usage if pipeline_result is not None else orchestrator.usage
+        record_llm_usage(db, usage, current_user, tailored_id)
+
+
+@router.post("/resume/tailor-v3")
+async def tailor_resume_v3(
+    resume_id: str = Form(None),
+    job_description: str = Form(...),
+    template: str = Form("modern_tech"),
+    profile_data: str = Form(None),
+    include_cover_letter: bool = Form(False),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Tailor resume using the enhanced pipeline — JSON-only, no PDF.
+
+    Steps:
+    1. Validate resume ownership and API key
+    2. Run full LLM orchestration pipeline (extract → analyze → match → tailor)
+    3. Run real ATS heuristics analysis
+    4. Store structured result in DB
+    5. Return TailoredResumeSchema + ATSAnalysis + MatchScoreResult as JSON
+       (plus cover_letter when include_cover_letter is set)
+
+    Frontend receives the complete structured JSON and renders it with the chosen template.
+    """
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if not openrouter_key:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+
+    # Validate input: must have either resume_id or profile_data
+    if not resume_id and not profile_data:
+        raise HTTPException(
+            status_code=400, detail="Provide either resume_id or profile_data"
+        )
+
+    tailored_id = uuid.uuid4()
+    orchestrator = LLMOrchestrator(api_key=openrouter_key)
+    resume_text = _resolve_resume_text(db, orchestrator, resume_id, profile_data, current_user)
+
+    result = await _run_tailoring(
+        db, orchestrator, tailored_id, resume_id, resume_text,
+        job_description, template, current_user,
+        include_cover_letter=include_cover_letter,
+    )
+    # Already JSON-ready: skip FastAPI's jsonable_encoder pass over the resume
+    return FastJSONResponse(result)
+
+
+@router.post("/resume/tailor-v3/stream")
+async def tailor_resume_v3_stream(
+    request: Request,
+    resume_id: str = Form(None),
+    job_description: str = Form(...),
+    template: str = Form("modern_tech"),
+    profile_data: str = Form(None),
+    include_cover_letter: bool = Form(False),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Same pipeline as /resume/tailor-v3, streamed as Server-Sent Events:
+    - step: pipeline progress ({"step": "extract_and_analyze" | "match" | "tailor"})
+    - partial: a tailored top-level field as soon as the model finishes it
+      ({"field": "basics", "value": {...}}), validated incrementally
+    - reset: discard partial fields (the provider attempt was retried)
+    - result: the full tailor-v3 response body
+    - error: {"status_code": ..., "detail": ...}
+    """
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if not openrouter_key:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+    if not resume_id and not profile_data:
+        raise HTTPException(
+            status_code=400, detail="Provide either resume_id or profile_data"
+        )
+
+    tailored_id = uuid.uuid4()
+    orchestrator = LLMOrchestrator(api_key=openrouter_key)
+    resume_text = _resolve_resume_text(db, orchestrator, resume_id, profile_data, current_user)
+
+    sink = StreamSink()
+    orchestrator.stream_sink = sink
+
+    async def run():
+        # The request-scoped session is closed once the response starts
+        task_db = SessionLocal()
+        try:
+            result = await _run_tailoring(
+                task_db, orchestrator, tailored_id, resume_id, resume_text,
+                job_description, template, current_user,
+                include_cover_letter=include_cover_letter,
+            )
+            sink.put("result", result)
+        except HTTPException as e:
+            sink.put("error", {"status_code": e.status_code, "detail": e.detail})
+        finally:
+            task_db.close()
+            sink.close()
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            yield _sse("started", {"tailored_resume_id": str(tailored_id)})
+            async for event, data in sink:
+                if await request.is_disconnected():
+                    break
+                yield _sse(event, data)
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/resume/{tailored_id}/retailor")
+async def retailor_resume_v3(
+    tailored_id: str,
+    resume_id: str = Form(None),
+    job_description: str = Form(None),
+    template: str = Form(None),
+    profile_data: str = Form(None),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Re-tailor after an edit to the resume or the job description.
+
+    Inputs default to those of the previous tailored resume. Sections whose
+    source content and relevant job keywords are unchanged are reused from
+    it; only the others go back to the LLM. Stores and returns a new
+    tailored resume (same body as /resume/tailor-v3).
+    """
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if not openrouter_key:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+
+    previous_record = (
+        db.query(TailoredResume)
+        .filter(
+            TailoredResume.id == tailored_id,
+            TailoredResume.user_id == current_user,
+        )
+        .first()
+    )
+    if not previous_record or not previous_record.llm_structured_json:
+        raise HTTPException(status_code=404, detail="Tailored resume not found")
+
+    if not profile_data:
+        resume_id = resume_id or previous_record.resume_id
+    if not resume_id and not profile_data:
+        raise HTTPException(
+            status_code=400, detail="Provide either resume_id or profile_data"
+        )
+
+    new_id = uuid.uuid4()
+    orchestrator = LLMOrchestrator(api_key=openrouter_key)
+    resume_text = _resolve_resume_text(db, orchestrator, resume_id, profile_data, current_user)
+
+    # Same job: reuse its analysis so unchanged sections keep their fingerprints
+    same_job = not job_description or (
+        job_description.strip() == (previous_record.job_description or "").strip()
+    )
+    result = await _run_tailoring(
+        db, orchestrator, new_id, resume_id, resume_text,
+        job_description or previous_record.job_description,
+        template or previous_record.template_used or "modern_tech",
+        current_user,
+        previous=TailoredResumeSchema(**previous_record.llm_structured_json),
+        previous_analysis=_stored_analysis(previous_record) if same_job else None,
+    )
+    return FastJSONResponse(result)
+
+
+@router.post("/resume/{tailored_id}/cover-letter")
+async def cover_letter_v3(
+    tailored_id: str,
+    company_name: str = Form(""),
+    hiring_manager: str = Form(""),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Write a cover letter for a tailored resume.
+
+    Reuses the tailored resume and the job analysis / match result stored
+    when it was tailored, so only the cover letter itself goes to the LLM.
+    Older records without a stored analysis re-run job analysis only.
+    Stores the letter and its PDF on the tailored resume.
+    """
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if not openrouter_key:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+
+    record = (
+        db.query(TailoredResume)
+        .filter(
+            TailoredResume.id == tailored_id,
+            TailoredResume.user_id == current_user,
+        )
+        .first()
+    )
+    if not record or not record.llm_structured_json:
+        raise HTTPException(status_code=404, detail="Tailored resume not found")
+
+    tailored = TailoredResumeSchema(**record.llm_structured_json)
+    orchestrator = LLMOrchestrator(api_key=openrouter_key)
+    try:
+        analysis = record.analysis_json or {}
+        if analysis.get("job_analysis"):
+            job_analysis = JobAnalysis(**analysis["job_analysis"])
+            match_result = (
+                MatchScoreResult(**analysis["match_result"]) if analysis.get("match_result") else None
+            )
+        else:
+            job_analysis = await orchestrator.step2_analyze_job(record.job_description or "")
+            match_result = None
+            record.analysis_json = {"job_analysis": job_analysis.model_dump(mode="json", exclude={"raw_text"})}
+
+        cover_letter = await orchestrator.generate_cover_letter(
+            tailored, job_analysis, match_result, company_name, hiring_manager
+        )
+        _, pdf_path = await asyncio.to_thread(
+            generate_cover_letter_pdf,
+            cover_letter,
+            tailored.basics.name if tailored.basics else "",
+            f"cover_letter_{tailored_id}",
+        )
+    except LLMOverloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"AI service busy: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after or 5))},
+        )
+    except Exception as e:
+        log_resume_event(
+            db, record.id, "cover_letter_error", str(e), {"error_type": type(e).__name__}
+        )
+        raise HTTPException(status_code=500, detail=f"Cover letter failed: {str(e)}")
+    finally:
+        record_llm_usage(db, orchestrator.usage, current_user, record.id)
+
+    record.cover_letter = cover_letter
+    record.cover_letter_pdf_path = pdf_path
+    db.commit()
+
+    return {
+        "status": "success",
+        "tailored_resume_id": str(record.id),
+        "cover_letter": cover_letter,
+    }
+
+
+@router.post("/resume/tailor-v3/batch")
+async def tailor_resume_v3_batch(
+    request: Request,
+    resume_id: str = Form(None),
+    job_descriptions: List[str] = Form(...),
+    template: str = Form("modern_tech"),
+    profile_data: str = Form(None),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Tailor one resume to several job descriptions (repeat the
+    job_descriptions form field). The resume is extracted once; jobs run
+    concurrently at batch priority. Server-Sent Events:
+    - started: {"jobs": [{"index": 0, "tailored_resume_id": ...}, ...]}
+    - result: {"index": ..., **tailor-v3 response body} as each job finishes
+    - error: {"index": ..., "status_code": ..., "detail": ...}
+    - done: {"completed": n, "failed": n}
+    """
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if not openrouter_key:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+    if not resume_id and not profile_data:
+        raise HTTPException(
+            status_code=400, detail="Provide either resume_id or profile_data"
+        )
+    if len(job_descriptions) > BATCH_MAX_JOBS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {BATCH_MAX_JOBS} job descriptions per batch"
+        )
+
+    tailored_ids = [uuid.uuid4() for _ in job_descriptions]
+    orchestrator = LLMOrchestrator(api_key=openrouter_key, priority=Priority.BATCH)
+    resume_text = _resolve_resume_text(db, orchestrator, resume_id, profile_data, current_user)
+
+    sink = StreamSink()
+
+    async def run():
+        task_db = SessionLocal()
+        counts = {"completed": 0, "failed": 0}
+        try:
+            async for job in orchestrator.fan_out_pipeline(resume_text, job_descriptions):
+                try:
+                    result = await _run_tailoring(
+                        task_db, orchestrator, tailored_ids[job.index], resume_id, resume_text,
+                        job.job_description, template, current_user, pipeline_result=job,
+                    )
+                    sink.put("result", {"index": job.index, **result})
+                    counts["completed"] += 1
+                except HTTPException as e:
+                    sink.put("error", {"index": job.index, "status_code": e.status_code, "detail": e.detail})
+                    counts["failed"] += 1
+        except Exception as e:
+            # Step 1 failed: no job can run
+            sink.put("error", {"index": None, "status_code": 500, "detail": f"Tailoring failed: {str(e)}"})
+        finally:
+            # Step 1 usage is shared by every job in the batch
+            record_llm_usage(task_db, orchestrator.usage, current_user)
+            task_db.close()
+            sink.put("done", counts)
+            sink.close()
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            yield _sse("started", {
+                "jobs": [
+                    {"index": i, "tailored_resume_id": str(tailored_id)}
+                    for i, tailored_id in enumerate(tailored_ids)
+                ]
+            })
+            async for event, data in sink:
+                if await request.is_disconnected():
+                    break
+                yield _sse(event, data)
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
 
 @router.delete("/resumes/tailored/{tailored_id}")
 async def delete_tailored_resume(
@@ -467,14 +890,14 @@ async def get_tailored_resume_json(
             detail="No structured JSON found for this tailored resume",
         )
 
-    return {
+    return FastJSONResponse({
         "id": str(tailored.id),
         "status": tailored.status,
         "template_used": tailored.template_used,
         "job_description": tailored.job_description,
         "resume_json": tailored.llm_structured_json,
         "created_at": tailored.created_at.isoformat() if tailored.created_at else None,
-    }
+    })
 
 
 @router.get("/resume/v3/{tailored_id}/download")
@@ -541,10 +964,14 @@ async def download_tailored_resume_v3(
         return HTMLResponse(content=html)
 
     # Convert HTML to PDF
-    try:
-        from weasyprint import HTML
+    HTML = weasyprint_html()
+    if HTML is None:
+        # No WeasyPrint — return HTML instead
+        return HTMLResponse(content=html)
 
-        pdf_bytes = HTML(string=html).write_pdf()
+    try:
+        with span("pdf.render", engine="weasyprint"), timed(PDF_RENDER_SECONDS, "weasyprint"):
+            pdf_bytes = HTML(string=html).write_pdf()
 
         # Cache for future requests
         pdf_dir = os.path.join(os.path.dirname(UPLOAD_DIR), "pdfs")
@@ -564,11 +991,37 @@ async def download_tailored_resume_v3(
                 "Content-Disposition": f'attachment; filename="tailored_resume_{tailored_id}.pdf"'
             },
         )
-    except ImportError:
-        # No WeasyPrint — return HTML instead
-        return HTMLResponse(content=html)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"PDF generation failed: {e}",
         )
+
+
+@router.get("/resume/v3/{tailored_id}/cover-letter")
+async def download_cover_letter_v3(
+    tailored_id: str,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """Download the cover letter PDF generated for a tailored resume."""
+    tailored = (
+        db.query(TailoredResume)
+        .filter(
+            TailoredResume.id == tailored_id,
+            TailoredResume.user_id == current_user,
+        )
+        .first()
+    )
+
+    if not tailored:
+        raise HTTPException(status_code=404, detail="Tailored resume not found")
+
+    if not tailored.cover_letter_pdf_path or not os.path.exists(tailored.cover_letter_pdf_path):
+        raise HTTPException(status_code=404, detail="No cover letter generated for this resume")
+
+    return FileResponse(
+        path=tailored.cover_letter_pdf_path,
+        media_type="application/pdf",
+        filename=f"cover_letter_{tailored_id}.pdf",
+    )
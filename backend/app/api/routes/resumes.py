@@ -407,7 +407,6 @@ Return ONLY valid JSON. No markdown, no explanations.
         raw_response = result["choices"][0]["message"]["content"]
         
         tailored.llm_model = "qwen/qwen-2.5-7b-instruct"
-        tailored.llm_raw_response = raw_response
         db.commit()
         
         log_resume_event(
@@ -654,85 +653,35 @@ async def generate_cover_letter(
         raise HTTPException(status_code=404, detail="Resume not found")
     
     try:
-        import httpx
-        
-        prompt = f"""You are an expert cover letter writer. Write a compelling, professional cover letter.
-
-Resume:
-{resume.extracted_text}
-
-Job Description:
-{job_description}
-
-{"Hiring Manager: " + hiring_manager if hiring_manager else ""}
-{"Company: " + company_name if company_name else ""}
-
-Write a cover letter that:
-1. Addresses the hiring manager professionally (use "Dear Hiring Manager" if name unknown)
-2. Highlights relevant experience and skills from the resume
-3. Shows enthusiasm for the role and company
-4. Is concise (3-4 paragraphs max)
-5. Uses professional language
-6. Includes a call to action
-
-Return ONLY the cover letter text, no formatting or markdown.
-"""
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {openrouter_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "qwen/qwen-2.5-7b-instruct",
-                    "messages": [
-                        {"role": "system", "content": "You are an expert cover letter writer. Write professional, compelling cover letters."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 1500
-                },
-                timeout=60.0
+        import asyncio
+        from app.services.job_analyzer import analyze_job_locally
+        from app.services.llm_orchestrator import LLMOrchestrator
+        from app.services.llm_usage import record_llm_usage
+        from app.services.pdf_generator import generate_cover_letter_pdf
+
+        # Same path as tailoring: cached resume extraction and local job
+        # analysis, so only the letter itself costs an LLM call
+        orchestrator = LLMOrchestrator(api_key=openrouter_key)
+        try:
+            resume_schema = await orchestrator.extract_resume(resume.extracted_text)
+            cover_letter = await orchestrator.generate_cover_letter(
+                resume_schema,
+                analyze_job_locally(job_description),
+                company_name=company_name,
+                hiring_manager=hiring_manager,
             )
-        
-        result = response.json()
-        cover_letter = result["choices"][0]["message"]["content"]
-        
-        formatted_cover_letter = cover_letter.replace('\n\n', '</div><div class="body">')
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-        .date {{ margin-bottom: 20px; color: #666; }}
-        .salutation {{ margin-bottom: 20px; }}
-        .body {{ margin-bottom: 20px; }}
-        .closing {{ margin-top: 30px; }}
-        .signature {{ margin-top: 40px; }}
-    </style>
-</head>
-<body>
-    <div class="date">{company_name or "Dear Hiring Manager"}</div>
-    <div class="salutation">Dear {hiring_manager or "Hiring Manager"},</div>
-    <div class="body">
-        {formatted_cover_letter}
-    </div>
-    <div class="closing">Sincerely,</div>
-    <div class="signature">{current_user}</div>
-</body>
-</html>
-"""
-        
-        pdf_bytes = html_to_pdf(html_content)
-        
-        pdf_filename = f"cover_letter_{uuid.uuid4()}.pdf"
-        pdf_path = UPLOAD_DIR / pdf_filename
-        
-        with open(pdf_path, 'wb') as f:
-            f.write(pdf_bytes)
+        finally:
+            record_llm_usage(db, orchestrator.usage, current_user)
+        
+        pdf_name = f"cover_letter_{uuid.uuid4()}"
+        await asyncio.to_thread(
+            generate_cover_letter_pdf,
+            cover_letter,
+            resume_schema.basics.name if resume_schema.basics else "",
+            pdf_name,
+            str(UPLOAD_DIR),
+        )
+        pdf_filename = f"{pdf_name}.pdf"
         
         return {
             "status": "completed",
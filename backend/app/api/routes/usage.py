@@ -0,0 +1,54 @@
+"""
+LLM Usage Routes
+GET /api/llm/usage - Token / latency / cost totals grouped by step, model, tier or user
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.services.database import get_db
+from app.services.auth import get_current_user
+from app.services.llm_usage import GROUP_COLUMNS, aggregate_usage
+
+
+router = APIRouter()
+
+# Comma-separated user ids allowed to see usage across all users
+ADMIN_USER_IDS = {u.strip() for u in os.getenv("ADMIN_USER_IDS", "").split(",") if u.strip()}
+
+
+@router.get("/llm/usage")
+async def get_llm_usage(
+    group_by: str = Query("step", description=f"One of: {', '.join(GROUP_COLUMNS)}"),
+    days: int = Query(30, ge=1, le=365),
+    all_users: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """Aggregate LLM usage for the current user (or everyone, for admins)."""
+    if group_by not in GROUP_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {list(GROUP_COLUMNS)}")
+    if (all_users or group_by == "user") and current_user not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Cross-user usage is restricted to admins")
+
+    since = datetime.utcnow() - timedelta(days=days)
+    groups = aggregate_usage(
+        db,
+        group_by=group_by,
+        user_id=None if all_users or group_by == "user" else current_user,
+        since=since,
+    )
+
+    return {
+        "group_by": group_by,
+        "since": since.isoformat(),
+        "groups": groups,
+        "totals": {
+            "calls": sum(g["calls"] for g in groups),
+            "total_tokens": sum(g["total_tokens"] for g in groups),
+            "cost": round(sum(g["cost"] or 0 for g in groups), 6),
+        },
+    }
@@ -7,23 +7,42 @@ load_dotenv(os.path.join(_backend_dir, ".env"))
 load_dotenv()  # also try cwd (project root) — doesn't override
 
 import asyncio
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from app.api.routes import auth, users, jobs, applications, credits
 from app.api.routes import resumes
 from app.api.routes import resume_v2
 from app.api.routes import resume_v3
 from app.api.routes import opencode
+from app.api.routes import usage
 from app.services import opencode_ws
 from app.services.database import init_db
-from app.services.opencode_monitor import monitor_sidecar
+from app.services.opencode_monitor import monitor_sidecar, is_sidecar_connected
+from app.services.preload import PRELOAD_MODE, preload
+from app.services.serialization import FastJSONResponse
+from app.services.llm_router import router as llm_router
+from app.services.llm_scheduler import scheduler as llm_scheduler
+from app.services.metrics import (
+    HTTP_REQUEST_SECONDS,
+    register_celery_queue_collector,
+    render_metrics,
+    route_template,
+)
+from app.services.tracing import FASTAPI_NATIVE_TRACING, server_span, setup_tracing
 
 
 def create_app() -> FastAPI:
+    if PRELOAD_MODE == "eager":
+        # Under `gunicorn --preload` this runs once in the master; workers inherit it
+        preload(warm_caches=False)
+
     app = FastAPI(
         title="ApplyMate API",
         description="AI Job Application Automation SaaS - Resume Crafting 2.0",
         version="0.2.0",
+        default_response_class=FastJSONResponse,
     )
 
     origins = [
@@ -41,9 +60,39 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            HTTP_REQUEST_SECONDS.labels(
+                request.method, route_template(request.scope), str(status)
+            ).observe(time.perf_counter() - start)
+
+    if not FASTAPI_NATIVE_TRACING:
+
+        @app.middleware("http")
+        async def trace_requests(request: Request, call_next):
+            with server_span(f"{request.method} {request.url.path}", request.headers) as current:
+                response = await call_next(request)
+                current.update_name(f"{request.method} {route_template(request.scope)}")
+                current.set_attribute("http.status_code", response.status_code)
+                return response
+
+    register_celery_queue_collector()
+    setup_tracing()
+
     @app.on_event("startup")
     async def startup_event():
         init_db()
+        if PRELOAD_MODE == "eager":
+            await asyncio.to_thread(preload)
+        elif PRELOAD_MODE == "background":
+            asyncio.create_task(asyncio.to_thread(preload))
         asyncio.create_task(monitor_sidecar())
 
     app.include_router(auth.router, prefix="/api", tags=["auth"])
@@ -55,11 +104,24 @@ def create_app() -> FastAPI:
     app.include_router(resume_v2.router, prefix="/api", tags=["resume-v2"])
     app.include_router(resume_v3.router, prefix="/api", tags=["resume-v3"])
     app.include_router(opencode.router, prefix="/api", tags=["opencode"])
+    app.include_router(usage.router, prefix="/api", tags=["usage"])
     app.include_router(opencode_ws.router)
 
     @app.get("/api/health")
     async def health_check():
-        return {"status": "healthy", "version": "0.2.0", "pipeline": "v2"}
+        return {
+            "status": "healthy",
+            "version": "0.2.0",
+            "pipeline": "v2",
+            "sidecar_connected": is_sidecar_connected(),
+            "llm_lanes": llm_scheduler.snapshot(),
+            "llm_router": llm_router.snapshot(),
+        }
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
 
     return app
 
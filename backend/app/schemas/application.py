@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Any
 from datetime import datetime
 from enum import Enum
@@ -74,3 +74,20 @@ class TailoredResume(BaseModel):
     work_experience: List[dict]
     education: List[dict]
     ats_score_estimate: int
+
+
+class RankJob(BaseModel):
+    job_description: str
+    job_url: Optional[str] = None
+    job_title: Optional[str] = None
+    company_name: Optional[str] = None
+
+
+# Per request: jobs ranked by embedding, and top jobs LLM-scored (one credit each)
+RANK_MAX_JOBS = 200
+RANK_MAX_TOP_K = 10
+
+
+class JobRank(BaseModel):
+    jobs: List[RankJob] = Field(max_length=RANK_MAX_JOBS)
+    top_k: int = Field(default=5, ge=1, le=RANK_MAX_TOP_K)
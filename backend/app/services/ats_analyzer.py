@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
 from app.services.resume_schema import ResumeSchema, JobAnalysis
+from app.services.metrics import ATS_ANALYSIS_SECONDS, timed
+from app.services.tracing import span
 
 
 @dataclass
@@ -427,4 +429,5 @@ def analyze_resume_for_ats(resume: ResumeSchema, job: JobAnalysis) -> ATSAnalysi
         ATSAnalysis with scores and recommendations
     """
     analyzer = ATSAnalyzer()
-    return analyzer.analyze(resume, job)
+    with span("ats.analyze"), timed(ATS_ANALYSIS_SECONDS):
+        return analyzer.analyze(resume, job)
@@ -0,0 +1,247 @@
+"""
+Blob Store - Content-addressed storage for large JSON/text payloads
+Keeps hot tables (applications, tailored_resumes) narrow
+
+Large documents (tailored resume JSON, cover letters) are serialized,
+compressed and stored once in the `blobs` table keyed by their SHA-256.
+Model rows only keep the 64-char hash; the payload is loaded the first
+time the attribute is read.
+
+Codecs:
+- gzip (default, stdlib)
+- zstd (set BLOB_CODEC=zstd, requires the `zstandard` package)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+BLOB_CODEC = os.getenv("BLOB_CODEC", "gzip")
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Reused blobs get a fresh created_at at most this often (see _touch)
+_TOUCH_AFTER = timedelta(hours=1)
+
+_blob_model = None
+
+
+# ───────────────────────────────────────────
+# ENCODING
+# ───────────────────────────────────────────
+
+def _serialize(value: Any, kind: str) -> bytes:
+    """Serialize a value to canonical bytes (stable across calls for hashing)."""
+    if kind == "json":
+        return json.dumps(
+            value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        ).encode("utf-8")
+    return str(value).encode("utf-8")
+
+
+def _deserialize(payload: bytes, kind: str) -> Any:
+    text = payload.decode("utf-8")
+    if kind == "json":
+        return json.loads(text)
+    return text
+
+
+def blob_hash(payload: bytes, kind: str) -> str:
+    """Content hash used as the blob primary key."""
+    return hashlib.sha256(kind.encode("ascii") + b"\x00" + payload).hexdigest()
+
+
+def compress(payload: bytes, codec: str = None) -> Tuple[str, bytes]:
+    """Compress payload with the configured codec. Returns (codec, data)."""
+    codec = codec or BLOB_CODEC
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("BLOB_CODEC=zstd requires the 'zstandard' package")
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    elif codec == "gzip":
+        data = gzip.compress(payload, compresslevel=GZIP_LEVEL)
+    else:
+        return "none", payload
+
+    # Tiny payloads (short cover letters, empty dicts) grow when compressed
+    if len(data) >= len(payload):
+        return "none", payload
+    return codec, data
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Blob is zstd-compressed but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+def _build_blob(ref: str, kind: str, payload: bytes):
+    codec, data = compress(payload)
+    return _blob_model(
+        id=ref,
+        kind=kind,
+        codec=codec,
+        size=len(payload),
+        stored_size=len(data),
+        data=data,
+    )
+
+
+def _touch(blob) -> None:
+    """
+    Mark a reused blob as recently written, so compaction's grace period
+    protects it until the row referencing it is committed. Skipped for
+    blobs written within the last hour to avoid an UPDATE per reuse.
+    """
+    now = datetime.utcnow()
+    if blob.created_at is None or blob.created_at < now - _TOUCH_AFTER:
+        blob.created_at = now
+
+
+def load_blob(db, ref: str) -> Any:
+    """Fetch and decode a blob by hash. Returns None if it does not exist."""
+    blob = db.get(_blob_model, ref)
+    if blob is None:
+        return None
+    return _deserialize(decompress(blob.data, blob.codec), blob.kind)
+
+
+def put_blob(db, value: Any, kind: str = "json") -> str:
+    """Store a value (deduplicated by hash) and return its reference."""
+    payload = _serialize(value, kind)
+    ref = blob_hash(payload, kind)
+    with db.no_autoflush:
+        existing = db.get(_blob_model, ref)
+    if existing is None:
+        db.add(_build_blob(ref, kind, payload))
+        db.flush()
+    else:
+        _touch(existing)
+    return ref
+
+
+# ───────────────────────────────────────────
+# MODEL ATTRIBUTE
+# ───────────────────────────────────────────
+
+class BlobField:
+    """
+    Model attribute backed by a blob reference column.
+
+    Reads resolve the reference lazily through the instance's session
+    (falling back to the legacy inline column for rows written before
+    the blob store existed). Writes hash the value immediately and defer
+    the INSERT into `blobs` to the session's before_flush hook.
+    """
+
+    def __init__(self, ref_attr: str, legacy_attr: Optional[str] = None, kind: str = "json"):
+        self.ref_attr = ref_attr
+        self.legacy_attr = legacy_attr
+        self.kind = kind
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        ref = getattr(obj, self.ref_attr)
+        if ref is None:
+            return getattr(obj, self.legacy_attr) if self.legacy_attr else None
+
+        cache = obj.__dict__.setdefault("_blob_values", {})
+        cached = cache.get(self.name)
+        if cached is not None and cached[0] == ref:
+            return cached[1]
+
+        pending = obj.__dict__.get("_blob_pending", {}).get(ref)
+        if pending is not None:
+            value = _deserialize(pending[1], pending[0])
+        else:
+            session = object_session(obj)
+            value = load_blob(session, ref) if session is not None else None
+
+        cache[self.name] = (ref, value)
+        return value
+
+    def __set__(self, obj, value):
+        cache = obj.__dict__.setdefault("_blob_values", {})
+
+        if value is None:
+            setattr(obj, self.ref_attr, None)
+            cache.pop(self.name, None)
+        else:
+            payload = _serialize(value, self.kind)
+            ref = blob_hash(payload, self.kind)
+            obj.__dict__.setdefault("_blob_pending", {})[ref] = (self.kind, payload)
+            setattr(obj, self.ref_attr, ref)
+            cache[self.name] = (ref, value)
+
+        if self.legacy_attr:
+            setattr(obj, self.legacy_attr, None)
+
+
+def preload_blobs(db, instances: Iterable[Any], fields: List[str]) -> None:
+    """
+    Resolve blob fields for many rows with a single IN query.
+    Use before serializing list endpoints to avoid one blob lookup per row.
+    """
+    instances = list(instances)
+    wanted: Dict[str, List[Tuple[Any, BlobField]]] = {}
+    for obj in instances:
+        for field_name in fields:
+            field = getattr(type(obj), field_name)
+            ref = getattr(obj, field.ref_attr)
+            if ref is not None:
+                wanted.setdefault(ref, []).append((obj, field))
+
+    if not wanted:
+        return
+
+    blobs = db.query(_blob_model).filter(_blob_model.id.in_(list(wanted))).all()
+    for blob in blobs:
+        value = _deserialize(decompress(blob.data, blob.codec), blob.kind)
+        for obj, field in wanted[blob.id]:
+            obj.__dict__.setdefault("_blob_values", {})[field.name] = (blob.id, value)
+
+
+def install_blob_store(session_factory, blob_model) -> None:
+    """Bind the Blob model and flush hook to a session factory."""
+    global _blob_model
+    _blob_model = blob_model
+
+    @event.listens_for(session_factory, "before_flush")
+    def _flush_pending_blobs(session, flush_context, instances):
+        seen = set()
+        for obj in list(session.new) + list(session.dirty):
+            pending = obj.__dict__.pop("_blob_pending", None)
+            if not pending:
+                continue
+            with session.no_autoflush:
+                for ref, (kind, payload) in pending.items():
+                    if ref in seen:
+                        continue
+                    seen.add(ref)
+                    existing = session.get(blob_model, ref)
+                    if existing is None:
+                        session.add(_build_blob(ref, kind, payload))
+                    else:
+                        _touch(existing)
@@ -0,0 +1,399 @@
+"""
+Compaction - Retention and cleanup for append-only tables and upload dirs
+
+Steps (each returns a count, all driven by run_compaction):
+1. Roll old ApplicationEvent / ResumeEvent rows into EventSummary rows
+2. Prune ScanHistory entries not seen within the retention window
+3. Delete failed TailoredResume rows (and their events)
+4. Move legacy inline payloads into the blob store, drop unreferenced blobs
+5. Delete files in uploads/, pdfs/ and app/uploads/ that no row references
+6. VACUUM / ANALYZE
+
+Retention is configured per table in days via environment variables
+(see RETENTION_DEFAULTS). A value of 0 disables that step.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import exists, func, inspect, or_, text
+
+from app.services.blob_store import put_blob
+from app.services.database import (
+    SessionLocal,
+    engine,
+    is_sqlite,
+    Application,
+    ApplicationEvent,
+    Blob,
+    EventSummary,
+    Resume,
+    ResumeEvent,
+    ScanHistory,
+    TailoredResume,
+)
+from app.services.pdf_generator import OUTPUT_DIR as GENERATED_PDF_DIR
+
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(_BACKEND_DIR, "uploads"))
+PDF_DIR = os.path.join(os.path.dirname(UPLOAD_DIR), "pdfs")
+
+RETENTION_DEFAULTS = {
+    "application_events": ("RETENTION_APPLICATION_EVENTS_DAYS", 90),
+    "resume_events": ("RETENTION_RESUME_EVENTS_DAYS", 30),
+    "scan_history": ("RETENTION_SCAN_HISTORY_DAYS", 180),
+    "failed_tailored_resumes": ("RETENTION_FAILED_TAILORED_DAYS", 7),
+    "orphaned_files": ("RETENTION_ORPHANED_FILES_DAYS", 7),
+}
+
+BATCH_SIZE = 500
+
+# Unreferenced blobs younger than this may belong to a row not yet committed
+BLOB_GRACE_PERIOD = timedelta(hours=24)
+
+logger = logging.getLogger(__name__)
+
+
+def get_retention_days(overrides: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Resolve retention windows from env, then explicit overrides."""
+    days = {name: int(os.getenv(env, default)) for name, (env, default) in RETENTION_DEFAULTS.items()}
+    for name, value in (overrides or {}).items():
+        if value is not None:
+            days[name] = value
+    return days
+
+
+# ───────────────────────────────────────────
+# EVENTS → SUMMARIES
+# ───────────────────────────────────────────
+
+def summarize_events(db, event_model, entity_column, entity_type: str, cutoff: datetime) -> int:
+    """
+    Fold events older than cutoff into one EventSummary per entity, then delete them.
+    Events without an entity id (e.g. upload logs) are deleted without a summary.
+    """
+    rows = (
+        db.query(
+            entity_column,
+            event_model.event_type,
+            func.count(event_model.id),
+            func.min(event_model.created_at),
+            func.max(event_model.created_at),
+        )
+        .filter(event_model.created_at < cutoff)
+        .group_by(entity_column, event_model.event_type)
+        .all()
+    )
+    if not rows:
+        return 0
+
+    rollup: Dict[str, dict] = {}
+    for entity_id, event_type, count, first_at, last_at in rows:
+        if entity_id is None:
+            continue
+        entry = rollup.setdefault(
+            str(entity_id), {"counts": {}, "first": first_at, "last": last_at}
+        )
+        entry["counts"][event_type or "unknown"] = count
+        entry["first"] = min(entry["first"], first_at)
+        entry["last"] = max(entry["last"], last_at)
+
+    entity_ids = list(rollup)
+    for start in range(0, len(entity_ids), BATCH_SIZE):
+        chunk = entity_ids[start : start + BATCH_SIZE]
+        existing = {
+            s.entity_id: s
+            for s in db.query(EventSummary).filter(
+                EventSummary.entity_type == entity_type,
+                EventSummary.entity_id.in_(chunk),
+            )
+        }
+        for entity_id in chunk:
+            entry = rollup[entity_id]
+            summary = existing.get(entity_id)
+            if summary is None:
+                summary = EventSummary(
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    event_counts={},
+                    event_total=0,
+                    first_event_at=entry["first"],
+                    last_event_at=entry["last"],
+                )
+                db.add(summary)
+
+            counts = dict(summary.event_counts or {})
+            for event_type, count in entry["counts"].items():
+                counts[event_type] = counts.get(event_type, 0) + count
+            summary.event_counts = counts
+            summary.event_total = sum(counts.values())
+            summary.first_event_at = min(filter(None, [summary.first_event_at, entry["first"]]))
+            summary.last_event_at = max(filter(None, [summary.last_event_at, entry["last"]]))
+
+    deleted = (
+        db.query(event_model)
+        .filter(event_model.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    return deleted
+
+
+# ───────────────────────────────────────────
+# ROW PRUNING
+# ───────────────────────────────────────────
+
+def prune_scan_history(db, cutoff: datetime) -> int:
+    """Delete scan entries not seen since cutoff."""
+    return (
+        db.query(ScanHistory)
+        .filter(or_(ScanHistory.last_seen < cutoff, ScanHistory.last_seen.is_(None) & (ScanHistory.created_at < cutoff)))
+        .delete(synchronize_session=False)
+    )
+
+
+def prune_failed_tailored_resumes(db, cutoff: datetime) -> int:
+    """Delete failed tailoring attempts and their event logs."""
+    failed_ids = [
+        row.id
+        for row in db.query(TailoredResume.id).filter(
+            TailoredResume.status == "failed",
+            TailoredResume.created_at < cutoff,
+        )
+    ]
+    for start in range(0, len(failed_ids), BATCH_SIZE):
+        chunk = failed_ids[start : start + BATCH_SIZE]
+        db.query(ResumeEvent).filter(ResumeEvent.tailored_resume_id.in_(chunk)).delete(
+            synchronize_session=False
+        )
+        db.query(TailoredResume).filter(TailoredResume.id.in_(chunk)).delete(
+            synchronize_session=False
+        )
+    return len(failed_ids)
+
+
+# ───────────────────────────────────────────
+# BLOBS
+# ───────────────────────────────────────────
+
+def move_inline_payloads(db) -> int:
+    """
+    Move payloads still stored inline (rows written before the blob store)
+    into blobs, and clear the legacy llm_raw_response duplicate.
+    """
+    moved = 0
+
+    apps = (
+        db.query(Application)
+        .filter(
+            or_(
+                Application._tailored_resume_inline.isnot(None),
+                Application._cover_letter_inline.isnot(None),
+            )
+        )
+        .all()
+    )
+    for app in apps:
+        if app._tailored_resume_inline is not None and app.tailored_resume_ref is None:
+            app.tailored_resume_ref = put_blob(db, app._tailored_resume_inline)
+        if app._cover_letter_inline is not None and app.cover_letter_ref is None:
+            app.cover_letter_ref = put_blob(db, app._cover_letter_inline, kind="text")
+        app._tailored_resume_inline = None
+        app._cover_letter_inline = None
+        moved += 1
+
+    tailored = (
+        db.query(TailoredResume)
+        .filter(TailoredResume._llm_structured_inline.isnot(None))
+        .all()
+    )
+    for record in tailored:
+        if record._llm_structured_inline is not None and record.llm_structured_ref is None:
+            record.llm_structured_ref = put_blob(db, record._llm_structured_inline)
+        record._llm_structured_inline = None
+        moved += 1
+
+    inspector = inspect(engine)
+    columns = {c["name"] for c in inspector.get_columns("tailored_resumes")}
+    if "llm_raw_response" in columns:
+        db.execute(text("UPDATE tailored_resumes SET llm_raw_response = NULL WHERE llm_raw_response IS NOT NULL"))
+
+    return moved
+
+
+BLOB_REF_COLUMNS = (
+    Application.tailored_resume_ref,
+    Application.cover_letter_ref,
+    TailoredResume.llm_structured_ref,
+    TailoredResume.analysis_ref,
+    TailoredResume.cover_letter_ref,
+)
+
+
+def delete_unreferenced_blobs(db, cutoff: datetime) -> int:
+    """
+    Delete blobs last written before cutoff that no *_ref column points at.
+
+    A request may reuse a blob by content hash while this runs; put_blob
+    refreshes created_at on reuse, so the grace period covers its
+    uncommitted row. The reference check runs inside the DELETE itself.
+    """
+    return (
+        db.query(Blob)
+        .filter(
+            or_(Blob.created_at.is_(None), Blob.created_at < cutoff),
+            *(~exists().where(column == Blob.id) for column in BLOB_REF_COLUMNS),
+        )
+        .delete(synchronize_session=False)
+    )
+
+
+# ───────────────────────────────────────────
+# FILES
+# ───────────────────────────────────────────
+
+def _normalize_path(path: str) -> str:
+    if not os.path.isabs(path):
+        path = os.path.join(_BACKEND_DIR, path)
+    return os.path.realpath(path)
+
+
+def referenced_files(db) -> Set[str]:
+    """Absolute paths of every file a row still points at."""
+    paths = [p for (p,) in db.query(Resume.original_file_path)]
+    paths += [p for (p,) in db.query(TailoredResume.pdf_path)]
+    paths += [p for (p,) in db.query(TailoredResume.cover_letter_pdf_path)]
+    paths += [p for (p,) in db.query(Application.cv_file_path)]
+    paths += [p for (p,) in db.query(Application.cv_used)]
+    return {_normalize_path(p) for p in paths if p}
+
+
+def find_orphaned_files(db, min_age_days: int, directories: Optional[List[str]] = None) -> List[str]:
+    """
+    Files older than min_age_days that no row references. By default scans
+    the upload, PDF and generated-PDF (PDFGenerator output) directories.
+    Files only handed out by URL, such as v1 cover letter PDFs, live exactly
+    min_age_days. Nothing is deleted: see delete_files.
+    """
+    directories = directories or list(dict.fromkeys(
+        os.path.realpath(d) for d in (UPLOAD_DIR, PDF_DIR, GENERATED_PDF_DIR)
+    ))
+    keep = referenced_files(db)
+    cutoff = time.time() - min_age_days * 86400
+    orphaned = []
+
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            path = os.path.realpath(os.path.join(directory, name))
+            if not os.path.isfile(path) or path in keep:
+                continue
+            if os.path.getmtime(path) >= cutoff:
+                continue
+            orphaned.append(path)
+
+    return orphaned
+
+
+def delete_files(paths: List[str]) -> int:
+    """Remove files; call only once the transaction that orphaned them has committed."""
+    deleted = 0
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"compaction: could not delete {path}: {e}")
+            continue
+        deleted += 1
+    return deleted
+
+
+# ───────────────────────────────────────────
+# DATABASE MAINTENANCE
+# ───────────────────────────────────────────
+
+def vacuum_analyze() -> None:
+    """Reclaim space and refresh planner statistics. Must run outside a transaction."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if is_sqlite:
+            conn.execute(text("VACUUM"))
+            conn.execute(text("ANALYZE"))
+        else:
+            conn.execute(text("VACUUM ANALYZE"))
+
+
+def run_compaction(
+    retention_overrides: Optional[Dict[str, int]] = None,
+    dry_run: bool = False,
+    vacuum: bool = True,
+) -> Dict[str, int]:
+    """
+    Run every retention step in one transaction and return per-step counts.
+    Orphaned files are deleted after the commit. With dry_run the
+    transaction is rolled back and no file is touched.
+    """
+    days = get_retention_days(retention_overrides)
+    now = datetime.utcnow()
+    stats: Dict[str, int] = {}
+
+    db = SessionLocal()
+    try:
+        if days["application_events"]:
+            stats["application_events"] = summarize_events(
+                db,
+                ApplicationEvent,
+                ApplicationEvent.application_id,
+                "application",
+                now - timedelta(days=days["application_events"]),
+            )
+        if days["resume_events"]:
+            stats["resume_events"] = summarize_events(
+                db,
+                ResumeEvent,
+                ResumeEvent.tailored_resume_id,
+                "tailored_resume",
+                now - timedelta(days=days["resume_events"]),
+            )
+        if days["scan_history"]:
+            stats["scan_history"] = prune_scan_history(
+                db, now - timedelta(days=days["scan_history"])
+            )
+        if days["failed_tailored_resumes"]:
+            stats["failed_tailored_resumes"] = prune_failed_tailored_resumes(
+                db, now - timedelta(days=days["failed_tailored_resumes"])
+            )
+
+        stats["inline_payloads_moved"] = move_inline_payloads(db)
+        db.flush()
+        stats["blobs_deleted"] = delete_unreferenced_blobs(db, now - BLOB_GRACE_PERIOD)
+
+        # Files of rows pruned above are deleted only after the commit, so a
+        # failed commit cannot leave restored rows pointing at missing files
+        orphaned_files = []
+        if days["orphaned_files"]:
+            orphaned_files = find_orphaned_files(db, days["orphaned_files"])
+            stats["orphaned_files"] = len(orphaned_files)
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if orphaned_files and not dry_run:
+        stats["orphaned_files"] = delete_files(orphaned_files)
+
+    if vacuum and not dry_run:
+        vacuum_analyze()
+
+    logger.info(f"compaction {'(dry run) ' if dry_run else ''}finished: {stats}")
+    return stats
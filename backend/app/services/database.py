@@ -1,10 +1,14 @@
-from sqlalchemy import create_engine, Column, String, Integer, Text, DateTime, JSON, Boolean
+from sqlalchemy import create_engine, inspect, text, Column, String, Integer, Text, DateTime, JSON, Boolean, Float, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, deferred
 from datetime import datetime
 import uuid
 import os
 
+from app.services.blob_store import BlobField, install_blob_store
+from app.services.metrics import instrument_engine
+from app.services.tracing import instrument_session
+
 _BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -20,6 +24,8 @@ connect_args = {"check_same_thread": False} if is_sqlite else {}
 
 engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=not is_sqlite)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine)
+instrument_session(SessionLocal)
 Base = declarative_base()
 
 
@@ -86,8 +92,13 @@ class Application(Base):
     notes = Column(Text)
     cv_used = Column(Text)
     cv_file_path = Column(Text)
-    tailored_resume = Column(JSON)
-    cover_letter = Column(Text)
+    tailored_resume_ref = Column(String(64))
+    cover_letter_ref = Column(String(64))
+    # Legacy inline columns — only read for rows written before the blob store
+    _tailored_resume_inline = deferred(Column("tailored_resume", JSON(none_as_null=True)))
+    _cover_letter_inline = deferred(Column("cover_letter", Text))
+    tailored_resume = BlobField("tailored_resume_ref", "_tailored_resume_inline")
+    cover_letter = BlobField("cover_letter_ref", "_cover_letter_inline", kind="text")
     applied_at = Column(DateTime)
     error_message = Column(Text)
     retry_count = Column(Integer, default=0)
@@ -125,10 +136,17 @@ class TailoredResume(Base):
     resume_id = Column(String(36))
     job_description = Column(Text)
     llm_model = Column(String(100))
-    llm_raw_response = Column(Text)
-    llm_structured_json = Column(JSON)
+    llm_structured_ref = Column(String(64))
+    _llm_structured_inline = deferred(Column("llm_structured_json", JSON(none_as_null=True)))
+    llm_structured_json = BlobField("llm_structured_ref", "_llm_structured_inline")
     template_used = Column(String(100))
     pdf_path = Column(Text)
+    # Step 2/3 results of the run, reused by cover letters instead of re-analysing
+    analysis_ref = Column(String(64))
+    analysis_json = BlobField("analysis_ref")
+    cover_letter_ref = Column(String(64))
+    cover_letter = BlobField("cover_letter_ref", kind="text")
+    cover_letter_pdf_path = Column(Text)
     status = Column(String(50), default="processing")
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -155,6 +173,9 @@ class ScanHistory(Base):
     location = Column(String(255))
     portal = Column(String(100))
     status = Column(String(50), default="pending")
+    description = Column(Text, nullable=True)
+    match_score = Column(Integer, nullable=True)
+    scored_at = Column(DateTime, nullable=True)
     first_seen = Column(DateTime, default=datetime.utcnow)
     last_seen = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -170,12 +191,92 @@ class PipelineEntry(Base):
     company = Column(String(255))
     section = Column(String(50), default="pending")
     location = Column(String(255), nullable=True)
+    description = Column(Text, nullable=True)
+    match_score = Column(Integer, nullable=True)
+    scored_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class LLMUsage(Base):
+    """One row per LLM call: tokens, latency and retries, tagged by pipeline step."""
+
+    __tablename__ = "llm_usage"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(255), index=True)
+    tailored_resume_id = Column(String(36), nullable=True)
+    step = Column(String(50), index=True)
+    model = Column(String(255))
+    tier = Column(String(20))
+    provider = Column(String(20))
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    cached_tokens = Column(Integer, default=0)
+    cost = Column(Float, nullable=True)
+    latency_ms = Column(Float, default=0)
+    queue_ms = Column(Float, default=0)
+    ttft_ms = Column(Float, default=0)
+    retries = Column(Integer, default=0)
+    fallbacks = Column(Integer, default=0)
+    hedged = Column(Boolean, default=False)
+    tokens_saved = Column(Integer, default=0)
+    cache_hit = Column(Boolean, default=False)
+    success = Column(Boolean, default=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class EventSummary(Base):
+    """Per-entity rollup of events removed by the retention job."""
+
+    __tablename__ = "event_summaries"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    entity_type = Column(String(50))
+    entity_id = Column(String(36))
+    event_counts = Column(JSON)
+    event_total = Column(Integer, default=0)
+    first_event_at = Column(DateTime)
+    last_event_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Blob(Base):
+    """Compressed, content-addressed payloads referenced by *_ref columns."""
+
+    __tablename__ = "blobs"
+
+    id = Column(String(64), primary_key=True)
+    kind = Column(String(10), default="json")
+    codec = Column(String(10), default="gzip")
+    size = Column(Integer)
+    stored_size = Column(Integer)
+    data = Column(LargeBinary)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+install_blob_store(SessionLocal, Blob)
+
+
+def _add_missing_columns():
+    """create_all() never alters existing tables — add new nullable columns in place."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
 
 
 def get_or_create_credits(db, user_id: str):
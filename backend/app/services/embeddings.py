@@ -0,0 +1,378 @@
+"""
+Embeddings - Local text embeddings and a vector index for job matching
+
+Ranks job descriptions against a resume on the CPU, without LLM calls:
+- HashingEmbedder (default): signed feature hashing of words, word bigrams
+  and canonical skills from the job_analyzer taxonomy, sublinear TF,
+  L2-normalized. Deterministic, nothing to download.
+- SentenceTransformerEmbedder when EMBEDDING_MODEL is set and the
+  `sentence-transformers` package is installed.
+
+VectorIndex answers top-k cosine queries over unit vectors:
+- NumPy brute force (one matrix-vector product) when numpy is installed
+- hnswlib ANN graph from ANN_MIN_ITEMS vectors up, when hnswlib is installed
+- plain Python dot products otherwise (fine for a few hundred jobs)
+
+Scores are section-aware: each JD requirement bullet is compared with its
+closest resume section, so a long resume is not diluted by unrelated roles.
+"""
+
+import logging
+import math
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.job_analyzer import (
+    _bullets,
+    analyze_job_locally,
+    find_skills,
+    keyword_match_score,
+    split_sections,
+)
+from app.services.prompt_compactor import strip_jd_boilerplate
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+try:
+    import hnswlib
+except ImportError:  # optional dependency
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1024"))
+ANN_MIN_ITEMS = int(os.getenv("EMBEDDING_ANN_MIN_ITEMS", "5000"))
+
+# Cosine between a requirement bullet and its best resume section that
+# counts as a full match; hashed bag-of-words vectors rarely exceed it
+SIM_SATURATION = 0.5
+
+# Share of the keyword (taxonomy skill) score in batch scores; the rest is semantic
+KEYWORD_WEIGHT = 0.5
+
+SKILL_WEIGHT = 3.0
+BIGRAM_WEIGHT = 0.5
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#]*(?:[.-][a-z0-9+#]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the to we will with you your "
+    "this that who what which their they us etc able ability strong experience experienced working work "
+    "years year team teams role including plus using use well new across within".split()
+)
+
+
+# ───────────────────────────────────────────
+# EMBEDDERS
+# ───────────────────────────────────────────
+
+class HashingEmbedder:
+    """Bag-of-features vectors via the hashing trick; stable across processes."""
+
+    name = "hashing"
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> Dict[str, float]:
+        words = [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+        counts: Dict[str, float] = {}
+        for word in words:
+            counts[word] = counts.get(word, 0.0) + 1.0
+        for left, right in zip(words, words[1:]):
+            key = f"{left} {right}"
+            counts[key] = counts.get(key, 0.0) + BIGRAM_WEIGHT
+        for skill, mentions in find_skills(text).items():
+            counts[f"skill:{skill}"] = SKILL_WEIGHT * mentions
+        return counts
+
+    def embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for feature, count in self._features(text).items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            weight = 1.0 + math.log(count) if count >= 1 else count
+            vector[h % self.dim] += weight if h & 0x80000000 else -weight
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+
+class SentenceTransformerEmbedder:
+    """Dense sentence embeddings from a local sentence-transformers model."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.name = model_name
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, text: str) -> List[float]:
+        return self._model.encode(text, normalize_embeddings=True).tolist()
+
+
+@lru_cache(maxsize=1)
+def get_embedder():
+    if EMBEDDING_MODEL:
+        try:
+            return SentenceTransformerEmbedder(EMBEDDING_MODEL)
+        except Exception as e:  # missing package or model
+            logger.warning(f"Embedding model {EMBEDDING_MODEL!r} unavailable, using hashing: {e}")
+    return HashingEmbedder()
+
+
+@lru_cache(maxsize=4096)
+def embed_text(text: str) -> Tuple[float, ...]:
+    """Unit vector for text (cached; JDs and resume sections repeat a lot)."""
+    return tuple(get_embedder().embed(text))
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _mean_vector(vectors: List[Sequence[float]]) -> List[float]:
+    total = [sum(column) for column in zip(*vectors)]
+    norm = math.sqrt(sum(v * v for v in total))
+    return [v / norm for v in total] if norm else total
+
+
+# ───────────────────────────────────────────
+# VECTOR INDEX
+# ───────────────────────────────────────────
+
+class VectorIndex:
+    """Top-k cosine search over unit vectors keyed by id."""
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim or get_embedder().dim
+        self.ids: List[str] = []
+        self._vectors: List[Sequence[float]] = []
+        self._matrix = None
+        self._ann = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def backend(self) -> str:
+        if np is None:
+            return "python"
+        if hnswlib is not None and len(self.ids) >= ANN_MIN_ITEMS:
+            return "hnswlib"
+        return "numpy"
+
+    def add(self, item_id: str, vector: Sequence[float]) -> None:
+        self.ids.append(item_id)
+        self._vectors.append(vector)
+        self._matrix = self._ann = None
+
+    def add_texts(self, items: Sequence[Tuple[str, str]]) -> None:
+        """Embed and add (id, text) pairs."""
+        for item_id, text in items:
+            self.add(item_id, embed_text(text))
+
+    def _build(self) -> None:
+        self._matrix = np.asarray(self._vectors, dtype=np.float32).reshape(-1, self.dim)
+        if self.backend == "hnswlib":
+            self._ann = hnswlib.Index(space="ip", dim=self.dim)
+            self._ann.init_index(max_elements=len(self.ids), ef_construction=200, M=16)
+            self._ann.add_items(self._matrix, np.arange(len(self.ids)))
+
+    def scores(self, query: Sequence[float]) -> List[float]:
+        """Cosine similarity of query with every stored vector, in insertion order."""
+        if np is None:
+            return [_dot(query, vector) for vector in self._vectors]
+        if self._matrix is None:
+            self._build()
+        return (self._matrix @ np.asarray(query, dtype=np.float32)).tolist()
+
+    def search(self, query: Sequence[float], k: int = 10) -> List[Tuple[str, float]]:
+        """The k most similar ids, best first."""
+        k = min(k, len(self.ids))
+        if k <= 0:
+            return []
+        if np is not None:
+            if self._matrix is None:
+                self._build()
+            if self._ann is not None:
+                self._ann.set_ef(max(50, 2 * k))
+                labels, distances = self._ann.knn_query(np.asarray(query, dtype=np.float32), k=k)
+                return [(self.ids[i], 1.0 - float(d)) for i, d in zip(labels[0], distances[0])]
+            similarities = self._matrix @ np.asarray(query, dtype=np.float32)
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top])]
+            return [(self.ids[i], float(similarities[i])) for i in top]
+        ranked = sorted(zip(self.ids, self.scores(query)), key=lambda pair: pair[1], reverse=True)
+        return ranked[:k]
+
+
+# ───────────────────────────────────────────
+# RESUME / JOB SECTIONS
+# ───────────────────────────────────────────
+
+_RESUME_HEADING_RE = re.compile(r"^\s*[A-Z][A-Za-z &/]{2,40}:?\s*$")
+
+
+def resume_sections(resume_text: str) -> List[str]:
+    """Resume split at headings and blank lines into non-trivial chunks."""
+    chunks: List[str] = []
+    current: List[str] = []
+    for line in resume_text.splitlines():
+        if not line.strip() or (_RESUME_HEADING_RE.match(line) and line.strip().isupper()):
+            if current:
+                chunks.append(" ".join(current))
+                current = []
+            continue
+        current.append(line.strip())
+    if current:
+        chunks.append(" ".join(current))
+    chunks = [chunk for chunk in chunks if len(chunk) >= 20]
+    return chunks or ([resume_text] if resume_text.strip() else [])
+
+
+def job_requirements(job_description: str) -> List[str]:
+    """Requirement and responsibility bullets, or the whole JD if it has no sections."""
+    sections = split_sections(strip_jd_boilerplate(job_description))
+    lines = sections.get("requirements", []) + sections.get("responsibilities", [])
+    items = _bullets(lines)
+    return items or [job_description]
+
+
+# ───────────────────────────────────────────
+# SCORING
+# ───────────────────────────────────────────
+
+class ResumeVectors:
+    """Embedded resume sections, reused across every job scored against them."""
+
+    def __init__(self, resume_text: str):
+        self.sections = resume_sections(resume_text)
+        self.index = VectorIndex()
+        self.index.add_texts([(str(i), section) for i, section in enumerate(self.sections)])
+        self.centroid = _mean_vector(list(self.index._vectors)) if self.sections else None
+
+    def match_score(self, job_description: str) -> int:
+        """0-100: how well the closest resume section covers each JD requirement."""
+        return round(self.coverage(job_requirements(job_description)))
+
+    def coverage(self, requirements: List[str]) -> float:
+        if not self.sections:
+            return 0.0
+        coverage = []
+        for requirement in requirements:
+            best = max(self.index.scores(embed_text(requirement)))
+            coverage.append(min(1.0, max(0.0, best) / SIM_SATURATION))
+        return 100 * sum(coverage) / len(coverage)
+
+
+def semantic_match_score(resume_text: str, job_description: str) -> int:
+    return ResumeVectors(resume_text).match_score(job_description)
+
+
+def rank_jobs(
+    resume_text: str,
+    jobs: Sequence[Tuple[str, str]],
+    top_k: Optional[int] = None,
+    shortlist: int = 200,
+) -> List[Tuple[str, int]]:
+    """
+    Rank (job_id, job_description) pairs against a resume, best first.
+
+    A whole-resume vector pulls a shortlist out of the job index in one
+    query; only the shortlist gets the per-requirement section score.
+    """
+    resume = ResumeVectors(resume_text)
+    if resume.centroid is None or not jobs:
+        return [(job_id, 0) for job_id, _ in jobs][:top_k]
+
+    index = VectorIndex(resume.index.dim)
+    index.add_texts([(job_id, "\n".join(job_requirements(text))) for job_id, text in jobs])
+    texts = dict(jobs)
+    candidates = index.search(resume.centroid, k=max(shortlist, top_k) if top_k else len(jobs))
+    ranked = sorted(
+        ((job_id, resume.match_score(texts[job_id])) for job_id, _ in candidates),
+        key=lambda pair: pair[1],
+        reverse=True,
+    )
+    return ranked[:top_k] if top_k else ranked
+
+
+# ───────────────────────────────────────────
+# BATCH SCORING
+# ───────────────────────────────────────────
+
+_SKILL_FIELD_WEIGHTS = (("preferred_skills", 1), ("tools_and_technologies", 2), ("required_skills", 3))
+
+
+def batch_match_scores(resume_text: str, job_descriptions: Sequence[str]) -> List[int]:
+    """
+    0-100 scores for many jobs against one resume, in input order.
+
+    Blends the taxonomy keyword score (as keyword_match_score) with the
+    section-aware semantic score. With numpy both are single matrix
+    products: a jobs x skills weight matrix against the resume's skill
+    vector, and every requirement bullet of every job against the resume
+    sections at once.
+    """
+    if not job_descriptions:
+        return []
+    resume = ResumeVectors(resume_text)
+    analyses = [analyze_job_locally(text) for text in job_descriptions]
+    requirements = [job_requirements(text) for text in job_descriptions]
+
+    if np is None:
+        keyword = [keyword_match_score(analysis, resume_text) for analysis in analyses]
+        has_skills = [
+            any(getattr(analysis, field) for field, _ in _SKILL_FIELD_WEIGHTS) for analysis in analyses
+        ]
+        semantic = [resume.coverage(reqs) for reqs in requirements]
+    else:
+        keyword, has_skills = _keyword_matrix_scores(analyses, set(find_skills(resume_text)))
+        semantic = _semantic_matrix_scores(resume, requirements)
+
+    return [
+        round(KEYWORD_WEIGHT * kw + (1 - KEYWORD_WEIGHT) * sem) if skills else round(sem)
+        for kw, sem, skills in zip(keyword, semantic, has_skills)
+    ]
+
+
+def _keyword_matrix_scores(analyses, resume_skills) -> Tuple[List[float], List[bool]]:
+    vocabulary: Dict[str, int] = {}
+    rows, cols, weights = [], [], []
+    for row, analysis in enumerate(analyses):
+        job_weights: Dict[str, int] = {}
+        for field, weight in _SKILL_FIELD_WEIGHTS:
+            for skill in getattr(analysis, field):
+                job_weights[skill] = max(job_weights.get(skill, 0), weight)
+        for skill, weight in job_weights.items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(skill, len(vocabulary)))
+            weights.append(weight)
+
+    matrix = np.zeros((len(analyses), max(len(vocabulary), 1)), dtype=np.float32)
+    matrix[rows, cols] = weights
+    present = np.zeros(matrix.shape[1], dtype=np.float32)
+    for skill, col in vocabulary.items():
+        present[col] = skill in resume_skills
+
+    totals = matrix.sum(axis=1)
+    scores = np.divide(100 * (matrix @ present), totals, out=np.zeros_like(totals), where=totals > 0)
+    return scores.tolist(), (totals > 0).tolist()
+
+
+def _semantic_matrix_scores(resume: ResumeVectors, requirements: List[List[str]]) -> List[float]:
+    if not resume.sections:
+        return [0.0] * len(requirements)
+    sections = np.asarray(resume.index._vectors, dtype=np.float32)
+    bullets = np.asarray([embed_text(req) for reqs in requirements for req in reqs], dtype=np.float32)
+    coverage = np.clip((bullets @ sections.T).max(axis=1) / SIM_SATURATION, 0.0, 1.0)
+    counts = np.asarray([len(reqs) for reqs in requirements])
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return (100 * np.add.reduceat(coverage, offsets) / counts).tolist()
@@ -0,0 +1,521 @@
+"""
+Job Analyzer - Deterministic job description analysis (no LLM)
+
+Produces a JobAnalysis from a raw job description in milliseconds:
+- section detection: requirements / preferred / responsibilities / benefits
+- skill taxonomy matching (aliases, case-sensitive short names like Go / R)
+- minimum years of experience and education level by regex
+- title, company and location from labels and the first lines
+
+Used directly where an LLM call per job is too slow or too expensive
+(/jobs/analyze, batch ranking), and by step2_analyze_job to verify the LLM's
+answer: taxonomy skills the LLM lists that never occur in the text (under
+any alias) are dropped, and locally found requirements it missed are added
+back.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.services.prompt_compactor import strip_jd_boilerplate
+from app.services.resume_schema import JobAnalysis
+
+
+# ───────────────────────────────────────────
+# SKILL TAXONOMY
+# ───────────────────────────────────────────
+
+# canonical name -> (kind, aliases). kind "tool" lands in tools_and_technologies.
+SKILL_TAXONOMY: Dict[str, Tuple[str, List[str]]] = {
+    # Languages
+    "Python": ("language", ["python", "python3"]),
+    "JavaScript": ("language", ["javascript", "js", "es6", "ecmascript"]),
+    "TypeScript": ("language", ["typescript", "ts"]),
+    "Java": ("language", ["java"]),
+    "Kotlin": ("language", ["kotlin"]),
+    "Swift": ("language", []),
+    "Go": ("language", ["golang"]),
+    "R": ("language", []),
+    "C": ("language", []),
+    "Rust": ("language", ["rust"]),
+    "C++": ("language", ["c++", "cpp"]),
+    "C#": ("language", ["c#", "csharp"]),
+    "Ruby": ("language", ["ruby"]),
+    "PHP": ("language", ["php"]),
+    "Scala": ("language", ["scala"]),
+    "SQL": ("language", ["sql"]),
+    "Bash": ("language", ["bash", "shell scripting"]),
+    "HTML": ("language", ["html", "html5"]),
+    "CSS": ("language", ["css", "css3", "scss", "sass"]),
+    # Frameworks / libraries
+    "React": ("framework", ["react", "react.js", "reactjs"]),
+    "Next.js": ("framework", ["next.js", "nextjs"]),
+    "Vue": ("framework", ["vue", "vue.js", "vuejs"]),
+    "Angular": ("framework", ["angular", "angularjs"]),
+    "Svelte": ("framework", ["svelte", "sveltekit"]),
+    "Redux": ("framework", ["redux"]),
+    "Tailwind CSS": ("framework", ["tailwind", "tailwind css", "tailwindcss"]),
+    "Node.js": ("framework", ["node.js", "nodejs", "node"]),
+    "Express": ("framework", ["express.js", "expressjs"]),
+    "NestJS": ("framework", ["nestjs", "nest.js"]),
+    "Django": ("framework", ["django"]),
+    "Flask": ("framework", ["flask"]),
+    "FastAPI": ("framework", ["fastapi"]),
+    "Spring": ("framework", ["spring", "spring boot", "springboot"]),
+    "Rails": ("framework", ["rails", "ruby on rails"]),
+    "Laravel": ("framework", ["laravel"]),
+    ".NET": ("framework", [".net", "dotnet", "asp.net", ".net core"]),
+    "React Native": ("framework", ["react native"]),
+    "Flutter": ("framework", ["flutter"]),
+    "GraphQL": ("framework", ["graphql"]),
+    "TensorFlow": ("framework", ["tensorflow"]),
+    "PyTorch": ("framework", ["pytorch"]),
+    "scikit-learn": ("framework", ["scikit-learn", "sklearn", "scikit"]),
+    "Pandas": ("framework", ["pandas"]),
+    "NumPy": ("framework", ["numpy"]),
+    "Spark": ("framework", ["spark", "apache spark", "pyspark"]),
+    "LangChain": ("framework", ["langchain"]),
+    "Celery": ("framework", ["celery"]),
+    "Playwright": ("framework", ["playwright"]),
+    "Jest": ("framework", ["jest"]),
+    "Pytest": ("framework", ["pytest"]),
+    "Cypress": ("framework", ["cypress"]),
+    # Tools / platforms / data stores
+    "AWS": ("tool", ["aws", "amazon web services"]),
+    "Azure": ("tool", ["azure", "microsoft azure"]),
+    "GCP": ("tool", ["gcp", "google cloud", "google cloud platform"]),
+    "Docker": ("tool", ["docker", "containers", "containerization"]),
+    "Kubernetes": ("tool", ["kubernetes", "k8s", "eks", "gke", "aks"]),
+    "Terraform": ("tool", ["terraform"]),
+    "Ansible": ("tool", ["ansible"]),
+    "Jenkins": ("tool", ["jenkins"]),
+    "GitHub Actions": ("tool", ["github actions"]),
+    "CI/CD": ("tool", ["ci/cd", "ci / cd", "continuous integration", "continuous delivery", "continuous deployment"]),
+    "Git": ("tool", ["git", "github", "gitlab", "bitbucket"]),
+    "Linux": ("tool", ["linux", "unix"]),
+    "PostgreSQL": ("tool", ["postgresql", "postgres"]),
+    "MySQL": ("tool", ["mysql", "mariadb"]),
+    "MongoDB": ("tool", ["mongodb", "mongo"]),
+    "Redis": ("tool", ["redis"]),
+    "Elasticsearch": ("tool", ["elasticsearch", "opensearch", "elk"]),
+    "Kafka": ("tool", ["kafka", "apache kafka"]),
+    "RabbitMQ": ("tool", ["rabbitmq"]),
+    "DynamoDB": ("tool", ["dynamodb"]),
+    "Snowflake": ("tool", ["snowflake"]),
+    "BigQuery": ("tool", ["bigquery"]),
+    "Airflow": ("tool", ["airflow", "apache airflow"]),
+    "dbt": ("tool", ["dbt"]),
+    "Supabase": ("tool", ["supabase"]),
+    "Firebase": ("tool", ["firebase"]),
+    "Vercel": ("tool", ["vercel"]),
+    "Figma": ("tool", ["figma"]),
+    "Jira": ("tool", ["jira"]),
+    "Datadog": ("tool", ["datadog"]),
+    "Prometheus": ("tool", ["prometheus"]),
+    "Grafana": ("tool", ["grafana"]),
+    "Tableau": ("tool", ["tableau"]),
+    "Power BI": ("tool", ["power bi", "powerbi"]),
+    "Excel": ("tool", []),
+    "Salesforce": ("tool", ["salesforce"]),
+    # Practices / domains
+    "REST": ("concept", ["restful", "rest api", "rest apis", "restful apis"]),
+    "Microservices": ("concept", ["microservices", "microservice architecture"]),
+    "System Design": ("concept", ["system design", "distributed systems"]),
+    "Machine Learning": ("concept", ["machine learning"]),
+    "Deep Learning": ("concept", ["deep learning"]),
+    "NLP": ("concept", ["nlp", "natural language processing"]),
+    "LLM": ("concept", ["llm", "llms", "large language models", "generative ai", "genai"]),
+    "RAG": ("concept", ["rag", "retrieval augmented generation", "retrieval-augmented generation"]),
+    "Computer Vision": ("concept", ["computer vision"]),
+    "Data Engineering": ("concept", ["data engineering", "etl", "data pipelines"]),
+    "Data Analysis": ("concept", ["data analysis", "analytics"]),
+    "DevOps": ("concept", ["devops", "sre", "site reliability"]),
+    "Security": ("concept", ["security", "owasp", "oauth", "oauth2"]),
+    "Testing": ("concept", ["unit testing", "test automation", "tdd", "automated testing"]),
+    "Agile": ("concept", ["agile", "scrum", "kanban"]),
+    "Accessibility": ("concept", ["accessibility", "a11y", "wcag"]),
+    "Responsive Design": ("concept", ["responsive design", "mobile-first"]),
+    "Performance Optimization": ("concept", ["performance optimization", "performance tuning"]),
+    "Mobile Development": ("concept", ["ios", "android", "mobile development"]),
+}
+
+# Names that are ordinary English words in lower case ("the rest of", "excel at")
+CASE_SENSITIVE_ALIASES: Dict[str, str] = {
+    "Go": "Go", "R": "R", "C": "C", "REST": "REST", "ML": "Machine Learning",
+    "Express": "Express", "Swift": "Swift", "Excel": "Excel",
+}
+# ...and the ones that only count inside a skill list ("Python, Go, SQL")
+_LIST_CONTEXT_ONLY = {"Go", "R", "C"}
+
+SOFT_SKILLS = {
+    "Communication": ["communication", "communicator"],
+    "Collaboration": ["collaboration", "collaborative", "cross-functional", "teamwork"],
+    "Leadership": ["leadership", "mentor", "mentoring", "mentorship"],
+    "Problem Solving": ["problem solving", "problem-solving", "analytical"],
+    "Ownership": ["ownership", "self-starter", "autonomous", "independently"],
+    "Adaptability": ["adaptability", "fast-paced", "ambiguity"],
+    "Attention to Detail": ["attention to detail", "detail-oriented", "detail oriented"],
+    "Time Management": ["time management", "prioritize", "prioritization"],
+}
+
+
+def _alias_pattern(aliases: List[str], flags: int = re.IGNORECASE) -> "re.Pattern":
+    alternation = "|".join(re.escape(a) for a in sorted(aliases, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#.])({alternation})(?![\w+#]|\.\w)", flags)
+
+
+_ALIAS_TO_SKILL = {alias: name for name, (_, aliases) in SKILL_TAXONOMY.items() for alias in aliases}
+_SKILL_RE = _alias_pattern(list(_ALIAS_TO_SKILL))
+_CASE_SENSITIVE_RE = _alias_pattern(list(CASE_SENSITIVE_ALIASES), flags=0)
+_SOFT_TO_NAME = {alias: name for name, aliases in SOFT_SKILLS.items() for alias in aliases}
+_SOFT_RE = _alias_pattern(list(_SOFT_TO_NAME))
+
+
+def find_skills(text: str) -> Counter:
+    """Canonical skill name -> number of mentions in text."""
+    found: Counter = Counter()
+    for match in _SKILL_RE.finditer(text):
+        found[_ALIAS_TO_SKILL[match.group(1).lower()]] += 1
+    for match in _CASE_SENSITIVE_RE.finditer(text):
+        alias = match.group(1)
+        if alias in _LIST_CONTEXT_ONLY and not _in_list_context(text, match.start(), match.end()):
+            continue
+        found[CASE_SENSITIVE_ALIASES[alias]] += 1
+    return found
+
+
+def _in_list_context(text: str, start: int, end: int) -> bool:
+    before = text[max(0, start - 2):start]
+    after = text[end:end + 40]
+    return bool(
+        re.search(r"[,/(:]\s?$", before)
+        or re.match(r"\s?[,/)]|\s+(?:and|or)\s+[A-Z]|\s+(?:developer|engineer|programming|language|services|backend)\b", after)
+    )
+
+
+def skill_kind(name: str) -> str:
+    return SKILL_TAXONOMY.get(name, ("language", []))[0]
+
+
+# ───────────────────────────────────────────
+# SECTIONS
+# ───────────────────────────────────────────
+
+SECTION_HEADINGS = {
+    "requirements": re.compile(
+        r"^(?:requirements|qualifications|minimum qualifications|basic qualifications|"
+        r"required (?:skills|qualifications|experience)|must[- ]haves?|what you(?:'|’)?ll (?:need|bring)|"
+        r"what we(?:'|’)?re looking for|who you are|you have|about you|your profile|skills(?: (?:&|and) experience)?)$",
+        re.IGNORECASE,
+    ),
+    "preferred": re.compile(
+        r"^(?:preferred(?: qualifications| skills)?|nice[- ]to[- ]haves?|bonus(?: points)?|pluses|"
+        r"it(?:'|’)?s a plus if|extra credit|good to have|desired(?: skills)?)$",
+        re.IGNORECASE,
+    ),
+    "responsibilities": re.compile(
+        r"^(?:responsibilities|key responsibilities|duties|what you(?:'|’)?ll do|the role|"
+        r"your (?:role|responsibilities|impact)|in this role(?: you will)?|day[- ]to[- ]day)$",
+        re.IGNORECASE,
+    ),
+    "about": re.compile(r"^(?:about (?:us|the company|the team|the job|the role)|who we are|company overview)$", re.IGNORECASE),
+}
+_HEADING_LINE_RE = re.compile(r"^(?:#{1,6}\s*|\*\*)?([A-Za-z][\w &/,'’.-]{1,58}?)(?:\*\*)?\s*:?\s*(?:\*\*)?$")
+_BULLET_RE = re.compile(r"^\s*(?:[-•*▪●◦]|\d+[.)])\s+(.+)$")
+_PREFERRED_LINE_RE = re.compile(r"\b(?:nice to have|preferred|bonus|a plus|plus if|desirable|ideally)\b", re.IGNORECASE)
+
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """Lines per section; text before the first known heading goes to "intro"."""
+    sections: Dict[str, List[str]] = {"intro": []}
+    current = "intro"
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        heading = _HEADING_LINE_RE.match(line)
+        if heading and not _BULLET_RE.match(line):
+            name = heading.group(1).strip().rstrip(":")
+            matched = next((s for s, pattern in SECTION_HEADINGS.items() if pattern.match(name)), None)
+            if matched:
+                current = matched
+                sections.setdefault(current, [])
+                continue
+            if len(name.split()) <= 4 and line.endswith(":"):
+                current = "other"
+                sections.setdefault(current, [])
+                continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _bullets(lines: List[str]) -> List[str]:
+    items = []
+    for line in lines:
+        match = _BULLET_RE.match(line)
+        items.append((match.group(1) if match else line).strip())
+    return [item for item in items if 10 <= len(item) <= 300]
+
+
+# ───────────────────────────────────────────
+# FIELD EXTRACTORS
+# ───────────────────────────────────────────
+
+_YEARS_RE = re.compile(
+    r"(?:(?:at least|minimum(?: of)?|min\.?|over)\s+)?(\d{1,2}|one|two|three|four|five|six|seven|eight|nine|ten)"
+    r"\s*\+?\s*(?:(?:-|–|to)\s*(\d{1,2})\s*\+?\s*)?(?:years?|yrs?)\b[^.\n]{0,60}?"
+    r"\b(?:experience|exp\b|industry|professional|working|building|developing|in\b)",
+    re.IGNORECASE,
+)
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+_EDUCATION_LEVELS = [
+    ("PhD", re.compile(r"\b(?:ph\.?d|doctorate|doctoral)\b", re.IGNORECASE)),
+    ("Master's", re.compile(r"\b(?:master'?s|m\.?s\.?c?|msc|mba|m\.eng)\b(?!\s*office)", re.IGNORECASE)),
+    ("Bachelor's", re.compile(r"\b(?:bachelor'?s|b\.?s\.?c?|bsc|b\.?a\.|b\.?e\.|b\.?tech|undergraduate degree|4[- ]year degree|degree in)\b", re.IGNORECASE)),
+    ("Associate", re.compile(r"\bassociate'?s? degree\b", re.IGNORECASE)),
+    ("High School", re.compile(r"\b(?:high school|ged)\b", re.IGNORECASE)),
+]
+
+_TITLE_WORDS = re.compile(
+    r"\b(?:engineer|developer|architect|designer|manager|analyst|scientist|lead|director|"
+    r"consultant|specialist|administrator|intern|programmer|devops|sre|product owner|strategist|writer)\b",
+    re.IGNORECASE,
+)
+_LABEL_RE = {
+    "job_title": re.compile(r"^(?:job title|title|position|role)\s*[:\-–]\s*(.+)$", re.IGNORECASE),
+    "company_name": re.compile(r"^(?:company|employer|organization)\s*[:\-–]\s*(.+)$", re.IGNORECASE),
+    "location": re.compile(r"^(?:location|based in|office)\s*[:\-–]\s*(.+)$", re.IGNORECASE),
+    "salary_range": re.compile(r"^(?:salary|compensation|pay(?: range)?)\s*[:\-–]\s*(.+)$", re.IGNORECASE),
+}
+_COMPANY_RE = re.compile(r"\b(?:at|join|about)\s+([A-Z][\w&.\-]*(?:\s+[A-Z][\w&.\-]*){0,3})")
+_SALARY_RE = re.compile(r"[$€£]\s?\d[\d,.]*\s?[kK]?(?:\s*(?:-|–|to)\s*[$€£]?\s?\d[\d,.]*\s?[kK]?)?")
+_REMOTE_RE = re.compile(r"\b(?:fully remote|remote[- ]first|remote|hybrid|on[- ]site)\b", re.IGNORECASE)
+
+
+def extract_min_years(text: str) -> Optional[int]:
+    """Smallest years-of-experience requirement mentioned, if any."""
+    years = []
+    for match in _YEARS_RE.finditer(text):
+        value = match.group(1).lower()
+        number = _NUMBER_WORDS.get(value) or int(value)
+        if 0 < number <= 20:
+            years.append(number)
+    return min(years) if years else None
+
+
+def extract_education_level(text: str) -> str:
+    """Lowest degree that satisfies the posting ("Bachelor's" for "BS or MS")."""
+    found = [level for level, pattern in _EDUCATION_LEVELS if pattern.search(text)]
+    return found[-1] if found else ""
+
+
+# ───────────────────────────────────────────
+# ANALYZER
+# ───────────────────────────────────────────
+
+class JobAnalyzer:
+    """Rule-based JobAnalysis extraction."""
+
+    WEAK_MIN_CHARS = 300
+    WEAK_MIN_SKILLS = 3
+
+    def __init__(self, job_description: str):
+        self.raw_text = job_description or ""
+        self.text = strip_jd_boilerplate(self.raw_text)
+        self.sections = split_sections(self.text)
+
+    def analyze(self) -> JobAnalysis:
+        text = self.text
+        sections = self.sections
+
+        requirement_lines = sections.get("requirements", [])
+        preferred_lines = sections.get("preferred", [])
+        # Requirement-looking lines elsewhere that say "preferred"/"a plus"
+        for line in requirement_lines:
+            if _PREFERRED_LINE_RE.search(line):
+                preferred_lines = preferred_lines + [line]
+        requirement_text = "\n".join(l for l in requirement_lines if not _PREFERRED_LINE_RE.search(l))
+        preferred_text = "\n".join(preferred_lines)
+
+        all_skills = find_skills(text)
+        if requirement_text:
+            required = list(find_skills(requirement_text))
+        else:
+            # No requirements section: everything not marked preferred counts
+            non_preferred = "\n".join(
+                l for lines in sections.values() for l in lines if not _PREFERRED_LINE_RE.search(l)
+            )
+            required = list(find_skills(non_preferred))
+        preferred = [s for s in find_skills(preferred_text) if s not in required]
+        ranked = [name for name, _ in all_skills.most_common()]
+
+        tools = [s for s in ranked if skill_kind(s) == "tool"]
+        # ATS-critical: required skills plus anything mentioned repeatedly
+        ats_keywords = list(dict.fromkeys(required + [s for s in ranked if all_skills[s] >= 2]))
+
+        responsibilities = _bullets(sections.get("responsibilities", []))
+        qualifications = _bullets(requirement_lines)
+
+        labels = self._labels()
+        job_title = labels.get("job_title") or self._guess_title()
+        company_name = labels.get("company_name") or self._guess_company()
+        location = labels.get("location") or self._guess_location()
+        salary = labels.get("salary_range") or self._guess_salary()
+
+        weak_notes = []
+        if len(text) < self.WEAK_MIN_CHARS:
+            weak_notes.append("Description is very short")
+        if len(all_skills) < self.WEAK_MIN_SKILLS:
+            weak_notes.append("Few concrete skills or technologies mentioned")
+        if not requirement_lines:
+            weak_notes.append("No explicit requirements section")
+
+        soft = list(dict.fromkeys(_SOFT_TO_NAME[m.group(1).lower()] for m in _SOFT_RE.finditer(text)))
+
+        return JobAnalysis(
+            raw_text=self.raw_text,
+            required_skills=required,
+            preferred_skills=preferred,
+            tools_and_technologies=tools,
+            job_title=job_title,
+            company_name=company_name,
+            location=location,
+            salary_range=salary,
+            experience_years_min=extract_min_years(requirement_text or text),
+            education_level=extract_education_level(requirement_text or text),
+            keywords=ranked,
+            ats_keywords=ats_keywords,
+            soft_skills=soft,
+            job_summary=self._summary(),
+            responsibilities=responsibilities[:15],
+            qualifications=qualifications[:15],
+            is_weak_description=len(weak_notes) >= 2,
+            weak_description_notes=weak_notes,
+        )
+
+    def _labels(self) -> Dict[str, str]:
+        found = {}
+        for line in self.raw_text.splitlines()[:40]:
+            line = line.strip().strip("*")
+            for field, pattern in _LABEL_RE.items():
+                match = pattern.match(line)
+                if match and field not in found:
+                    found[field] = match.group(1).strip()[:120]
+        return found
+
+    def _summary(self) -> str:
+        prose = [
+            line for line in self.sections.get("intro", []) + self.sections.get("about", [])
+            if len(line.split()) >= 8 and not any(p.match(line) for p in _LABEL_RE.values())
+        ]
+        return " ".join(prose[:2])[:400]
+
+    def _guess_title(self) -> str:
+        for line in self.raw_text.splitlines()[:10]:
+            line = line.strip().strip("#*").strip()
+            if 3 <= len(line) <= 80 and _TITLE_WORDS.search(line) and not line.endswith("."):
+                return line
+        return ""
+
+    def _guess_company(self) -> str:
+        for line in self.sections.get("about", [])[:1] + self.sections.get("intro", [])[:5]:
+            match = _COMPANY_RE.search(line)
+            if match and not _TITLE_WORDS.search(match.group(1)):
+                return match.group(1).strip(" .")
+        return ""
+
+    def _guess_location(self) -> str:
+        match = _REMOTE_RE.search(self.raw_text[:2000])
+        return match.group(0).title() if match else ""
+
+    def _guess_salary(self) -> str:
+        match = _SALARY_RE.search(self.raw_text)
+        return match.group(0).strip() if match else ""
+
+
+def analyze_job_locally(job_description: str) -> JobAnalysis:
+    """Convenience wrapper: JobAnalyzer(job_description).analyze()."""
+    return JobAnalyzer(job_description).analyze()
+
+
+# ───────────────────────────────────────────
+# LLM VERIFICATION & MATCHING
+# ───────────────────────────────────────────
+
+def _mentioned(skill: str, text_lower: str, jd_skills: Counter) -> bool:
+    """
+    Whether the JD supports a skill the LLM listed. A skill is canonicalised
+    through the taxonomy first ("REST APIs" -> REST, "ReactJS" -> React) and
+    counts as mentioned if any alias of it occurs. Skills outside the
+    taxonomy cannot be checked and are kept.
+    """
+    if skill.lower() in text_lower:
+        return True
+    canonical = set(find_skills(skill))
+    if skill in SKILL_TAXONOMY:
+        canonical.add(skill)
+    if not canonical:
+        return True
+    return any(name in jd_skills for name in canonical)
+
+
+def verify_with_local(llm: JobAnalysis, local: JobAnalysis) -> Tuple[JobAnalysis, Dict[str, List[str]]]:
+    """
+    Cross-check an LLM JobAnalysis against the local one. Taxonomy skills
+    the LLM lists that never occur in the JD (under any alias) are dropped;
+    locally found required skills and tools it missed are added; missing
+    years / education are filled. Returns (merged analysis, {"dropped":
+    [...], "added": [...]}).
+    """
+    raw_text = llm.raw_text or local.raw_text or ""
+    text_lower = raw_text.lower()
+    jd_skills = find_skills(raw_text)
+    changes: Dict[str, List[str]] = {"dropped": [], "added": []}
+    data = llm.model_dump()
+
+    for field in ("required_skills", "preferred_skills", "tools_and_technologies", "ats_keywords"):
+        kept = []
+        for skill in data[field]:
+            if _mentioned(skill, text_lower, jd_skills):
+                kept.append(skill)
+            elif skill not in changes["dropped"]:
+                changes["dropped"].append(skill)
+        data[field] = kept
+
+    for field in ("required_skills", "tools_and_technologies", "keywords"):
+        present = {s.lower() for s in data[field]}
+        for skill in getattr(local, field):
+            if skill.lower() not in present:
+                data[field].append(skill)
+                if field != "keywords" and skill not in changes["added"]:
+                    changes["added"].append(skill)
+
+    if data.get("experience_years_min") is None:
+        data["experience_years_min"] = local.experience_years_min
+    if not data.get("education_level"):
+        data["education_level"] = local.education_level
+    return JobAnalysis(**data), changes
+
+
+def keyword_match_score(job: JobAnalysis, resume_text: str) -> int:
+    """
+    0-100 match of a resume against a JobAnalysis without an LLM:
+    required skills weigh 3, tools 2, preferred 1.
+    """
+    resume_skills = set(find_skills(resume_text))
+    weights: Dict[str, int] = {}
+    for skill in job.preferred_skills:
+        weights[skill] = 1
+    for skill in job.tools_and_technologies:
+        weights[skill] = max(weights.get(skill, 0), 2)
+    for skill in job.required_skills:
+        weights[skill] = 3
+    if not weights:
+        return 0
+    matched = sum(w for skill, w in weights.items() if skill in resume_skills)
+    return round(100 * matched / sum(weights.values()))
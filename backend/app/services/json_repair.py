@@ -0,0 +1,455 @@
+"""
+JSON Repair - Local fixes for malformed LLM JSON instead of another round-trip
+
+repair_json() rewrites almost-JSON into JSON in one pass:
+- markdown fences and prose before / after the root value
+- trailing commas, missing commas between values
+- unquoted keys, single-quoted strings, raw newlines inside strings
+- Python literals (True / False / None), // and /* */ comments
+- truncated output: open strings are closed, a dangling key or partial
+  literal is dropped and open arrays / objects are closed
+
+fill_to_schema() then validates the parsed data against a Pydantic model and
+patches what validation rejects: missing required fields and nulls get the
+field type's empty value (never numbers, which would invent scores),
+scalars are wrapped into one-item lists (and lists joined into strings),
+and list items that still cannot be validated are dropped. Both return the
+list of fixes applied so callers can count them.
+
+Only output that is still invalid after both passes should cost a retry.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+
+_LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+}
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?$")
+_BARE_WORD_RE = re.compile(r"[A-Za-z_$][\w$-]*")
+_TOKEN_RE = re.compile(r"-?[\w.+-]+")
+_CLOSERS = {"o": "}", "a": "]"}
+_JSON_ESCAPES = frozenset('"\\/bfnrtu')
+_WHITESPACE = " \t\r\n"
+_MAX_SCHEMA_PASSES = 4
+
+
+class JSONRepairError(ValueError):
+    """The text could not be turned into valid JSON."""
+
+
+# ───────────────────────────────────────────
+# SYNTAX REPAIR
+# ───────────────────────────────────────────
+
+def strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+class _Repairer:
+    """Single left-to-right pass that emits repaired JSON into self.out."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.out: List[str] = []
+        self.stack: List[str] = []
+        self.expect = "value"
+        self.fixes: List[str] = []
+        # Rollback point for truncated input: output length / stack after the
+        # last complete value or opening bracket
+        self.safe_len = 0
+        self.safe_stack: Tuple[str, ...] = ()
+
+    def fix(self, name: str):
+        if name not in self.fixes:
+            self.fixes.append(name)
+
+    # --- output helpers ----------------------------------------------
+
+    def _mark_safe(self):
+        self.safe_len = len(self.out)
+        self.safe_stack = tuple(self.stack)
+
+    def _drop_trailing_comma(self) -> bool:
+        i = len(self.out) - 1
+        while i >= 0 and self.out[i] in _WHITESPACE:
+            i -= 1
+        if i >= 0 and self.out[i] == ",":
+            del self.out[i]
+            return True
+        return False
+
+    def _value_done(self):
+        self.expect = "comma_or_end" if self.stack else "done"
+        self._mark_safe()
+
+    def _open(self, ch: str):
+        self.out.append(ch)
+        self.stack.append("o" if ch == "{" else "a")
+        self.expect = "key" if ch == "{" else "value"
+        self._mark_safe()
+
+    def _close(self, ch: str):
+        if not self.stack or _CLOSERS[self.stack[-1]] != ch:
+            raise JSONRepairError(f"mismatched {ch!r}")
+        if self.expect == "colon" or (self.expect == "value" and self.stack[-1] == "o"):
+            raise JSONRepairError(f"object key without a value before {ch!r}")
+        if self._drop_trailing_comma():
+            self.fix("trailing_comma")
+        self.stack.pop()
+        self.out.append(ch)
+        self._value_done()
+
+    # --- scanners ----------------------------------------------------
+
+    def _string(self, i: int) -> Tuple[int, bool]:
+        """Copy the string starting at text[i]; returns (next index, closed)."""
+        text = self.text
+        quote = text[i]
+        if quote == "'":
+            self.fix("single_quotes")
+        self.out.append('"')
+        i += 1
+        while i < len(text):
+            ch = text[i]
+            if ch == "\\" and i + 1 < len(text):
+                nxt = text[i + 1]
+                if nxt == "'":
+                    self.out.append("'")
+                elif nxt in _JSON_ESCAPES:
+                    self.out.append(ch + nxt)
+                else:
+                    self.fix("invalid_escape")
+                    self.out.append("\\\\" + nxt)
+                i += 2
+                continue
+            if ch == "\\":
+                i += 1  # dangling escape at a truncation point
+                continue
+            if ch == quote:
+                self.out.append('"')
+                return i + 1, True
+            if ch == '"':
+                self.out.append('\\"')
+            elif ch == "\n":
+                self.fix("raw_newline")
+                self.out.append("\\n")
+            elif ch in "\r\t":
+                self.out.append("\\r" if ch == "\r" else "\\t")
+            else:
+                self.out.append(ch)
+            i += 1
+        return i, False
+
+    def _skip_comment(self, i: int) -> Optional[int]:
+        text = self.text
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            self.fix("comment")
+            return len(text) if end < 0 else end + 1
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            self.fix("comment")
+            return len(text) if end < 0 else end + 2
+        return None
+
+    def _bare_value(self, i: int) -> int:
+        """A literal, number, or unquoted word in value position."""
+        text = self.text
+        token = _TOKEN_RE.match(text, i)
+        raw = token.group() if token else ""
+        rest = text[token.end():].lstrip(" \t") if token else ""
+        # "5 years" is prose, not the number 5 followed by a missing comma
+        if (raw in _LITERALS or _NUMBER_RE.match(raw)) and not rest[:1].isalnum():
+            if token.end() >= len(text):
+                # May be cut off mid-token (1 of 15, tru): let _finish decide
+                if raw in ("true", "false", "null") or _NUMBER_RE.match(raw):
+                    self.out.append(raw)
+                    self._value_done()
+                return token.end()
+            if _LITERALS.get(raw, raw) != raw:
+                self.fix("python_literal")
+            self.out.append(_LITERALS.get(raw, raw))
+            self._value_done()
+            return token.end()
+
+        j = i
+        while j < len(text) and text[j] not in ",]}\n" and not text.startswith("//", j):
+            j += 1
+        if j >= len(text):
+            return j  # truncated unquoted word: dropped by _finish
+        self.fix("unquoted_value")
+        self.out.append(json.dumps(text[i:j].rstrip()))
+        self._value_done()
+        return j
+
+    # --- main loop ---------------------------------------------------
+
+    def run(self) -> str:
+        text = self.text
+        start = min((p for p in (text.find("{"), text.find("[")) if p >= 0), default=-1)
+        if start < 0:
+            raise JSONRepairError("no JSON object or array found")
+        if text[:start].strip():
+            self.fix("preamble")
+
+        i = start
+        truncated_in = None
+        while i < len(text) and self.expect != "done":
+            ch = text[i]
+            if ch in _WHITESPACE:
+                self.out.append(ch)
+                i += 1
+                continue
+            skip = self._skip_comment(i)
+            if skip is not None:
+                i = skip
+                continue
+
+            if self.expect == "comma_or_end":
+                if ch == ",":
+                    self.out.append(ch)
+                    self.expect = "key" if self.stack[-1] == "o" else "value"
+                    i += 1
+                elif ch in "]}":
+                    self._close(ch)
+                    i += 1
+                else:
+                    # Two values back to back: the model forgot a comma
+                    self.fix("missing_comma")
+                    self.out.append(",")
+                    self.expect = "key" if self.stack[-1] == "o" else "value"
+                continue
+
+            if self.expect == "key":
+                if ch in "\"'":
+                    i, closed = self._string(i)
+                    if not closed:
+                        truncated_in = "key"
+                        break
+                    self.expect = "colon"
+                elif ch == "}":
+                    self._close(ch)
+                    i += 1
+                elif ch == ",":
+                    self.fix("trailing_comma")
+                    i += 1
+                else:
+                    match = _BARE_WORD_RE.match(text, i)
+                    if not match:
+                        raise JSONRepairError(f"unexpected {ch!r} where a key was expected")
+                    self.fix("unquoted_key")
+                    self.out.append(json.dumps(match.group()))
+                    i = match.end()
+                    self.expect = "colon"
+                continue
+
+            if self.expect == "colon":
+                if ch != ":":
+                    raise JSONRepairError(f"unexpected {ch!r} where ':' was expected")
+                self.out.append(ch)
+                self.expect = "value"
+                i += 1
+                continue
+
+            # expect == "value"
+            if ch in "{[":
+                self._open(ch)
+                i += 1
+            elif ch in "]}":
+                self._close(ch)
+                i += 1
+            elif ch in "\"'":
+                i, closed = self._string(i)
+                if not closed:
+                    truncated_in = "value"
+                    break
+                self._value_done()
+            elif ch == ",":
+                raise JSONRepairError("missing value before ','")
+            else:
+                i = self._bare_value(i)
+
+        if self.expect == "done":
+            if text[i:].strip().strip("`").strip():
+                self.fix("trailing_text")
+            return "".join(self.out)
+        return self._finish(truncated_in)
+
+    def _finish(self, truncated_in: Optional[str]) -> str:
+        """Close a truncated document."""
+        self.fix("truncated")
+        if truncated_in == "value":
+            # Keep the partial string (a cut-off summary beats none)
+            self.out.append('"')
+            stack = list(self.stack)
+        else:
+            # Drop the dangling key / partial literal / trailing comma
+            del self.out[self.safe_len:]
+            stack = list(self.safe_stack)
+        self._drop_trailing_comma()
+        self.out.extend(_CLOSERS[kind] for kind in reversed(stack))
+        return "".join(self.out)
+
+
+def repair_json(text: str) -> Tuple[str, List[str]]:
+    """
+    Return (valid JSON text, fixes applied). Valid input is returned as is
+    with no fixes; raises JSONRepairError when the text cannot be repaired.
+    """
+    if not text or not text.strip():
+        raise JSONRepairError("empty response")
+    cleaned = strip_fences(text)
+    try:
+        json.loads(cleaned)
+        return cleaned, []
+    except json.JSONDecodeError:
+        pass
+
+    repairer = _Repairer(cleaned)
+    repaired = repairer.run()
+    try:
+        json.loads(repaired)
+    except json.JSONDecodeError as e:
+        raise JSONRepairError(f"still invalid after repair: {e}") from e
+    return repaired, repairer.fixes
+
+
+# ───────────────────────────────────────────
+# SCHEMA REPAIR
+# ───────────────────────────────────────────
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _annotation_at(model: Type[BaseModel], loc: Tuple) -> Any:
+    """Type annotation at a validation error location, or None if unknown."""
+    annotation: Any = model
+    for part in loc:
+        annotation = _unwrap_optional(annotation)
+        if isinstance(part, int):
+            args = get_args(annotation)
+            annotation = args[0] if args else Any
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            field = annotation.model_fields.get(part)
+            if field is None:
+                return None
+            annotation = field.annotation
+        else:
+            return None
+    return annotation
+
+
+def _empty_value(annotation) -> Any:
+    """Placeholder for a missing / null field. Numbers and booleans get none:
+    an invented score would be worse than a retry."""
+    annotation = _unwrap_optional(annotation)
+    origin = get_origin(annotation) or annotation
+    if origin in (list, List, tuple, set):
+        return []
+    if origin in (dict, Dict):
+        return {}
+    if isinstance(origin, type) and issubclass(origin, BaseModel):
+        return {}
+    return "" if origin is str else None
+
+
+def _container(data: Any, loc: Tuple) -> Any:
+    for part in loc:
+        data = data[part]
+    return data
+
+
+def _patch(data: Any, model: Type[BaseModel], error: dict, fixes: List[str], drops: List[Tuple]) -> bool:
+    """Apply one local fix for a validation error. Returns False if none applies."""
+    loc = tuple(error["loc"])
+    if not loc:
+        return False
+    try:
+        parent = _container(data, loc[:-1])
+    except (KeyError, IndexError, TypeError):
+        return False
+    key = loc[-1]
+    annotation = _annotation_at(model, loc)
+    value = error.get("input")
+    kind = error["type"]
+
+    if kind == "missing" or value is None:
+        empty = _empty_value(annotation)
+        if empty is not None and isinstance(parent, dict):
+            parent[key] = empty
+            fixes.append("filled_missing" if kind == "missing" else "filled_null")
+            return True
+    elif kind == "list_type" and isinstance(value, (str, int, float, dict)):
+        parent[key] = [value]
+        fixes.append("wrapped_list")
+        return True
+    elif kind == "string_type" and isinstance(value, list) and all(isinstance(v, str) for v in value):
+        parent[key] = ", ".join(value)
+        fixes.append("joined_list")
+        return True
+    elif kind == "string_type" and isinstance(value, (int, float)):
+        parent[key] = str(value)
+        fixes.append("stringified")
+        return True
+
+    # Last resort: drop the innermost list item that contains the error
+    for depth in range(len(loc) - 1, -1, -1):
+        if isinstance(loc[depth], int):
+            drops.append(loc[: depth + 1])
+            fixes.append("dropped_item")
+            return True
+    return False
+
+
+def fill_to_schema(data: Any, model: Type[BaseModel]) -> Tuple[BaseModel, List[str]]:
+    """
+    Validate `data` against `model`, patching what validation rejects.
+    Returns (instance, fixes); raises ValidationError when it cannot be fixed.
+    """
+    fixes: List[str] = []
+    for _ in range(_MAX_SCHEMA_PASSES):
+        try:
+            return model.model_validate(data), fixes
+        except ValidationError as e:
+            if not isinstance(data, dict):
+                raise
+            drops: List[Tuple] = []
+            patched = [_patch(data, model, error, fixes, drops) for error in e.errors()]
+            if not any(patched):
+                raise
+            # Delete from the end so earlier indices stay valid
+            for loc in sorted(set(drops), key=lambda l: (len(l), l[-1]), reverse=True):
+                try:
+                    del _container(data, loc[:-1])[loc[-1]]
+                except (KeyError, IndexError, TypeError):
+                    pass
+            last_error = e
+    raise last_error
+
+
+def parse_model(text: str, model: Type[BaseModel], extra: Optional[Dict[str, Any]] = None) -> Tuple[BaseModel, List[str]]:
+    """repair_json + fill_to_schema. `extra` is merged into the data before validation."""
+    repaired, fixes = repair_json(text)
+    data = json.loads(repaired)
+    if extra and isinstance(data, dict):
+        data.update(extra)
+    instance, schema_fixes = fill_to_schema(data, model)
+    return instance, fixes + schema_fixes
@@ -0,0 +1,261 @@
+"""
+JSON Stream - Incremental JSON validation for streamed LLM completions
+
+IncrementalJSONParser is fed completion deltas as they arrive. It tracks
+the JSON structure character by character so that:
+- clearly invalid output (no JSON after a prose preamble, mismatched
+  brackets, garbage between values) raises IncrementalJSONError at once,
+  letting the caller abort the stream instead of paying for the rest;
+- each completed top-level field ("basics", "work", ...) is reported as
+  soon as its value closes, and partial() returns the object parsed so far.
+
+StreamSink carries those partial results (and pipeline progress) from the
+orchestrator to a streaming HTTP response.
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+
+MAX_PREAMBLE_CHARS = 500
+
+_LITERAL_CHARS = frozenset("0123456789+-.eEtruefalsn")
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?$")
+_PARTIAL_ESCAPE_RE = re.compile(r"\\(?:u[0-9a-fA-F]{0,3})?$")
+_CLOSERS = {"o": "}", "a": "]"}
+
+
+class IncrementalJSONError(ValueError):
+    """The stream can no longer become valid JSON."""
+
+
+class IncrementalJSONParser:
+    """Streaming structural validator for one JSON object or array."""
+
+    def __init__(self):
+        self.text = ""
+        self.root_start: Optional[int] = None
+        self.root_end: Optional[int] = None
+        self._pos = 0
+        self._stack: List[str] = []
+        self._expect = "value"
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._string_start = 0
+        self._literal_start: Optional[int] = None
+        self._safe_end: Optional[int] = None
+        self._safe_stack: Tuple[str, ...] = ()
+        self._pending_key: Optional[str] = None
+        self._completed: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        return self.root_end is not None
+
+    @property
+    def trailing_chars(self) -> int:
+        """Non-whitespace characters received after the root value closed."""
+        if self.root_end is None:
+            return 0
+        return len(self.text[self.root_end:].strip())
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume a delta. Returns top-level keys whose values completed in it."""
+        self.text += chunk
+        self._completed = []
+        text = self.text
+        while self._pos < len(text) and self.root_end is None:
+            self._step(text[self._pos], self._pos)
+            self._pos += 1
+        return self._completed
+
+    # --- results -----------------------------------------------------
+
+    def result(self) -> Any:
+        if not self.done:
+            raise IncrementalJSONError("JSON value is not complete")
+        return json.loads(self.text[self.root_start:self.root_end])
+
+    def json_text(self) -> str:
+        """The root JSON value once complete, else everything received."""
+        if self.done:
+            return self.text[self.root_start:self.root_end]
+        return self.text
+
+    def partial(self) -> Any:
+        """Best-effort parse of what has arrived, closing open strings and containers."""
+        if self.root_start is None:
+            return None
+        if self.done:
+            return self.result()
+        if self._in_string and not self._string_is_key:
+            body = _PARTIAL_ESCAPE_RE.sub("", self.text[self.root_start:self._pos])
+            candidate = body + '"' + "".join(_CLOSERS[c] for c in reversed(self._stack))
+        elif self._safe_end is not None:
+            candidate = self.text[self.root_start:self._safe_end] + "".join(
+                _CLOSERS[c] for c in reversed(self._safe_stack)
+            )
+        else:
+            return None
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            return None
+
+    # --- state machine -----------------------------------------------
+
+    def _fail(self, message: str, index: int):
+        context = self.text[max(0, index - 40):index + 1]
+        raise IncrementalJSONError(f"{message} at char {index}: ...{context!r}")
+
+    def _open(self, kind: str, index: int):
+        self._stack.append(kind)
+        self._expect = "key_or_end" if kind == "o" else "value_or_end"
+        self._safe_end = index + 1
+        self._safe_stack = tuple(self._stack)
+
+    def _close(self, ch: str, index: int):
+        if not self._stack or _CLOSERS[self._stack[-1]] != ch:
+            self._fail(f"unexpected {ch!r}", index)
+        self._stack.pop()
+        self._value_done(index + 1)
+
+    def _value_done(self, end: int):
+        self._safe_end = end
+        self._safe_stack = tuple(self._stack)
+        if not self._stack:
+            self.root_end = end
+            self._expect = "done"
+            return
+        self._expect = "comma_or_end"
+        if self._stack == ["o"] and self._pending_key is not None:
+            self._completed.append(self._pending_key)
+            self._pending_key = None
+
+    def _step(self, ch: str, i: int):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._string_is_key:
+                    if self._stack == ["o"]:
+                        self._pending_key = json.loads(self.text[self._string_start:i + 1])
+                    self._expect = "colon"
+                else:
+                    self._value_done(i + 1)
+            return
+
+        if self._literal_start is not None:
+            if ch in _LITERAL_CHARS:
+                return
+            literal = self.text[self._literal_start:i]
+            self._literal_start = None
+            if literal not in ("true", "false", "null") and not _NUMBER_RE.match(literal):
+                self._fail(f"invalid literal {literal!r}", i)
+            self._value_done(i)
+
+        if ch in " \t\r\n":
+            return
+
+        if self.root_start is None:
+            if ch in "{[":
+                self.root_start = i
+                self._open("o" if ch == "{" else "a", i)
+            elif i >= MAX_PREAMBLE_CHARS:
+                self._fail("no JSON value", i)
+            return
+
+        expect = self._expect
+        if expect in ("value", "value_or_end"):
+            if ch == "{":
+                self._open("o", i)
+            elif ch == "[":
+                self._open("a", i)
+            elif ch == '"':
+                self._in_string, self._string_is_key, self._string_start = True, False, i
+            elif ch in "-0123456789tfn":
+                self._literal_start = i
+            elif ch == "]" and self._stack[-1] == "a":
+                # Empty array, or a trailing comma (repairable downstream, so not fatal)
+                self._close(ch, i)
+            else:
+                self._fail(f"unexpected {ch!r}, expected a value", i)
+        elif expect in ("key", "key_or_end"):
+            if ch == '"':
+                self._in_string, self._string_is_key, self._string_start = True, True, i
+            elif ch == "}":
+                self._close(ch, i)
+            else:
+                self._fail(f"unexpected {ch!r}, expected a key", i)
+        elif expect == "colon":
+            if ch != ":":
+                self._fail(f"unexpected {ch!r}, expected ':'", i)
+            self._expect = "value"
+        elif expect == "comma_or_end":
+            if ch == ",":
+                self._expect = "key" if self._stack[-1] == "o" else "value"
+            elif ch in "]}":
+                self._close(ch, i)
+            else:
+                self._fail(f"unexpected {ch!r}, expected ',' or a closing bracket", i)
+
+
+# ───────────────────────────────────────────
+# PARTIAL RESULT SINK
+# ───────────────────────────────────────────
+
+class StreamSink:
+    """
+    Queue of (event, data) pairs for one streaming request.
+
+    Only one provider attempt may publish partial fields at a time (hedged
+    or retried attempts race); the first to publish claims the sink, and if
+    it is abandoned a "reset" event tells the client to discard its fields.
+    Fields of the other attempts are held back meanwhile, so after a reset
+    the next attempt takes over with everything it has parsed so far and
+    the client never sees two attempts' fields mixed.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._owner: Optional[object] = None
+        self._held: Dict[object, List[Tuple[str, Any]]] = {}
+
+    def put(self, event: str, data: Any) -> None:
+        self._queue.put_nowait((event, data))
+
+    def close(self) -> None:
+        self._queue.put_nowait(None)
+
+    def publish_partial(self, owner: object, field: str, value: Any) -> None:
+        if self._owner is None:
+            self._owner = owner
+        if self._owner is owner:
+            self.put("partial", {"field": field, "value": value})
+        else:
+            self._held.setdefault(owner, []).append((field, value))
+
+    def release(self, owner: object) -> None:
+        self._held.pop(owner, None)
+        if self._owner is not owner:
+            return
+        self._owner = None
+        self.put("reset", {})
+        if self._held:
+            # Hand over to the earliest waiting attempt
+            self._owner = next(iter(self._held))
+            for field, value in self._held.pop(self._owner):
+                self.put("partial", {"field": field, "value": value})
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            yield item
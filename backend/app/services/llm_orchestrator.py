@@ -7,13 +7,19 @@ Step 2: Analyze (cheap) - Extract job keywords
 Step 3: Rewrite (premium) - Smart enhancement with best model
 """
 
+import asyncio
+import hashlib
 import json
+import logging
 import os
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, List, Sequence, Tuple, Type
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from enum import Enum
 
-import httpx
+from pydantic import BaseModel
 
 from app.services.resume_schema import (
     ResumeSchema,
@@ -21,6 +27,44 @@ from app.services.resume_schema import (
     JobAnalysis,
     MatchScoreResult,
 )
+from app.services.metrics import (
+    JOB_ANALYSIS_CORRECTIONS,
+    JOB_ANALYSIS_PATH,
+    LLM_BANNED_WORDS,
+    LLM_OUTPUT_REPAIRS,
+    LLM_STREAM_ABORTS,
+    RESUME_PARSE_PATH,
+    RETAILOR_SECTIONS,
+    STEP4_MODE_USED,
+    observe_llm_call,
+)
+from app.services import llm_replay
+from app.services.job_analyzer import analyze_job_locally, verify_with_local
+from app.services.json_repair import JSONRepairError, parse_model, repair_json, strip_fences
+from app.services.json_stream import IncrementalJSONError, IncrementalJSONParser, StreamSink
+from app.services.llm_router import Route, router as llm_router, routes_for
+from app.services.llm_scheduler import CONGESTION_STATUSES, LLMOverloaded, Priority, scheduler
+from app.services.prompt_engine import OutputValidator, banned_word_matcher
+from app.services.resume_parser import ResumeParser
+from app.services.section_tailor import (
+    SECTION_KINDS,
+    SECTION_META_KEY,
+    merge_sections,
+    plan_retailoring,
+    section_fingerprints,
+    section_kind,
+    section_source_model,
+)
+from app.services.prompt_compactor import (
+    Deduper,
+    PromptSection,
+    compact_prompt,
+    estimate_tokens,
+    strip_jd_boilerplate,
+)
+from app.services.tracing import span, traced
+
+logger = logging.getLogger(__name__)
 
 
 class ModelTier(Enum):
@@ -41,6 +85,46 @@ class ModelConfig:
     temperature: float = 0.3
 
 
+@dataclass
+class LLMCallUsage:
+    """Accounting record for one _call_llm invocation (all attempts included)"""
+
+    step: str
+    model: str
+    tier: str
+    provider: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: Optional[float] = None
+    latency_ms: float = 0.0
+    queue_ms: float = 0.0
+    retries: int = 0
+    fallbacks: int = 0
+    hedged: bool = False
+    tokens_saved: int = 0
+    ttft_ms: float = 0.0
+    cache_hit: bool = False
+    success: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class FanOutResult:
+    """One job of LLMOrchestrator.fan_out_pipeline, in completion order"""
+
+    index: int
+    job_description: str
+    usage: List[LLMCallUsage] = field(default_factory=list)
+    result: Optional[Tuple[TailoredResumeSchema, JobAnalysis, MatchScoreResult]] = None
+    error: Optional[Exception] = None
+
+    def unwrap(self) -> Tuple[TailoredResumeSchema, JobAnalysis, MatchScoreResult]:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
 LLM_MODELS = {
     ModelTier.CHEAP: ModelConfig(
         tier=ModelTier.CHEAP,
@@ -62,6 +146,50 @@ LLM_MODELS = {
     ),
 }
 
+# Prompt caching: every step keeps its system prompt static and puts all
+# per-request content in the user message, so the system prefix is reusable.
+# OpenAI / DeepSeek / Gemini-direct cache such prefixes automatically;
+# Anthropic and Gemini models behind OpenRouter need an explicit breakpoint.
+PROMPT_CACHE_ENABLED = os.getenv("LLM_PROMPT_CACHE", "true").lower() == "true"
+EXPLICIT_CACHE_MODEL_PREFIXES = ("anthropic/", "google/gemini")
+
+# hybrid: rule-based parse first, LLM only for low-confidence resumes or gaps
+# llm: always extract with the LLM; local: never
+STEP1_MODE = os.getenv("LLM_STEP1_MODE", "hybrid").lower()
+
+# verify: LLM analysis cross-checked against the local JobAnalyzer
+# llm: LLM analysis as-is; local: JobAnalyzer only, no LLM call
+STEP2_MODE = os.getenv("LLM_STEP2_MODE", "verify").lower()
+
+# single: one premium call rewrites the whole resume
+# sections: summary, skills, each work entry and projects tailored concurrently
+# auto: sections once the resume would crowd the single call's output budget
+STEP4_MODE = os.getenv("LLM_STEP4_MODE", "auto").lower()
+STEP4_SINGLE_OUTPUT_SHARE = 0.6
+
+# Structured resumes by resume-text hash, shared across requests and fan-out jobs
+EXTRACTION_CACHE_SIZE = int(os.getenv("LLM_EXTRACTION_CACHE_SIZE", "128"))
+# Jobs of one fan_out_pipeline call that run steps 2-4 at the same time
+FANOUT_CONCURRENCY = int(os.getenv("LLM_FANOUT_CONCURRENCY", "4"))
+
+# Streamed completions are validated as they arrive (see json_stream)
+STREAMING_ENABLED = os.getenv("LLM_STREAMING", "true").lower() == "true"
+STREAM_MAX_TRAILING_CHARS = 200
+
+# JSON-schema response_format for models that enforce it; other OpenRouter
+# models get json_object mode and Gemini gets responseMimeType=application/json
+STRUCTURED_OUTPUT_ENABLED = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true"
+JSON_SCHEMA_MODEL_PREFIXES = ("openai/", "google/gemini", "anthropic/", "mistralai/")
+
+
+_extraction_cache: "OrderedDict[str, ResumeSchema]" = OrderedDict()
+_extraction_inflight: Dict[str, "asyncio.Future[ResumeSchema]"] = {}
+
+
+@lru_cache(maxsize=None)
+def _json_schema(output_model: Type[BaseModel]) -> dict:
+    return output_model.model_json_schema()
+
 
 class LLMOrchestrator:
     """
@@ -69,10 +197,15 @@ class LLMOrchestrator:
     Uses multi-step approach with strategic model selection.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, priority: Priority = Priority.INTERACTIVE):
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
+        # Scheduler priority for every provider call (batch work yields to interactive)
+        self.priority = priority
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
         self._mock_profile: Optional[dict] = None
+        self.usage: List[LLMCallUsage] = []
+        # Set by streaming routes to receive step progress and partial step-4 fields
+        self.stream_sink: Optional[StreamSink] = None
 
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY is required")
@@ -163,17 +296,87 @@ class LLMOrchestrator:
         messages: List[Dict[str, str]],
         model_config: ModelConfig,
         retry_count: int = 5,
+        step: str = "unknown",
+        tokens_saved: int = 0,
+        partials: bool = False,
+        output_model: Optional[Type[BaseModel]] = None,
     ) -> str:
-        """Make API call to LLM (OpenRouter or Gemini) with retry logic"""
-        # Development mock mode — returns plausible JSON without API call
-        if os.getenv("LLM_MOCK_MODE") == "true":
-            return self._mock_response(messages)
-        
-        gemini_key = os.getenv("GEMINI_API_KEY")
-        
-        if gemini_key and (model_config.model_id.startswith("gemini") or model_config.model_id.startswith("google/")):
-            return await self._call_gemini(messages, model_config, gemini_key, retry_count)
-        return await self._call_openrouter(messages, model_config, retry_count)
+        """Make API call to LLM (OpenRouter or Gemini) with retry logic.
+
+        Every call appends an LLMCallUsage record to self.usage so routes can
+        persist token usage, latency and retries per pipeline step.
+        `tokens_saved` is the prompt compaction saving for this call.
+        With `partials`, completed top-level JSON fields go to stream_sink.
+        `output_model` is sent to the provider as the response schema.
+        """
+        usage = LLMCallUsage(
+            step=step,
+            model=model_config.model_id,
+            tier=model_config.tier.value,
+            tokens_saved=tokens_saved,
+        )
+        self.usage.append(usage)
+        started = time.perf_counter()
+        error_type = None
+
+        with span("llm.call", step=step, model=model_config.model_id, tier=usage.tier) as current:
+            try:
+                replay_mode = llm_replay.replay_mode()
+                mock_mode = os.getenv("LLM_MOCK_MODE") == "true"
+
+                # Offline replay of recorded provider responses (see llm_replay)
+                if replay_mode == "replay":
+                    usage.provider = "replay"
+                    try:
+                        content = await llm_replay.replay_response(messages, model_config, usage)
+                    except llm_replay.ReplayMiss:
+                        if os.getenv("LLM_REPLAY_MISS") != "mock":
+                            raise
+                        usage.provider = "mock"
+                        content = self._mock_response(messages)
+                # Development mock mode — returns plausible JSON without API call
+                elif mock_mode:
+                    usage.provider = "mock"
+                    content = self._mock_response(messages)
+                    # Simulated provider latency for benchmarks / load tests
+                    mock_latency_ms = float(os.getenv("LLM_MOCK_LATENCY_MS", "0"))
+                    if mock_latency_ms > 0:
+                        await asyncio.sleep(mock_latency_ms / 1000)
+                else:
+                    # Ordered provider fallbacks with hedging (see llm_router)
+                    content = await llm_router.call(
+                        routes_for(model_config.tier.value, model_config.model_id),
+                        lambda route, route_usage, retries: self._call_provider(
+                            route, messages, model_config, retries, route_usage,
+                            partials, output_model,
+                        ),
+                        usage,
+                        retry_count,
+                    )
+
+                    if replay_mode == "record":
+                        llm_replay.record_response(
+                            messages, model_config, usage, content,
+                            (time.perf_counter() - started) * 1000,
+                        )
+
+                if partials and usage.provider in ("mock", "replay"):
+                    self._publish_partials(content)
+                usage.success = True
+                return content
+            except Exception as e:
+                usage.error = str(e)[:500]
+                error_type = type(e).__name__
+                raise
+            finally:
+                usage.latency_ms = round((time.perf_counter() - started) * 1000, 1)
+                observe_llm_call(usage, error_type)
+                current.set_attribute("llm.provider", usage.provider)
+                current.set_attribute("llm.retries", usage.retries)
+                current.set_attribute("llm.fallbacks", usage.fallbacks)
+                current.set_attribute("llm.hedged", usage.hedged)
+                current.set_attribute("llm.prompt_tokens", usage.prompt_tokens)
+                current.set_attribute("llm.completion_tokens", usage.completion_tokens)
 
     @staticmethod
     def _parse_profile_from_text(text: str) -> dict:
@@ -286,6 +489,26 @@ class LLMOrchestrator:
         # Merge JD keywords with profile skills
         all_keywords = list(dict.fromkeys(skill_names + jd_keywords))
 
+        if "cover letter writer" in sys_msg.lower():
+            role = current_role or "engineer"
+            return (
+                f"Dear Hiring Manager,\n\nI am excited to apply for this role. As a {role} with "
+                f"{exp_years} years of experience in {', '.join(all_keywords[:4])}, I have delivered "
+                f"production systems that match what your team needs.\n\nI would welcome the chance "
+                f"to discuss how I can contribute.\n\nSincerely,\n{name}"
+            )
+
+        if "resume section:" in combined:
+            # Section-level step 4: echo the section back with JD keywords worked in
+            kind = user_msg.split("RESUME SECTION:", 1)[1].split()[0]
+            section = json.loads(user_msg.split("CURRENT SECTION:\n", 1)[1].split("\n", 1)[0])
+            if kind == "summary":
+                section["summary"] = f"{section.get('summary') or summary} Focused on {', '.join(jd_keywords[:4]) or 'delivery'}."
+            elif kind == "work":
+                section["highlights"] = [f"{h} ({', '.join(jd_keywords[:2])})" if jd_keywords else h
+                                         for h in section.get("highlights", [])]
+            return json.dumps(section)
+
         if "extract" in combined and "structure" in combined:
             return json.dumps({
                 "basics": {"name": name, "email": email, "phone": phone,
@@ -351,12 +574,36 @@ class LLMOrchestrator:
             "education": [{"institution": "University", "area": "Computer Science", "study_type": "BSc"}]
         })
 
+    async def _call_provider(
+        self,
+        route: Route,
+        messages: List[Dict[str, str]],
+        model_config: ModelConfig,
+        retry_count: int,
+        usage: LLMCallUsage,
+        partials: bool = False,
+        output_model: Optional[Type[BaseModel]] = None,
+    ) -> str:
+        """Call one router route (provider + model) with this tier's token and temperature settings"""
+        route_config = replace(model_config, model_id=route.model_id)
+        if route.provider == "gemini":
+            return await self._call_gemini(
+                messages, route_config, os.getenv("GEMINI_API_KEY"), retry_count, usage,
+                partials, output_model,
+            )
+        return await self._call_openrouter(
+            messages, route_config, retry_count, usage, partials, output_model
+        )
+
     async def _call_gemini(
         self,
         messages: List[Dict[str, str]],
         model_config: ModelConfig,
         api_key: str,
         retry_count: int = 3,
+        usage: Optional[LLMCallUsage] = None,
+        partials: bool = False,
+        output_model: Optional[Type[BaseModel]] = None,
     ) -> str:
         """Call Google Gemini API directly"""
         import httpx
@@ -380,37 +627,78 @@ class LLMOrchestrator:
         }
         if system_instruction:
             body["systemInstruction"] = system_instruction
+        if output_model and STRUCTURED_OUTPUT_ENABLED:
+            body["generationConfig"]["responseMimeType"] = "application/json"
         
         # Map model ID to Gemini model name
         model_id = model_config.model_id
         if model_id == "openrouter/free" or model_id == "qwen/qwen3-coder:free":
             model_id = "gemini-2.0-flash"
         
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_id}:generateContent?key={api_key}"
-        
+        method = "streamGenerateContent?alt=sse&" if STREAMING_ENABLED else "generateContent?"
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_id}:{method}key={api_key}"
+
+        def stream_delta(event: dict) -> str:
+            if usage and event.get("usageMetadata"):
+                self._record_gemini_usage(usage, event["usageMetadata"])
+            candidates = event.get("candidates") or []
+            parts = (candidates[0].get("content") or {}).get("parts") or [] if candidates else []
+            return "".join(part.get("text", "") for part in parts)
+
         for attempt in range(retry_count):
+            if usage:
+                usage.retries = attempt
             try:
-                async with httpx.AsyncClient(timeout=180.0) as client:
-                    response = await client.post(url, json=body)
-                    
+                with span("llm.attempt", provider="gemini", attempt=attempt) as attempt_span:
+                    # A 429 blocks the shared lane, so the next attempt queues
+                    # behind it instead of backing off on its own
+                    queued = time.perf_counter()
+                    async with scheduler.slot("gemini", model_id, self.priority) as lane:
+                        if usage:
+                            usage.queue_ms += round((time.perf_counter() - queued) * 1000, 1)
+                        sent = time.perf_counter()
+                        async with httpx.AsyncClient(timeout=180.0) as client:
+                            async with client.stream("POST", url, json=body) as response:
+                                lane.observe(response.status_code, response.headers, attempt)
+                                if response.status_code == 200 and STREAMING_ENABLED:
+                                    content = await self._read_stream(
+                                        response, stream_delta, usage, partials, sent,
+                                        json_output=output_model is not None,
+                                    )
+                                else:
+                                    await response.aread()
+                    attempt_span.set_attribute("http.status_code", response.status_code)
+
                     if response.status_code == 200:
-                        result = response.json()
-                        return result["candidates"][0]["content"]["parts"][0]["text"]
-                    
-                    elif response.status_code == 429:
-                        await self._wait_with_exponential_backoff(attempt)
+                        if not STREAMING_ENABLED:
+                            result = response.json()
+                            if usage:
+                                self._record_gemini_usage(usage, result.get("usageMetadata") or {})
+                            content = result["candidates"][0]["content"]["parts"][0]["text"]
+                            if partials:
+                                self._publish_partials(content)
+                        return content
+
+                    elif response.status_code in CONGESTION_STATUSES:
                         continue
-                    
+
                     else:
                         raise Exception(
                             f"Gemini API error: {response.status_code} - {response.text}"
                         )
-            
+
+            except LLMOverloaded:
+                raise
+            except IncrementalJSONError as e:
+                # Malformed output is not a transport problem: retry at once
+                LLM_STREAM_ABORTS.labels(usage.step if usage else "unknown", "gemini").inc()
+                if attempt == retry_count - 1:
+                    raise Exception(f"Failed after {retry_count} attempts: {str(e)}")
             except Exception as e:
                 if attempt == retry_count - 1:
                     raise Exception(f"Failed after {retry_count} attempts: {str(e)}")
                 await self._wait_with_exponential_backoff(attempt)
-        
+
         raise Exception("Max retries exceeded")
 
     async def _call_openrouter(
@@ -418,35 +706,73 @@ class LLMOrchestrator:
         messages: List[Dict[str, str]],
         model_config: ModelConfig,
         retry_count: int = 3,
+        usage: Optional[LLMCallUsage] = None,
+        partials: bool = False,
+        output_model: Optional[Type[BaseModel]] = None,
     ) -> str:
         """Make API call to OpenRouter with retry logic"""
         import httpx
 
+        payload = {
+            "model": model_config.model_id,
+            "messages": self._with_cache_markers(messages, model_config.model_id),
+            "max_tokens": model_config.max_tokens,
+            "temperature": model_config.temperature,
+            "usage": {"include": True},
+            "stream": STREAMING_ENABLED,
+        }
+        if output_model and STRUCTURED_OUTPUT_ENABLED:
+            payload["response_format"] = self._response_format(model_config.model_id, output_model)
+
+        def stream_delta(event: dict) -> Optional[str]:
+            if usage and event.get("usage"):
+                self._record_openrouter_usage(usage, event)
+            choices = event.get("choices") or []
+            return (choices[0].get("delta") or {}).get("content") if choices else None
+
         for attempt in range(retry_count):
+            if usage:
+                usage.retries = attempt
             try:
-                async with httpx.AsyncClient(timeout=180.0) as client:
-                    response = await client.post(
-                        self.base_url,
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json",
-                            "HTTP-Referer": "https://applymate.ai",
-                            "X-Title": "ApplyMate Resume Tailoring",
-                        },
-                        json={
-                            "model": model_config.model_id,
-                            "messages": messages,
-                            "max_tokens": model_config.max_tokens,
-                            "temperature": model_config.temperature,
-                        },
-                    )
+                with span("llm.attempt", provider="openrouter", attempt=attempt) as attempt_span:
+                    queued = time.perf_counter()
+                    async with scheduler.slot("openrouter", model_config.model_id, self.priority) as lane:
+                        if usage:
+                            usage.queue_ms += round((time.perf_counter() - queued) * 1000, 1)
+                        sent = time.perf_counter()
+                        async with httpx.AsyncClient(timeout=180.0) as client:
+                            async with client.stream(
+                                "POST",
+                                self.base_url,
+                                headers={
+                                    "Authorization": f"Bearer {self.api_key}",
+                                    "Content-Type": "application/json",
+                                    "HTTP-Referer": "https://applymate.ai",
+                                    "X-Title": "ApplyMate Resume Tailoring",
+                                },
+                                json=payload,
+                            ) as response:
+                                lane.observe(response.status_code, response.headers, attempt)
+                                if response.status_code == 200 and STREAMING_ENABLED:
+                                    content = await self._read_stream(
+                                        response, stream_delta, usage, partials, sent,
+                                        json_output=output_model is not None,
+                                    )
+                                else:
+                                    await response.aread()
+                    attempt_span.set_attribute("http.status_code", response.status_code)
 
                     if response.status_code == 200:
-                        result = response.json()
-                        return result["choices"][0]["message"]["content"]
-
-                    elif response.status_code == 429:
-                        await self._wait_with_exponential_backoff(attempt)
+                        if not STREAMING_ENABLED:
+                            result = response.json()
+                            if usage:
+                                self._record_openrouter_usage(usage, result)
+                            content = result["choices"][0]["message"]["content"]
+                            if partials:
+                                self._publish_partials(content)
+                        return content
+
+                    elif response.status_code in CONGESTION_STATUSES:
                         continue
 
                     else:
@@ -454,6 +780,13 @@ class LLMOrchestrator:
                             f"LLM API error: {response.status_code} - {response.text}"
                         )
 
+            except LLMOverloaded:
+                raise
+            except IncrementalJSONError as e:
+                # Malformed output is not a transport problem: retry at once
+                LLM_STREAM_ABORTS.labels(usage.step if usage else "unknown", "openrouter").inc()
+                if attempt == retry_count - 1:
+                    raise Exception(f"Failed after {retry_count} attempts: {str(e)}")
             except Exception as e:
                 if attempt == retry_count - 1:
                     raise Exception(f"Failed after {retry_count} attempts: {str(e)}")
@@ -461,18 +794,185 @@ class LLMOrchestrator:
 
         raise Exception("Max retries exceeded")
 
+    async def _read_stream(
+        self,
+        response,
+        stream_delta,
+        usage: Optional[LLMCallUsage],
+        partials: bool,
+        sent: float,
+        json_output: bool = True,
+    ) -> str:
+        """
+        Consume an SSE completion. The JSON is validated as it arrives
+        (IncrementalJSONError aborts the request), finished top-level fields
+        are published to stream_sink, and reading stops once the JSON object
+        has closed and only chatter follows. Plain-text completions
+        (json_output=False) are only accumulated.
+
+        Published fields get the same local banned-word rewrite as the final
+        output (_rewrite_banned_words). The deltas are scanned as they
+        arrive, so fields are only walked once a banned word has shown up.
+        """
+        parser = owner = IncrementalJSONParser() if json_output else None
+        sink = self.stream_sink if partials else None
+        banned = banned_word_matcher.stream() if sink else None
+        banned_seen = False
+        text = ""
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue  # SSE comments / keep-alives
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if event.get("error"):
+                    raise Exception(f"LLM stream error: {event['error']}")
+                delta = stream_delta(event)
+                if not delta:
+                    continue
+                if usage and not usage.ttft_ms:
+                    usage.ttft_ms = round((time.perf_counter() - sent) * 1000, 1)
+                text += delta
+                if banned is not None and banned.feed(delta):
+                    banned_seen = True
+                if parser is None:
+                    continue
+                try:
+                    fields = parser.feed(delta)
+                except IncrementalJSONError as e:
+                    # Abort only if json_repair could not fix it either;
+                    # otherwise read the rest and repair after parsing
+                    try:
+                        repair_json(parser.text)
+                    except JSONRepairError:
+                        raise e
+                    parser = None
+                    continue
+                for field in fields:
+                    if sink:
+                        value = (parser.partial() or {}).get(field)
+                        if banned_seen or banned.pending():
+                            value = OutputValidator.rewrite_banned_fields(value)[0]
+                        sink.publish_partial(parser, field, value)
+                if parser.trailing_chars > STREAM_MAX_TRAILING_CHARS:
+                    break
+        except BaseException:
+            if sink:
+                sink.release(owner)
+            raise
+        return parser.json_text() if parser and parser.done else text
+
+    def _publish_partials(self, content: str):
+        """Publish the top-level fields of a complete (non-streamed) response"""
+        if not self.stream_sink:
+            return
+        parser = IncrementalJSONParser()
+        try:
+            fields = parser.feed(content)
+        except IncrementalJSONError:
+            return
+        data = parser.partial() or {}
+        if banned_word_matcher.pattern.search(content):
+            data = OutputValidator.rewrite_banned_fields(data)[0]
+        for field in fields:
+            self.stream_sink.publish_partial(parser, field, data.get(field))
+
+    def _emit(self, event: str, data: Dict[str, Any]):
+        """Pipeline progress for streaming clients (no-op without a stream_sink)"""
+        if self.stream_sink:
+            self.stream_sink.put(event, data)
+
+    @staticmethod
+    def _with_cache_markers(messages: List[Dict[str, str]], model_id: str) -> List[Dict[str, Any]]:
+        """Mark the static system prompt as a cache breakpoint for models that need one"""
+        if not PROMPT_CACHE_ENABLED or not model_id.startswith(EXPLICIT_CACHE_MODEL_PREFIXES):
+            return messages
+        marked = []
+        for msg in messages:
+            if msg["role"] == "system":
+                msg = {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": msg["content"],
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
+                }
+            marked.append(msg)
+        return marked
+
+    @staticmethod
+    def _response_format(model_id: str, output_model: Type[BaseModel]) -> dict:
+        """OpenRouter response_format: the model's JSON schema where the provider enforces one"""
+        if not model_id.startswith(JSON_SCHEMA_MODEL_PREFIXES):
+            return {"type": "json_object"}
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": output_model.__name__,
+                "strict": False,
+                "schema": _json_schema(output_model),
+            },
+        }
+
+    @staticmethod
+    def _record_gemini_usage(usage: LLMCallUsage, meta: dict):
+        """Copy Gemini usageMetadata onto the accounting record"""
+        usage.prompt_tokens = meta.get("promptTokenCount", 0)
+        usage.completion_tokens = meta.get("candidatesTokenCount", 0)
+        usage.cached_tokens = meta.get("cachedContentTokenCount", 0)
+        usage.cache_hit = usage.cached_tokens > 0
+
+    @staticmethod
+    def _record_openrouter_usage(usage: LLMCallUsage, result: dict):
+        """Copy the OpenRouter `usage` block onto the accounting record"""
+        data = result.get("usage") or {}
+        usage.prompt_tokens = data.get("prompt_tokens", 0)
+        usage.completion_tokens = data.get("completion_tokens", 0)
+        usage.cached_tokens = (data.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+        usage.cache_hit = usage.cached_tokens > 0
+        usage.cost = data.get("cost")
+        if result.get("model"):
+            usage.model = result["model"]
+
     async def _wait_with_exponential_backoff(self, attempt: int):
-        """Exponential backoff for rate limiting"""
+        """Exponential backoff for transport errors (rate limits go through the scheduler)"""
         import asyncio
 
         wait_time = (2**attempt) + 1
-        await asyncio.sleep(wait_time)
+        with span("llm.backoff", attempt=attempt, wait_seconds=wait_time):
+            await asyncio.sleep(wait_time)
 
+    @traced("pipeline.step1_extract_structure")
     async def step1_extract_structure(self, raw_resume_text: str) -> ResumeSchema:
         """
         Step 1: Extract structured data from raw resume text.
         Uses cheap model for simple extraction task.
+
+        In hybrid mode (LLM_STEP1_MODE) the rule-based ResumeParser runs
+        first: a high-confidence parse is used as is, a medium one only asks
+        the LLM for the sections it probably missed.
         """
+        local, gaps = None, []
+        if STEP1_MODE != "llm":
+            try:
+                local, confidence = ResumeParser(raw_resume_text).parse_with_confidence()
+            except Exception as e:
+                # Heuristics must never fail the pipeline; the LLM still can
+                logger.warning(f"Local resume parse failed, using LLM extraction: {e}")
+            else:
+                if STEP1_MODE == "local" or confidence.level == "high" or (
+                    confidence.level == "medium" and not confidence.gaps
+                ):
+                    RESUME_PARSE_PATH.labels("local").inc()
+                    return local
+                if confidence.level == "medium":
+                    gaps = confidence.gaps
+
         system_prompt = """You are an expert at parsing resumes. Extract structured information from the raw resume text and return ONLY valid JSON.
 
 Return this exact JSON structure:
@@ -536,6 +1036,13 @@ CRITICAL RULES:
         user_message = (
             f"Extract structured data from this resume:\n\n{raw_resume_text[:8000]}"
         )
+        if gaps:
+            # Same system prompt (stays prompt-cacheable); only the ask shrinks
+            user_message = (
+                "The other sections were already extracted. Return ONLY a JSON object "
+                f"with these top-level keys: {', '.join(gaps)}\n\n" + user_message
+            )
+        step = "step1_fill_gaps" if gaps else "step1_extract_structure"
 
         response = await self._call_llm(
             messages=[
@@ -543,18 +1050,37 @@ CRITICAL RULES:
                 {"role": "user", "content": user_message},
             ],
             model_config=LLM_MODELS[ModelTier.CHEAP],
+            step=step,
+            output_model=ResumeSchema,
         )
 
-        json_str = self._extract_json(response)
-        data = json.loads(json_str)
+        extracted = self._parse_output(response, ResumeSchema, step)
+        if not gaps:
+            RESUME_PARSE_PATH.labels("llm").inc()
+            return extracted
 
-        return ResumeSchema(**data)
+        for section in gaps:
+            value = getattr(extracted, section)
+            if value:
+                setattr(local, section, value)
+        RESUME_PARSE_PATH.labels("gap_fill").inc()
+        return local
 
+    @traced("pipeline.step2_analyze_job")
     async def step2_analyze_job(self, job_description: str) -> JobAnalysis:
         """
         Step 2: Analyze job description to extract keywords and requirements.
         Uses cheap model for keyword extraction.
+
+        The local JobAnalyzer (LLM_STEP2_MODE) either replaces the call
+        outright or verifies its result: skills the model invented are
+        dropped and required skills it missed are added.
         """
+        local = analyze_job_locally(job_description) if STEP2_MODE != "llm" else None
+        if STEP2_MODE == "local":
+            JOB_ANALYSIS_PATH.labels("local").inc()
+            return local
+
         system_prompt = """You are an expert job analyst. Analyze the job description and extract structured information.
 
 Return ONLY valid JSON with this exact structure:
@@ -582,7 +1108,10 @@ CRITICAL RULES:
 4. Return ONLY the JSON, no markdown, no explanations
 """
 
-        user_message = f"Analyze this job description:\n\n{job_description[:6000]}"
+        # Benefits / EEO boilerplate carries no requirements; dropping it first
+        # also lets more of a long JD fit in the 6000-char window
+        compact_jd = strip_jd_boilerplate(job_description)[:6000]
+        user_message = f"Analyze this job description:\n\n{compact_jd}"
 
         response = await self._call_llm(
             messages=[
@@ -590,14 +1119,32 @@ CRITICAL RULES:
                 {"role": "user", "content": user_message},
             ],
             model_config=LLM_MODELS[ModelTier.CHEAP],
+            step="step2_analyze_job",
+            tokens_saved=max(
+                0, estimate_tokens(job_description[:6000]) - estimate_tokens(compact_jd)
+            ),
+            output_model=JobAnalysis,
         )
 
-        json_str = self._extract_json(response)
-        data = json.loads(json_str)
-        data["raw_text"] = job_description
-
-        return JobAnalysis(**data)
+        analysis = self._parse_output(
+            response, JobAnalysis, "step2_analyze_job", extra={"raw_text": job_description}
+        )
+        if local is None:
+            JOB_ANALYSIS_PATH.labels("llm").inc()
+            return analysis
+
+        analysis, changes = verify_with_local(analysis, local)
+        JOB_ANALYSIS_PATH.labels("verified").inc()
+        for change, skills in changes.items():
+            if skills:
+                JOB_ANALYSIS_CORRECTIONS.labels(change).inc(len(skills))
+        if changes["dropped"] or changes["added"]:
+            logger.info(
+                f"Step 2 verification dropped {changes['dropped']} added {changes['added']}"
+            )
+        return analysis
 
+    @traced("pipeline.step3_calculate_match")
     async def step3_calculate_match(
         self, resume: ResumeSchema, job: JobAnalysis
     ) -> MatchScoreResult:
@@ -647,12 +1194,11 @@ JOB ANALYSIS:
                 {"role": "user", "content": user_message},
             ],
             model_config=LLM_MODELS[ModelTier.STANDARD],
+            step="step3_calculate_match",
+            output_model=MatchScoreResult,
         )
 
-        json_str = self._extract_json(response)
-        data = json.loads(json_str)
-
-        return MatchScoreResult(**data)
+        return self._parse_output(response, MatchScoreResult, "step3_calculate_match")
 
     def _estimate_experience_years(self, resume: ResumeSchema) -> float:
         """Estimate total years of experience from work history dates."""
@@ -687,6 +1233,7 @@ JOB ANALYSIS:
         latest = max(end_dates) if end_dates else current_year
         return max(0.0, round(latest - earliest, 1))
 
+    @traced("pipeline.step4_tailor_resume")
     async def step4_tailor_resume(
         self,
         resume: ResumeSchema,
@@ -697,22 +1244,20 @@ JOB ANALYSIS:
         """
         Step 4: Tailor resume for the specific job.
         Uses PREMIUM model - this is the most important step.
+
+        Long resumes (or LLM_STEP4_MODE=sections) go through
+        step4_tailor_sections instead, so output is never truncated.
         """
-        resume_text = self._resume_to_text(resume)
+        if STEP4_MODE == "sections" or (STEP4_MODE == "auto" and self._exceeds_single_output(resume)):
+            return await self.step4_tailor_sections(
+                resume, job, match_result, experience_years_strategy
+            )
+        STEP4_MODE_USED.labels("single").inc()
+
+        resume_text = self._resume_to_text(resume, dedupe=True)
         job_text = self._job_to_text(job)
+        experience_note = self._experience_note(resume, job, experience_years_strategy)
 
-        experience_note = ""
-        if experience_years_strategy == "dynamic" and job.experience_years_min:
-            candidate_years = self._estimate_experience_years(resume)
-            if candidate_years < job.experience_years_min:
-                experience_note = f"""
-EXPERIENCE GAP STRATEGY:
-The JD requires approximately {job.experience_years_min} years of experience. 
-Candidate has approximately {candidate_years} years. 
-Frame existing experience to demonstrate equivalent capability. 
-Focus on depth of achievements and impact rather than total years. 
-Do NOT misrepresent years of experience.
-"""
         system_prompt = """You are an expert resume writer who crafts ATS-optimized resumes that also impress human recruiters.
 
 YOUR CORE PRINCIPLES:
@@ -777,73 +1322,365 @@ RIGHT: Keep Flask, highlight AWS/EC2 experience, mention Docker familiarity in p
 Return ONLY JSON, no markdown code blocks.
 """
 
+        instructions = """CRITICAL:
+- Preserve ALL original skills exactly
+- Only enhance achievements if they can be quantified or strengthened
+- Add job-relevant keywords to summary
+- Keep candidate's authentic voice
+- Return ONLY JSON"""
+
+        # Size of the prompt before compaction (raw resume text, pretty-printed match JSON)
+        original_tokens = estimate_tokens(system_prompt) + estimate_tokens(
+            self._resume_to_text(resume)
+            + job_text
+            + json.dumps(match_result.model_dump(), indent=2)
+            + experience_note
+            + instructions
+        )
+        model_config = LLM_MODELS[ModelTier.PREMIUM]
+        sections, report = compact_prompt(
+            [
+                PromptSection("system", system_prompt),
+                PromptSection("resume", resume_text),
+                PromptSection("job", job_text, trim_priority=1),
+                PromptSection("match", self._match_to_text(match_result), trim_priority=0),
+                PromptSection("experience_note", experience_note),
+                PromptSection("instructions", instructions),
+            ],
+            model_config.tier.value,
+            original_tokens=original_tokens,
+        )
+        if report.over_budget:
+            logger.warning(
+                f"step4 prompt ~{report.compacted_tokens} tokens exceeds the "
+                f"{report.budget}-token {model_config.tier.value} budget after compaction"
+            )
+
         user_message = f"""CANDIDATE RESUME:
-{resume_text}
+{sections["resume"]}
 
 TARGET JOB:
-{job_text}
+{sections["job"]}
 
 ATS MATCH ANALYSIS:
-{json.dumps(match_result.model_dump(), indent=2)}
-{experience_note}
-CRITICAL: 
-- Preserve ALL original skills exactly
-- Only enhance achievements if they can be quantified or strengthened
-- Add job-relevant keywords to summary
-- Keep candidate's authentic voice
-- Return ONLY JSON
+{sections["match"]}
+
+{sections["experience_note"]}
+{sections["instructions"]}
 """
 
         response = await self._call_llm(
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": sections["system"]},
                 {"role": "user", "content": user_message},
             ],
-            model_config=LLM_MODELS[ModelTier.PREMIUM],
+            model_config=model_config,
+            step="step4_tailor_resume",
+            tokens_saved=report.saved_tokens,
+            partials=True,
+            # The model writes resume content only; the tailoring metadata is set afterwards
+            output_model=ResumeSchema,
         )
 
-        json_str = self._extract_json(response)
-        data = json.loads(json_str)
+        tailored = self._parse_output(response, TailoredResumeSchema, "step4_tailor_resume")
+        tailored = self._rewrite_banned_words(tailored, "step4_tailor_resume")
+        # Fingerprints of the inputs, so a later edit can re-tailor only what changed
+        tailored.meta = {**(tailored.meta or {}), SECTION_META_KEY: section_fingerprints(resume, job)}
+        return tailored
 
-        return TailoredResumeSchema(**data)
+    def _exceeds_single_output(self, resume: ResumeSchema) -> bool:
+        """The tailored JSON is at least as long as the resume text; leave headroom."""
+        budget = LLM_MODELS[ModelTier.PREMIUM].max_tokens * STEP4_SINGLE_OUTPUT_SHARE
+        return estimate_tokens(self._resume_to_text(resume)) > budget
 
-    def _extract_json(self, text: str) -> str:
-        """Extract JSON from LLM response, handling markdown code blocks"""
-        if not text:
-            raise ValueError("Empty response from LLM")
-        text = text.strip()
+    @traced("pipeline.step4_tailor_sections")
+    async def step4_tailor_sections(
+        self,
+        resume: ResumeSchema,
+        job: JobAnalysis,
+        match_result: MatchScoreResult,
+        experience_years_strategy: str = "default",
+    ) -> TailoredResumeSchema:
+        """
+        Step 4 as concurrent per-section calls (see section_tailor), merged
+        and validated as a TailoredResumeSchema. Each call has a small
+        prompt and its own output budget.
+        """
+        STEP4_MODE_USED.labels("sections").inc()
+        fingerprints = section_fingerprints(resume, job)
+        outputs = await self._tailor_sections(
+            resume, list(fingerprints), job, match_result,
+            self._experience_note(resume, job, experience_years_strategy),
+        )
+        tailored = merge_sections(
+            resume, outputs, {k: v for k, v in fingerprints.items() if k in outputs}
+        )
+        tailored.matched_keywords = list(match_result.matched_keywords)
+        tailored.missing_keywords = list(match_result.missing_keywords)
+        return TailoredResumeSchema.model_validate(tailored.model_dump())
 
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
+    async def _tailor_sections(
+        self,
+        resume: ResumeSchema,
+        keys: List[str],
+        job: JobAnalysis,
+        match_result: MatchScoreResult,
+        experience_note: str,
+    ) -> Dict[str, BaseModel]:
+        """
+        Run tailor_section for every key concurrently. A failed section keeps
+        its source content (and is left out of the result, so it is not
+        fingerprinted); only if every section fails does the step fail.
+        """
+        async def run(key: str) -> BaseModel:
+            output = await self.tailor_section(resume, key, job, match_result, experience_note)
+            self._emit("step", {"step": "tailor_section", "section": key})
+            return output
+
+        results = await asyncio.gather(*(run(key) for key in keys), return_exceptions=True)
+        outputs, errors = {}, []
+        for key, result in zip(keys, results):
+            if not isinstance(result, BaseException):
+                outputs[key] = result
+                continue
+            if not isinstance(result, Exception):
+                raise result
+            logger.warning(f"Tailoring section {key} failed, keeping source content: {result}")
+            STEP4_MODE_USED.labels("section_failed").inc()
+            errors.append(result)
+        if errors and not outputs:
+            raise errors[0]
+        return outputs
+
+    def _experience_note(
+        self, resume: ResumeSchema, job: JobAnalysis, experience_years_strategy: str
+    ) -> str:
+        if experience_years_strategy != "dynamic" or not job.experience_years_min:
+            return ""
+        candidate_years = self._estimate_experience_years(resume)
+        if candidate_years >= job.experience_years_min:
+            return ""
+        return f"""
+EXPERIENCE GAP STRATEGY:
+The JD requires approximately {job.experience_years_min} years of experience. 
+Candidate has approximately {candidate_years} years. 
+Frame existing experience to demonstrate equivalent capability. 
+Focus on depth of achievements and impact rather than total years. 
+Do NOT misrepresent years of experience.
+"""
 
-        if text.endswith("```"):
-            text = text[:-3]
+    @traced("pipeline.step4_tailor_section")
+    async def tailor_section(
+        self,
+        resume: ResumeSchema,
+        key: str,
+        job: JobAnalysis,
+        match_result: MatchScoreResult,
+        experience_note: str = "",
+    ) -> BaseModel:
+        """
+        Tailor one resume section (see section_tailor) with a small premium
+        call. Returns the section's output model.
+        """
+        kind = section_kind(key)
+        output_model, shape = SECTION_KINDS[kind]
+        system_prompt = """You are an expert resume writer who tailors ONE resume section at a time for ATS systems and human recruiters.
 
-        text = text.strip()
+YOUR CORE PRINCIPLES:
+1. PRESERVE ALL ORIGINAL CONTENT - Never remove skills, technologies, or experience
+2. ENHANCE EXISTING - Improve achievements without changing their meaning
+3. QUANTIFY WHEN POSSIBLE - Add numbers/percentages to vague achievements
+4. NATURAL KEYWORD INTEGRATION - Weave job keywords into existing content
+5. AUTHENTIC VOICE - Keep candidate's writing style, avoid AI-slop language
 
-        json_match = None
-        try:
-            json_match = json.loads(text)
-            return text
-        except json.JSONDecodeError:
-            match = None
+CRITICAL REQUIREMENTS:
+- NEVER invent skills the candidate doesn't have
+- NEVER change company names, job titles or dates
+- NEVER fabricate achievements
+- Rewrite ONLY the section you are given, in the JSON shape you are given
 
-        try:
-            import re
+Return ONLY JSON, no markdown code blocks.
+"""
+        source = section_source_model(resume, key).model_dump(mode="json", exclude_none=True)
+        skills_note = ""
+        if kind == "summary":
+            # The summary may only cite skills the resume actually has
+            skills = sorted({k for skill in resume.skills for k in skill.keywords})
+            skills_note = f"\nCANDIDATE SKILLS: {', '.join(skills)}\n"
+        user_message = f"""RESUME SECTION: {kind}
+Return ONLY JSON in this shape:
+{shape}
+
+CURRENT SECTION:
+{json.dumps(source, ensure_ascii=False)}
+{skills_note}
+TARGET JOB:
+{self._job_to_text(job)}
+
+ATS MATCH ANALYSIS:
+{self._match_to_text(match_result)}
+{experience_note}"""
+
+        response = await self._call_llm(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+            model_config=LLM_MODELS[ModelTier.PREMIUM],
+            step=f"step4_section_{kind}",
+            output_model=output_model,
+        )
+        output = self._parse_output(response, output_model, f"step4_section_{kind}")
+        return self._rewrite_banned_words(output, f"step4_section_{kind}")
+
+    async def retailor_resume(
+        self,
+        resume: ResumeSchema,
+        job: JobAnalysis,
+        match_result: MatchScoreResult,
+        previous: TailoredResumeSchema,
+        experience_years_strategy: str = "default",
+    ) -> TailoredResumeSchema:
+        """
+        Incremental step 4: re-tailor only the sections whose source or
+        relevant job terms changed since `previous`, reusing its output for
+        the rest. Falls back to a full step 4 when nothing can be reused.
+        """
+        fingerprints, stale, reusable = plan_retailoring(resume, job, previous)
+        RETAILOR_SECTIONS.labels("reused").inc(len(reusable))
+        if not reusable:
+            RETAILOR_SECTIONS.labels("full").inc()
+            return await self.step4_tailor_resume(resume, job, match_result, experience_years_strategy)
+
+        logger.info(f"Re-tailoring {len(stale)} of {len(fingerprints)} sections: {stale}")
+        RETAILOR_SECTIONS.labels("regenerated").inc(len(stale))
+        outputs = await self._tailor_sections(
+            resume, stale, job, match_result,
+            self._experience_note(resume, job, experience_years_strategy),
+        ) if stale else {}
+        return merge_sections(
+            resume,
+            {**reusable, **outputs},
+            {k: v for k, v in fingerprints.items() if k in reusable or k in outputs},
+            previous,
+        )
+
+    @traced("pipeline.cover_letter")
+    async def generate_cover_letter(
+        self,
+        resume: ResumeSchema,
+        job: JobAnalysis,
+        match_result: Optional[MatchScoreResult] = None,
+        company_name: str = "",
+        hiring_manager: str = "",
+    ) -> str:
+        """
+        Cover letter body from pipeline artifacts (the tailored resume, its
+        JobAnalysis and MatchScoreResult) — no re-extraction or re-analysis.
+        Uses the standard tier; returns plain text.
+        """
+        system_prompt = """You are an expert cover letter writer. Write a compelling, professional cover letter body.
+
+Write a cover letter that:
+1. Addresses the hiring manager professionally (use "Dear Hiring Manager" if name unknown)
+2. Highlights the candidate's experience and skills most relevant to the job
+3. Shows enthusiasm for the role and company
+4. Is concise (3-4 paragraphs max)
+5. Uses professional language and the candidate's authentic voice
+6. Includes a call to action
+
+NEVER claim skills or experience that are not in the resume.
+Return ONLY the cover letter text, no formatting or markdown.
+"""
+        match_text = f"\nATS MATCH ANALYSIS:\n{self._match_to_text(match_result)}\n" if match_result else ""
+        recipient = []
+        if hiring_manager:
+            recipient.append(f"Hiring Manager: {hiring_manager}")
+        if company_name or job.company_name:
+            recipient.append(f"Company: {company_name or job.company_name}")
+        recipient_text = "\n".join(recipient)
+        user_message = f"""CANDIDATE RESUME:
+{self._resume_to_text(resume, dedupe=True)}
 
-            match = re.search(r"\{.*\}", text, re.DOTALL)
-            if match:
-                return match.group()
-        except:
-            pass
+TARGET JOB:
+{self._job_to_text(job)}
+{match_text}
+{recipient_text}
+"""
 
-        raise Exception(f"Could not extract JSON from response: {text[:200]}...")
+        response = await self._call_llm(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+            model_config=LLM_MODELS[ModelTier.STANDARD],
+            step="cover_letter",
+        )
+        if not response or not response.strip():
+            raise ValueError("Empty response from LLM")
+        return strip_fences(response).strip()
 
-    def _resume_to_text(self, resume: ResumeSchema) -> str:
-        """Convert ResumeSchema to readable text for LLM"""
+    def _extract_json(self, text: str) -> str:
+        """Extract JSON from LLM response, repairing markdown fences and malformed output"""
+        if not text:
+            raise ValueError("Empty response from LLM")
+        try:
+            return repair_json(text)[0]
+        except JSONRepairError as e:
+            raise Exception(f"Could not extract JSON from response ({e}): {text[:200]}...")
+
+    def _parse_output(
+        self,
+        text: str,
+        output_model: Type[BaseModel],
+        step: str,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Parse a step's response into its schema, repairing locally (see
+        json_repair) rather than re-calling the LLM for fixable output.
+        """
+        if not text:
+            raise ValueError("Empty response from LLM")
+        try:
+            result, fixes = parse_model(text, output_model, extra)
+        except JSONRepairError as e:
+            LLM_OUTPUT_REPAIRS.labels(step, "failed").inc()
+            raise Exception(f"Could not extract JSON from response ({e}): {text[:200]}...")
+        except ValueError:
+            LLM_OUTPUT_REPAIRS.labels(step, "failed").inc()
+            raise
+        for fix in fixes:
+            LLM_OUTPUT_REPAIRS.labels(step, fix).inc()
+        if fixes:
+            logger.info(f"{step}: repaired LLM output locally ({', '.join(fixes)})")
+        return result
+
+    def _rewrite_banned_words(self, output: BaseModel, step: str) -> BaseModel:
+        """
+        Replace banned words in step-4 prose locally (see prompt_engine)
+        instead of re-calling the premium model. Words with no plain
+        substitute are kept and counted.
+        """
+        data = output.model_dump()
+        rewritten, remaining = OutputValidator.rewrite_banned_fields(data)
+        if remaining:
+            LLM_BANNED_WORDS.labels(step, "kept").inc(len(remaining))
+            logger.info(f"{step}: banned words without a local substitute: {remaining}")
+        if rewritten is data:
+            return output
+        LLM_BANNED_WORDS.labels(step, "rewritten").inc()
+        return type(output).model_validate(rewritten)
+
+    def _resume_to_text(self, resume: ResumeSchema, dedupe: bool = False) -> str:
+        """Convert ResumeSchema to readable text for LLM.
+
+        With dedupe=True, skill keywords and bullets already listed earlier
+        in the resume are left out (prompt compaction for step 4).
+        """
         parts = []
+        seen = Deduper()
+        first = seen.first if dedupe else (lambda text: True)
 
         if resume.basics:
             b = resume.basics
@@ -860,7 +1697,9 @@ CRITICAL:
         if resume.skills:
             parts.append("\nSKILLS:")
             for skill in resume.skills:
-                parts.append(f"  {skill.name}: {', '.join(skill.keywords)}")
+                keywords = [k for k in skill.keywords if first(k)]
+                if keywords or not dedupe:
+                    parts.append(f"  {skill.name}: {', '.join(keywords)}")
 
         if resume.work:
             parts.append("\nEXPERIENCE:")
@@ -873,7 +1712,8 @@ CRITICAL:
                     parts.append(f"  {job.summary}")
                 if job.highlights:
                     for h in job.highlights:
-                        parts.append(f"    - {h}")
+                        if first(h):
+                            parts.append(f"    - {h}")
 
         if resume.education:
             parts.append("\nEDUCATION:")
@@ -889,7 +1729,8 @@ CRITICAL:
                 parts.append(f"  {proj.name}: {proj.description}")
                 if proj.highlights:
                     for h in proj.highlights:
-                        parts.append(f"    - {h}")
+                        if first(h):
+                            parts.append(f"    - {h}")
 
         if resume.certificates:
             parts.append("\nCERTIFICATIONS:")
@@ -937,6 +1778,74 @@ CRITICAL:
 
         return "\n".join(parts)
 
+    @staticmethod
+    def _match_to_text(match: MatchScoreResult) -> str:
+        """Compact match summary for step 4, most useful lines first (trimmed from the end)"""
+        parts = [
+            f"overall_score: {match.overall_score} (keyword match {match.keyword_match_rate:.0%})",
+            f"matched_keywords: {', '.join(match.matched_keywords)}",
+            f"missing_keywords: {', '.join(match.missing_keywords)}",
+        ]
+        if match.bonus_keywords:
+            parts.append(f"bonus_keywords: {', '.join(match.bonus_keywords)}")
+        for key, value in match.gap_analysis.items():
+            if value:
+                parts.append(f"{key}: {value}")
+        for rec in match.recommendations:
+            parts.append(f"- {rec}")
+        return "\n".join(parts)
+
+    @traced("pipeline.extract_resume")
+    async def extract_resume(self, raw_resume_text: str) -> ResumeSchema:
+        """
+        Step 1 through the shared extraction cache. Concurrent callers with
+        the same resume text wait on one extraction instead of each paying
+        for it; callers get their own copy to mutate.
+        """
+        key = hashlib.sha256(f"{STEP1_MODE}\0{raw_resume_text}".encode("utf-8")).hexdigest()
+        cached = _extraction_cache.get(key)
+        if cached is not None:
+            _extraction_cache.move_to_end(key)
+            return cached.model_copy(deep=True)
+
+        pending = _extraction_inflight.get(key)
+        if pending is not None:
+            try:
+                return (await asyncio.shield(pending)).model_copy(deep=True)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The extracting request went away; extract for ourselves
+
+        pending = asyncio.get_running_loop().create_future()
+        _extraction_inflight[key] = pending
+        try:
+            resume = await self.step1_extract_structure(raw_resume_text)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unwaited future stays quiet
+            pending.exception()
+            raise
+        finally:
+            if _extraction_inflight.get(key) is pending:
+                del _extraction_inflight[key]
+
+        pending.set_result(resume)
+        _extraction_cache[key] = resume
+        while len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+        return resume.model_copy(deep=True)
+
+    def _fork(self) -> "LLMOrchestrator":
+        """Same configuration, separate usage records (one per fan-out job)."""
+        child = LLMOrchestrator(api_key=self.api_key, priority=self.priority)
+        child._mock_profile = self._mock_profile
+        return child
+
+    @traced("pipeline.full_pipeline")
     async def full_pipeline(
         self,
         raw_resume_text: str,
@@ -947,20 +1856,101 @@ CRITICAL:
         Run the complete resume tailoring pipeline.
         Returns tailored resume, job analysis, and match result.
         """
-        import asyncio
-
         raw_resume_text = self.normalize_unicode(raw_resume_text)
         job_description = self.normalize_unicode(job_description)
 
+        self._emit("step", {"step": "extract_and_analyze"})
         resume, job = await asyncio.gather(
-            self.step1_extract_structure(raw_resume_text),
+            self.extract_resume(raw_resume_text),
             self.step2_analyze_job(job_description),
         )
 
+        self._emit("step", {"step": "match"})
         match_result = await self.step3_calculate_match(resume, job)
 
+        self._emit("step", {"step": "tailor", "match_score": match_result.overall_score})
         tailored = await self.step4_tailor_resume(
             resume, job, match_result, experience_years_strategy
         )
 
         return tailored, job, match_result
+
+    async def incremental_pipeline(
+        self,
+        raw_resume_text: str,
+        job_description: str,
+        previous: TailoredResumeSchema,
+        experience_years_strategy: str = "default",
+        previous_analysis: Optional[Tuple[JobAnalysis, MatchScoreResult]] = None,
+    ) -> tuple[TailoredResumeSchema, JobAnalysis, MatchScoreResult]:
+        """
+        full_pipeline, re-tailoring only the sections changed since `previous`.
+
+        Pass the previous run's job analysis and match result when the job
+        description is unchanged: steps 2 and 3 are skipped, and the job
+        terms behind the section fingerprints stay identical, so only
+        sections whose source changed go back to the LLM.
+        """
+        raw_resume_text = self.normalize_unicode(raw_resume_text)
+        job_description = self.normalize_unicode(job_description)
+
+        self._emit("step", {"step": "extract_and_analyze"})
+        if previous_analysis is not None:
+            resume = await self.extract_resume(raw_resume_text)
+            job, match_result = previous_analysis
+        else:
+            resume, job = await asyncio.gather(
+                self.extract_resume(raw_resume_text),
+                self.step2_analyze_job(job_description),
+            )
+
+            self._emit("step", {"step": "match"})
+            match_result = await self.step3_calculate_match(resume, job)
+
+        self._emit("step", {"step": "tailor", "match_score": match_result.overall_score})
+        tailored = await self.retailor_resume(
+            resume, job, match_result, previous, experience_years_strategy
+        )
+        return tailored, job, match_result
+
+    async def fan_out_pipeline(
+        self,
+        raw_resume_text: str,
+        job_descriptions: Sequence[str],
+        experience_years_strategy: str = "default",
+        concurrency: int = FANOUT_CONCURRENCY,
+    ) -> AsyncIterator[FanOutResult]:
+        """
+        Tailor one resume to many jobs. The resume is extracted once (step 1
+        usage stays on self.usage); steps 2-4 run per job, at most
+        `concurrency` jobs at a time, each on a forked orchestrator so its
+        usage can be recorded against its own tailored resume. Results are
+        yielded as jobs finish; a failed job carries its error instead of
+        aborting the others.
+        """
+        resume = await self.extract_resume(self.normalize_unicode(raw_resume_text))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(index: int, job_description: str) -> FanOutResult:
+            child = self._fork()
+            outcome = FanOutResult(index=index, job_description=job_description, usage=child.usage)
+            async with semaphore:
+                try:
+                    job = await child.step2_analyze_job(self.normalize_unicode(job_description))
+                    match_result = await child.step3_calculate_match(resume, job)
+                    tailored = await child.step4_tailor_resume(
+                        resume.model_copy(deep=True), job, match_result, experience_years_strategy
+                    )
+                    outcome.result = (tailored, job, match_result)
+                except Exception as e:
+                    logger.warning(f"Fan-out job {index} failed: {e}")
+                    outcome.error = e
+            return outcome
+
+        tasks = [asyncio.ensure_future(run(i, jd)) for i, jd in enumerate(job_descriptions)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,174 @@
+"""
+LLM Replay - Record real LLM responses and replay them offline
+
+LLM_REPLAY_MODE=record   call the provider as usual and save every
+                         request -> response pair (with its measured latency
+                         and token usage) under LLM_REPLAY_DIR
+LLM_REPLAY_MODE=replay   never touch the network: answer from the store,
+                         sleeping for the recorded latency first
+
+Entries are keyed by a hash of (model, messages, max_tokens, temperature),
+one JSON file per key. Several recordings of the same prompt are replayed
+round-robin. LLM_REPLAY_LATENCY_SCALE multiplies replayed latency
+(default 1, 0 = no sleep, 0.5 = half the recorded latency). On a miss, replay raises ReplayMiss unless
+LLM_REPLAY_MISS=mock, which falls back to the keyword mock.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_REPLAY_DIR = os.path.join(_BACKEND_DIR, "llm_recordings")
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayMiss(Exception):
+    """No recording exists for this prompt."""
+
+
+def replay_mode() -> str:
+    return os.getenv("LLM_REPLAY_MODE", "").lower()
+
+
+def request_key(messages: List[Dict[str, str]], model_id: str, max_tokens: int, temperature: float) -> str:
+    canonical = json.dumps(
+        {
+            "model": model_id,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """Directory of recordings, loaded lazily and cached in memory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._entries: Optional[Dict[str, dict]] = None
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            entries = {}
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if not name.endswith(".json"):
+                        continue
+                    with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                        entry = json.load(f)
+                    entries[entry["key"]] = entry
+            self._entries = entries
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Next recorded response for key (round-robin), or None."""
+        with self._lock:
+            entry = self._load().get(key)
+            if not entry or not entry["responses"]:
+                return None
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return entry["responses"][cursor % len(entry["responses"])]
+
+    def record(self, key: str, step: str, model_id: str, messages: List[Dict[str, str]], response: dict) -> None:
+        with self._lock:
+            entries = self._load()
+            entry = entries.setdefault(
+                key,
+                {"key": key, "step": step, "model": model_id, "messages": messages, "responses": []},
+            )
+            entry["responses"].append(response)
+
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self._path(key))
+
+
+_stores: Dict[str, ReplayStore] = {}
+
+
+def get_store() -> ReplayStore:
+    directory = os.getenv("LLM_REPLAY_DIR", DEFAULT_REPLAY_DIR)
+    if directory not in _stores:
+        _stores[directory] = ReplayStore(directory)
+    return _stores[directory]
+
+
+# ───────────────────────────────────────────
+# ORCHESTRATOR HOOKS
+# ───────────────────────────────────────────
+
+async def replay_response(messages: List[Dict[str, str]], model_config, usage) -> str:
+    """Return a recorded response, after its recorded latency. Fills usage from the recording."""
+    key = request_key(messages, model_config.model_id, model_config.max_tokens, model_config.temperature)
+    recorded = get_store().lookup(key)
+    if recorded is None:
+        raise ReplayMiss(f"No recording for {usage.step} ({model_config.model_id}), key {key[:12]}")
+
+    scale = float(os.getenv("LLM_REPLAY_LATENCY_SCALE", "1"))
+    if scale > 0 and recorded.get("latency_ms"):
+        await asyncio.sleep(recorded["latency_ms"] * scale / 1000)
+
+    for field in ("prompt_tokens", "completion_tokens", "cached_tokens", "cost"):
+        if field in recorded.get("usage", {}):
+            setattr(usage, field, recorded["usage"][field])
+    usage.cache_hit = usage.cached_tokens > 0
+    usage.model = recorded.get("model", usage.model)
+    return recorded["content"]
+
+
+def record_response(messages: List[Dict[str, str]], model_config, usage, content: str, latency_ms: float) -> None:
+    """Save a live response. Failures are logged, never raised into the request."""
+    key = request_key(messages, model_config.model_id, model_config.max_tokens, model_config.temperature)
+    try:
+        _record(key, messages, model_config, usage, content, latency_ms)
+    except OSError as e:
+        logger.warning(f"LLM replay: could not record {key[:12]}: {e}")
+
+
+def _record(key, messages, model_config, usage, content, latency_ms) -> None:
+    get_store().record(
+        key,
+        usage.step,
+        model_config.model_id,
+        messages,
+        {
+            "content": content,
+            "latency_ms": round(latency_ms, 1),
+            "model": usage.model,
+            "provider": usage.provider,
+            "retries": usage.retries,
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "cached_tokens": usage.cached_tokens,
+                "cost": usage.cost,
+            },
+            "recorded_at": datetime.utcnow().isoformat(),
+        },
+    )
@@ -0,0 +1,281 @@
+"""
+LLM Router - Ordered provider fallbacks, hedged requests and circuit breakers
+
+Each ModelTier resolves to an ordered list of routes (provider + model id):
+- LLM_<TIER>_ROUTES="openrouter:qwen/qwen3-coder:free,gemini:gemini-2.0-flash"
+  overrides the list for CHEAP / STANDARD / PREMIUM
+- otherwise the tier's model on its usual provider, followed by the other
+  provider when its key is configured
+
+A call starts on the first route whose circuit is closed. If it has not
+answered after that route's recent p95 latency, a hedge is fired on the next
+route; the first good answer wins and the other request is cancelled. Until
+a route has HEDGE_MIN_SAMPLES latencies it is not hedged (a fixed guess
+would bill long premium calls twice) unless LLM_HEDGE_DELAY_S sets a delay
+for cold routes. A route that fails hands over to the next one immediately.
+
+Circuit breakers are per provider: LLM_BREAKER_FAILURES consecutive failures
+open the circuit for LLM_BREAKER_COOLDOWN_S, after which one probe call is
+let through (half-open) to decide whether to close it again.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.services.llm_scheduler import LLMOverloaded
+from app.services.metrics import LLM_BREAKER_OPEN, LLM_HEDGES, LLM_ROUTE_RESULTS
+from app.services.tracing import span
+
+
+HEDGE_ENABLED = os.getenv("LLM_HEDGE", "true").lower() == "true"
+# Hedge delay for routes without enough latency samples; unset = no hedge
+HEDGE_COLD_DELAY_S = float(os.environ["LLM_HEDGE_DELAY_S"]) if os.getenv("LLM_HEDGE_DELAY_S") else None
+HEDGE_MIN_DELAY_S = float(os.getenv("LLM_HEDGE_MIN_DELAY_S", "2"))
+HEDGE_MIN_SAMPLES = 20
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN_S = float(os.getenv("LLM_BREAKER_COOLDOWN_S", "30"))
+# Attempts per route when another route can take over
+ROUTE_RETRIES = int(os.getenv("LLM_ROUTE_RETRIES", "2"))
+
+GEMINI_FALLBACK_MODEL = "gemini-2.0-flash"
+OPENROUTER_FALLBACK_MODEL = "openrouter/free"
+
+
+@dataclass(frozen=True)
+class Route:
+    provider: str
+    model_id: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.provider}:{self.model_id}"
+
+
+# ───────────────────────────────────────────
+# ROUTE TABLE
+# ───────────────────────────────────────────
+
+def parse_routes(spec: str) -> List[Route]:
+    """'openrouter:qwen/qwen3-coder:free,gemini:gemini-2.0-flash' -> routes."""
+    routes = []
+    for item in spec.split(","):
+        provider, _, model_id = item.strip().partition(":")
+        if provider in ("openrouter", "gemini") and model_id:
+            routes.append(Route(provider, model_id))
+    return routes
+
+
+def gemini_model(model_id: str) -> str:
+    """
+    Gemini API name for a model id: "google/gemini-2.0-flash-001:free" ->
+    "gemini-2.0-flash-001". Ids that are not Gemini (or Gemma) models map to
+    GEMINI_FALLBACK_MODEL.
+    """
+    name = model_id.split("/", 1)[1] if model_id.startswith("google/") else model_id
+    name = name.split(":", 1)[0]
+    return name if name.startswith(("gemini", "gemma")) else GEMINI_FALLBACK_MODEL
+
+
+def routes_for(tier: str, model_id: str) -> List[Route]:
+    """Ordered routes for a tier; providers without an API key are left out."""
+    spec = os.getenv(f"LLM_{tier.upper()}_ROUTES")
+    has_gemini = bool(os.getenv("GEMINI_API_KEY"))
+
+    if spec:
+        routes = parse_routes(spec)
+    elif has_gemini and model_id.startswith(("gemini", "google/")):
+        routes = [Route("gemini", gemini_model(model_id)), Route("openrouter", OPENROUTER_FALLBACK_MODEL)]
+    else:
+        routes = [Route("openrouter", model_id)]
+        if has_gemini:
+            routes.append(Route("gemini", GEMINI_FALLBACK_MODEL))
+
+    routes = [
+        Route(r.provider, gemini_model(r.model_id)) if r.provider == "gemini" else r
+        for r in routes
+        if r.provider != "gemini" or has_gemini
+    ]
+    return routes or [Route("openrouter", model_id)]
+
+
+# ───────────────────────────────────────────
+# CIRCUIT BREAKER
+# ───────────────────────────────────────────
+
+class CircuitBreaker:
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= BREAKER_COOLDOWN_S:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, BREAKER_COOLDOWN_S - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        """May a call go to this provider now? Claims the probe when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        LLM_BREAKER_OPEN.labels(self.provider).set(0)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.probing or self.failures >= BREAKER_FAILURES:
+            self.opened_at = time.monotonic()
+            LLM_BREAKER_OPEN.labels(self.provider).set(1)
+        self.probing = False
+
+    def abandon(self):
+        """The call ended without a verdict (cancelled hedge, local shedding)."""
+        self.probing = False
+
+
+# ───────────────────────────────────────────
+# ROUTER
+# ───────────────────────────────────────────
+
+ProviderCall = Callable[[Route, object, int], Awaitable[str]]
+
+# Accounting fields owned by the orchestrator, never copied from a route
+_CALL_FIELDS = {"step", "tier", "latency_ms", "success", "error", "retries", "hedged", "fallbacks"}
+
+
+class LLMRouter:
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[Route, deque] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(provider)
+        return self._breakers[provider]
+
+    def hedge_delay(self, route: Route) -> Optional[float]:
+        """p95 of the route's recent successful latencies; None = do not hedge yet."""
+        samples = self._latencies.get(route)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_COLD_DELAY_S
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(HEDGE_MIN_DELAY_S, p95)
+
+    def _observe_latency(self, route: Route, seconds: float):
+        self._latencies.setdefault(route, deque(maxlen=200)).append(seconds)
+
+    async def call(self, routes: List[Route], call: ProviderCall, usage, retry_count: int) -> str:
+        """
+        Run `call(route, route_usage, retries)` across routes with hedging and
+        fallback. The winning route's tokens / model / provider are copied onto
+        `usage`; retries from every route are summed.
+        """
+        queue = list(routes)
+        pending: Dict[asyncio.Task, tuple] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            while queue:
+                route = queue.pop(0)
+                if not self.breaker(route.provider).allow():
+                    LLM_ROUTE_RESULTS.labels(route.provider, "circuit_open").inc()
+                    continue
+                route_usage = replace(usage, provider=route.provider, model=route.model_id, retries=0)
+                retries = retry_count if not queue else min(retry_count, ROUTE_RETRIES)
+                task = asyncio.create_task(self._run(route, call, route_usage, retries))
+                pending[task] = (route, route_usage, time.monotonic())
+                return True
+            return False
+
+        usage.provider = routes[0].provider if routes else ""
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if HEDGE_ENABLED and queue and len(pending) == 1:
+                    route, _, started = next(iter(pending.values()))
+                    delay = self.hedge_delay(route)
+                    if delay is not None:
+                        timeout = max(0.0, delay - (time.monotonic() - started))
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launch():
+                        usage.hedged = True
+                        LLM_HEDGES.labels(usage.step).inc()
+                    continue
+
+                for task in done:
+                    route, route_usage, started = pending.pop(task)
+                    breaker = self.breaker(route.provider)
+                    usage.retries += route_usage.retries
+                    error = task.exception()
+                    if error is None:
+                        breaker.record_success()
+                        self._observe_latency(route, time.monotonic() - started)
+                        LLM_ROUTE_RESULTS.labels(route.provider, "win").inc()
+                        for name, value in vars(route_usage).items():
+                            if name not in _CALL_FIELDS:
+                                setattr(usage, name, value)
+                        return task.result()
+
+                    last_error = error
+                    usage.provider = route.provider
+                    if isinstance(error, LLMOverloaded):
+                        breaker.abandon()
+                        LLM_ROUTE_RESULTS.labels(route.provider, "shed").inc()
+                    else:
+                        breaker.record_failure()
+                        LLM_ROUTE_RESULTS.labels(route.provider, "error").inc()
+
+                if not pending and launch():
+                    usage.fallbacks += 1
+        finally:
+            for task, (route, _, _) in pending.items():
+                task.cancel()
+                self.breaker(route.provider).abandon()
+                LLM_ROUTE_RESULTS.labels(route.provider, "cancelled").inc()
+
+        if last_error is not None:
+            raise last_error
+        retry_after = min((self.breaker(r.provider).retry_after() for r in routes), default=0.0)
+        raise LLMOverloaded("All LLM providers are unavailable (circuits open)", retry_after=max(retry_after, 1.0))
+
+    @staticmethod
+    async def _run(route: Route, call: ProviderCall, route_usage, retries: int) -> str:
+        with span("llm.route", provider=route.provider, model=route.model_id):
+            return await call(route, route_usage, retries)
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {
+            "breakers": {p: b.state for p, b in self._breakers.items()},
+            "hedge_delay_s": {
+                r.label: None if (delay := self.hedge_delay(r)) is None else round(delay, 2)
+                for r in self._latencies
+            },
+        }
+
+
+router = LLMRouter()
@@ -0,0 +1,315 @@
+"""
+LLM Scheduler - Shared, rate-limit-aware admission control for provider calls
+
+Every live provider attempt takes a slot on a per-(provider, model) lane:
+- AIMD concurrency window: +1/limit per success, halved on 429/503/529
+- Request token bucket, learned from x-ratelimit-* response headers
+  (or seeded with LLM_RPM)
+- A 429 blocks the whole lane until Retry-After / x-ratelimit-reset, so
+  concurrent requests wait together instead of each backing off blindly
+- Waiters are served by priority (interactive tailoring before batch work)
+
+Shedding: batch callers are rejected with LLMOverloaded as soon as the
+lane is rate-limited or its queue is long; interactive callers are
+rejected when the queue is full or they wait past LLM_QUEUE_TIMEOUT_S.
+Routes turn LLMOverloaded into 503 + Retry-After.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+from app.services.metrics import (
+    LLM_QUEUE_WAIT_SECONDS,
+    LLM_SCHEDULER_INFLIGHT,
+    LLM_SCHEDULER_LIMIT,
+    LLM_SCHEDULER_QUEUED,
+    LLM_SHED,
+)
+
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "4"))
+MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "100"))
+BATCH_SHED_QUEUE = int(os.getenv("LLM_BATCH_SHED_QUEUE", "10"))
+QUEUE_TIMEOUT_S = float(os.getenv("LLM_QUEUE_TIMEOUT_S", "90"))
+DEFAULT_RPM = int(os.getenv("LLM_RPM", "0"))
+
+CONGESTION_STATUSES = {429, 503, 529}
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class LLMOverloaded(Exception):
+    """The call was shed instead of queued; retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ───────────────────────────────────────────
+# HEADER PARSING
+# ───────────────────────────────────────────
+
+def _header(headers, *names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value:
+            return value
+    return None
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """'1s', '6m0s', '250ms', '20' (seconds) -> seconds."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total, number = 0.0, ""
+    units = {"h": 3600, "m": 60, "s": 1}
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch.isdigit() or ch == ".":
+            number += ch
+        elif value.startswith("ms", i):
+            total += float(number or 0) / 1000
+            number = ""
+            i += 1
+        elif ch in units:
+            total += float(number or 0) * units[ch]
+            number = ""
+        else:
+            return None
+        i += 1
+    return total
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Seconds until the provider accepts requests again, if the headers say."""
+    retry_after = _header(headers, "retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return reset_seconds(headers)
+
+
+def reset_seconds(headers) -> Optional[float]:
+    reset = _header(headers, "x-ratelimit-reset-requests", "x-ratelimit-reset")
+    if not reset:
+        return None
+    try:
+        number = float(reset)
+    except ValueError:
+        return _parse_duration(reset)
+    # OpenRouter sends an epoch timestamp in ms; others send seconds
+    if number > 1e12:
+        return max(0.0, number / 1000 - time.time())
+    if number > 1e9:
+        return max(0.0, number - time.time())
+    return number
+
+
+# ───────────────────────────────────────────
+# LANE
+# ───────────────────────────────────────────
+
+class ModelLane:
+    """Admission state for one (provider, model)."""
+
+    def __init__(self, key: Tuple[str, str]):
+        self.key = key
+        self.label = f"{key[0]}:{key[1]}"
+        self.limit = float(min(INITIAL_CONCURRENCY, MAX_CONCURRENCY))
+        self.in_flight = 0
+        self.blocked_until = 0.0
+
+        self.capacity: Optional[float] = DEFAULT_RPM or None
+        self.tokens: Optional[float] = self.capacity
+        self.refill_per_s: Optional[float] = DEFAULT_RPM / 60 if DEFAULT_RPM else None
+        self._last_refill = time.monotonic()
+
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._publish()
+
+    # --- state -------------------------------------------------------
+
+    def _publish(self):
+        LLM_SCHEDULER_LIMIT.labels(self.label).set(self.limit)
+        LLM_SCHEDULER_INFLIGHT.labels(self.label).set(self.in_flight)
+        LLM_SCHEDULER_QUEUED.labels(self.label).set(len(self._waiters))
+
+    def _refill(self, now: float):
+        if self.tokens is None or not self.refill_per_s:
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.refill_per_s)
+        self._last_refill = now
+
+    def _wait_for_capacity(self, now: float) -> float:
+        """0 if a call may start now, else seconds until that could change (inf = on release)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens is not None and self.tokens < 1:
+            return (1 - self.tokens) / self.refill_per_s if self.refill_per_s else 1.0
+        if self.in_flight >= max(1, int(self.limit)):
+            return float("inf")
+        return 0.0
+
+    def _start(self):
+        self.in_flight += 1
+        if self.tokens is not None:
+            self.tokens -= 1
+
+    def _dispatch(self):
+        self._timer = None
+        now = time.monotonic()
+        while self._waiters:
+            delay = self._wait_for_capacity(now)
+            if delay > 0:
+                if delay != float("inf"):
+                    loop = asyncio.get_running_loop()
+                    self._timer = loop.call_later(delay, self._dispatch)
+                break
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  # timed out / cancelled while queued
+                continue
+            self._start()
+            future.set_result(None)
+        self._publish()
+
+    # --- public ------------------------------------------------------
+
+    async def acquire(self, priority: Priority, timeout: float = QUEUE_TIMEOUT_S):
+        now = time.monotonic()
+        blocked_for = self.blocked_until - now
+
+        if priority >= Priority.BATCH and (blocked_for > 0 or len(self._waiters) >= BATCH_SHED_QUEUE):
+            LLM_SHED.labels(self.label, priority.name.lower(), "batch_pressure").inc()
+            raise LLMOverloaded(
+                f"{self.label} is rate limited or busy; batch call shed",
+                retry_after=max(blocked_for, 1.0),
+            )
+        if len(self._waiters) >= MAX_QUEUE:
+            LLM_SHED.labels(self.label, priority.name.lower(), "queue_full").inc()
+            raise LLMOverloaded(f"{self.label} queue is full", retry_after=max(blocked_for, 5.0))
+
+        if not self._waiters and self._wait_for_capacity(now) == 0:
+            self._start()
+            self._publish()
+            LLM_QUEUE_WAIT_SECONDS.labels(self.label, priority.name.lower()).observe(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        if self._timer is None:
+            self._dispatch()
+        else:
+            self._publish()
+
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._publish()
+            LLM_SHED.labels(self.label, priority.name.lower(), "queue_timeout").inc()
+            raise LLMOverloaded(
+                f"Waited {timeout:.0f}s for an LLM slot on {self.label}",
+                retry_after=max(self.blocked_until - time.monotonic(), 5.0),
+            )
+        LLM_QUEUE_WAIT_SECONDS.labels(self.label, priority.name.lower()).observe(
+            time.monotonic() - now
+        )
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        self._dispatch()
+
+    def observe(self, status_code: Optional[int], headers=None, attempt: int = 0):
+        """Feed a response (or None for a transport error) back into the window."""
+        headers = headers or {}
+        self._learn_bucket(headers)
+
+        if status_code in CONGESTION_STATUSES:
+            self.limit = max(1.0, self.limit / 2)
+            delay = retry_after_seconds(headers)
+            if delay is None:
+                delay = (2**attempt) + 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        elif status_code is not None and status_code < 500:
+            self.limit = min(float(MAX_CONCURRENCY), self.limit + 1 / self.limit)
+        self._publish()
+
+    def _learn_bucket(self, headers):
+        limit = _header(headers, "x-ratelimit-limit-requests", "x-ratelimit-limit")
+        remaining = _header(headers, "x-ratelimit-remaining-requests", "x-ratelimit-remaining")
+        if not limit or remaining is None:
+            return
+        try:
+            capacity, left = float(limit), float(remaining)
+        except ValueError:
+            return
+        # Refill so the bucket is full again when the provider's window resets
+        window = reset_seconds(headers) or 60.0
+        self.capacity = capacity
+        self.tokens = min(capacity, left)
+        self.refill_per_s = max(capacity - left, 1.0) / max(window, 1.0)
+        self._last_refill = time.monotonic()
+
+
+# ───────────────────────────────────────────
+# SCHEDULER
+# ───────────────────────────────────────────
+
+class LLMScheduler:
+    def __init__(self):
+        self._lanes: Dict[Tuple[str, str], ModelLane] = {}
+
+    def lane(self, provider: str, model_id: str) -> ModelLane:
+        key = (provider, model_id)
+        if key not in self._lanes:
+            self._lanes[key] = ModelLane(key)
+        return self._lanes[key]
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model_id: str, priority: Priority = Priority.INTERACTIVE):
+        """Hold one concurrency slot for a single provider attempt."""
+        lane = self.lane(provider, model_id)
+        await lane.acquire(priority)
+        try:
+            yield lane
+        finally:
+            lane.release()
+
+    def snapshot(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        return {
+            lane.label: {
+                "limit": round(lane.limit, 2),
+                "in_flight": lane.in_flight,
+                "queued": len(lane._waiters),
+                "blocked_for_s": round(max(0.0, lane.blocked_until - now), 1),
+                "tokens": None if lane.tokens is None else round(lane.tokens, 1),
+            }
+            for lane in self._lanes.values()
+        }
+
+
+scheduler = LLMScheduler()
@@ -0,0 +1,128 @@
+"""
+LLM Usage - Persist and aggregate per-call token accounting
+
+LLMOrchestrator collects one LLMCallUsage per _call_llm invocation in
+`orchestrator.usage`; routes hand that list to record_llm_usage() once the
+pipeline finishes (successfully or not). aggregate_usage() rolls the rows up
+per step / user / model / tier for tuning LLM_MODELS and max_tokens.
+"""
+
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func
+
+from app.services.database import LLMUsage
+
+
+GROUP_COLUMNS = {
+    "step": LLMUsage.step,
+    "user": LLMUsage.user_id,
+    "model": LLMUsage.model,
+    "tier": LLMUsage.tier,
+    "provider": LLMUsage.provider,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def record_llm_usage(
+    db,
+    records: Iterable[Any],
+    user_id: str,
+    tailored_resume_id: Optional[str] = None,
+) -> int:
+    """
+    Store LLMCallUsage records. Never raises — accounting must not fail a request.
+    Returns the number of rows written.
+    """
+    rows = [
+        LLMUsage(
+            user_id=user_id,
+            tailored_resume_id=str(tailored_resume_id) if tailored_resume_id else None,
+            **asdict(record),
+        )
+        for record in records
+    ]
+    if not rows:
+        return 0
+
+    try:
+        db.add_all(rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Failed to record LLM usage: {e}")
+        return 0
+    return len(rows)
+
+
+def aggregate_usage(
+    db,
+    group_by: str = "step",
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Aggregate token, cost and latency totals, one dict per group value."""
+    if group_by not in GROUP_COLUMNS:
+        raise ValueError(f"group_by must be one of {sorted(GROUP_COLUMNS)}")
+    column = GROUP_COLUMNS[group_by]
+
+    query = db.query(
+        column,
+        func.count(LLMUsage.id),
+        func.sum(LLMUsage.prompt_tokens),
+        func.sum(LLMUsage.completion_tokens),
+        func.sum(LLMUsage.cached_tokens),
+        func.sum(LLMUsage.cost),
+        func.avg(LLMUsage.latency_ms),
+        func.max(LLMUsage.latency_ms),
+        func.avg(LLMUsage.queue_ms),
+        func.avg(case((LLMUsage.ttft_ms > 0, LLMUsage.ttft_ms), else_=None)),
+        func.sum(LLMUsage.retries),
+        func.sum(case((LLMUsage.success.is_(False), 1), else_=0)),
+        func.sum(case((LLMUsage.cache_hit.is_(True), 1), else_=0)),
+        func.sum(LLMUsage.tokens_saved),
+        func.sum(LLMUsage.fallbacks),
+        func.sum(case((LLMUsage.hedged.is_(True), 1), else_=0)),
+    )
+    if user_id:
+        query = query.filter(LLMUsage.user_id == user_id)
+    if since:
+        query = query.filter(LLMUsage.created_at >= since)
+
+    results = []
+    for (
+        key, calls, prompt, completion, cached, cost,
+        avg_latency, max_latency, avg_queue, avg_ttft, retries, errors, cache_hits,
+        tokens_saved, fallbacks, hedged,
+    ) in query.group_by(column).all():
+        prompt = int(prompt or 0)
+        completion = int(completion or 0)
+        results.append(
+            {
+                group_by: key,
+                "calls": calls,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "total_tokens": prompt + completion,
+                "cached_tokens": int(cached or 0),
+                "tokens_saved": int(tokens_saved or 0),
+                "avg_tokens_per_call": round((prompt + completion) / calls, 1) if calls else 0,
+                "cost": round(cost, 6) if cost is not None else None,
+                "avg_latency_ms": round(avg_latency or 0, 1),
+                "max_latency_ms": round(max_latency or 0, 1),
+                "avg_queue_ms": round(avg_queue or 0, 1),
+                "avg_ttft_ms": round(avg_ttft or 0, 1),
+                "retries": int(retries or 0),
+                "errors": int(errors or 0),
+                "cache_hit_rate": round((cache_hits or 0) / calls, 3) if calls else 0,
+                "fallbacks": int(fallbacks or 0),
+                "hedge_rate": round((hedged or 0) / calls, 3) if calls else 0,
+            }
+        )
+
+    results.sort(key=lambda r: r["total_tokens"], reverse=True)
+    return results
@@ -0,0 +1,363 @@
+"""
+Metrics - Prometheus instrumentation for the API, LLM pipeline and workers
+
+Exposed at GET /metrics (OpenMetrics / Prometheus text format):
+- HTTP request latency per route template, method and status
+- LLM call latency, errors, retries and tokens per pipeline step
+- Prompt cache hits / misses per step and provider
+- Streamed completions aborted on invalid JSON, local JSON output repairs
+- LLM scheduler window, in-flight, queue depth, queue wait and shed calls
+- LLM router outcomes per provider, hedged calls and open circuit breakers
+- Step 1 resume parse path (local / gap_fill / llm)
+- ATS analysis, template render and PDF render time
+- DB query time per statement type (SQLAlchemy cursor events)
+- Celery queue depth (read from the Redis broker at scrape time)
+- OpenCode sidecar connectivity
+
+Set PROMETHEUS_MULTIPROC_DIR when running several uvicorn/gunicorn workers
+so every process writes to a shared directory and /metrics aggregates them.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# LLM calls and PDF renders run for seconds, not milliseconds
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 180)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+
+# ───────────────────────────────────────────
+# METRIC DEFINITIONS
+# ───────────────────────────────────────────
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "applymate_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=SLOW_BUCKETS,
+)
+
+LLM_CALL_SECONDS = Histogram(
+    "applymate_llm_call_duration_seconds",
+    "LLM call latency per pipeline step, including retries and backoff",
+    ["step", "tier", "provider"],
+    buckets=SLOW_BUCKETS,
+)
+LLM_CALL_ERRORS = Counter(
+    "applymate_llm_call_errors_total",
+    "LLM calls that raised after exhausting retries",
+    ["step", "provider", "error_type"],
+)
+LLM_RETRIES = Counter(
+    "applymate_llm_retries_total",
+    "Extra LLM attempts (429 backoff, transport errors)",
+    ["step", "provider"],
+)
+LLM_TOKENS = Counter(
+    "applymate_llm_tokens_total",
+    "Tokens reported by the provider (kind=saved: removed by prompt compaction)",
+    ["step", "kind"],
+)
+
+LLM_STREAM_ABORTS = Counter(
+    "applymate_llm_stream_aborts_total",
+    "Streamed completions abandoned early because the JSON became invalid",
+    ["step", "provider"],
+)
+
+LLM_OUTPUT_REPAIRS = Counter(
+    "applymate_llm_output_repairs_total",
+    "Local fixes applied to LLM JSON output (fix=failed: unrepairable)",
+    ["step", "fix"],
+)
+
+LLM_BANNED_WORDS = Counter(
+    "applymate_llm_banned_words_total",
+    "Banned words in step-4 output (outcome=rewritten: outputs fixed locally, kept: words with no plain substitute)",
+    ["step", "outcome"],
+)
+
+LLM_PROMPT_CACHE = Counter(
+    "applymate_llm_prompt_cache_total",
+    "Live provider calls by prompt-cache outcome (hit = provider reported cached prompt tokens)",
+    ["step", "provider", "result"],
+)
+
+LLM_SCHEDULER_LIMIT = Gauge(
+    "applymate_llm_scheduler_concurrency_limit",
+    "Current AIMD concurrency window per provider:model lane",
+    ["lane"],
+    multiprocess_mode="max",
+)
+LLM_SCHEDULER_INFLIGHT = Gauge(
+    "applymate_llm_scheduler_in_flight",
+    "Provider attempts holding a scheduler slot",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+LLM_SCHEDULER_QUEUED = Gauge(
+    "applymate_llm_scheduler_queued",
+    "LLM calls waiting for a scheduler slot",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "applymate_llm_queue_wait_seconds",
+    "Time an LLM attempt waited for a scheduler slot",
+    ["lane", "priority"],
+    buckets=SLOW_BUCKETS,
+)
+LLM_SHED = Counter(
+    "applymate_llm_shed_total",
+    "LLM calls rejected by the scheduler instead of queued",
+    ["lane", "priority", "reason"],
+)
+
+LLM_ROUTE_RESULTS = Counter(
+    "applymate_llm_route_results_total",
+    "Outcome of each provider route tried by the LLM router",
+    ["provider", "outcome"],
+)
+LLM_HEDGES = Counter(
+    "applymate_llm_hedged_total",
+    "LLM calls that fired a hedge request on a second provider",
+    ["step"],
+)
+LLM_BREAKER_OPEN = Gauge(
+    "applymate_llm_breaker_open",
+    "1 while the provider's circuit breaker is open",
+    ["provider"],
+    multiprocess_mode="max",
+)
+
+RESUME_PARSE_PATH = Counter(
+    "applymate_resume_parse_path_total",
+    "How step 1 structured a resume (local parse, LLM gap fill or full LLM extraction)",
+    ["path"],
+)
+
+JOB_ANALYSIS_PATH = Counter(
+    "applymate_job_analysis_path_total",
+    "How step 2 analyzed a job description (local only, LLM verified locally, or LLM only)",
+    ["path"],
+)
+
+JOB_ANALYSIS_CORRECTIONS = Counter(
+    "applymate_job_analysis_corrections_total",
+    "Skills dropped from or added to an LLM job analysis by local verification",
+    ["change"],
+)
+
+RETAILOR_SECTIONS = Counter(
+    "applymate_retailor_sections_total",
+    "Incremental re-tailoring: sections reused or regenerated, and full step-4 fallbacks",
+    ["outcome"],
+)
+
+STEP4_MODE_USED = Counter(
+    "applymate_step4_mode_total",
+    "Step 4 runs by mode (single call or per-section), plus failed section calls",
+    ["mode"],
+)
+
+ATS_ANALYSIS_SECONDS = Histogram(
+    "applymate_ats_analysis_duration_seconds",
+    "ATSAnalyzer.analyze time",
+    buckets=FAST_BUCKETS,
+)
+TEMPLATE_RENDER_SECONDS = Histogram(
+    "applymate_template_render_duration_seconds",
+    "Resume HTML template render time",
+    ["template"],
+    buckets=FAST_BUCKETS,
+)
+PDF_RENDER_SECONDS = Histogram(
+    "applymate_pdf_render_duration_seconds",
+    "HTML/resume to PDF conversion time",
+    ["engine"],
+    buckets=SLOW_BUCKETS,
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "applymate_db_query_duration_seconds",
+    "Database statement time by statement type",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+
+SIDECAR_CONNECTED = Gauge(
+    "applymate_sidecar_connected",
+    "1 if the OpenCode sidecar health check passed on the last probe",
+    multiprocess_mode="max",
+)
+
+
+@contextmanager
+def timed(histogram, *labels):
+    """Observe the wrapped block's wall time on a histogram (labels optional)."""
+    metric = histogram.labels(*labels) if labels else histogram
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric.observe(time.perf_counter() - start)
+
+
+def route_template(scope: dict) -> str:
+    """
+    Route template for an ASGI scope (/api/applications/{application_id}),
+    never the raw path, so label cardinality stays bounded. Routes matched
+    inside an included router only carry their own path, so the router
+    prefix is recovered from the leading segments of the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+
+    path = scope.get("path", "")
+    extra = path.count("/") - template.count("/")
+    if extra <= 0:
+        return template
+    prefix = "/".join(path.split("/")[: extra + 1])
+    return prefix + template
+
+
+# ───────────────────────────────────────────
+# LLM
+# ───────────────────────────────────────────
+
+def observe_llm_call(usage, error_type: Optional[str] = None) -> None:
+    """Record one LLMCallUsage (see llm_orchestrator) on the LLM metrics."""
+    LLM_CALL_SECONDS.labels(usage.step, usage.tier, usage.provider).observe(
+        usage.latency_ms / 1000
+    )
+    if usage.retries:
+        LLM_RETRIES.labels(usage.step, usage.provider).inc(usage.retries)
+    if error_type:
+        LLM_CALL_ERRORS.labels(usage.step, usage.provider, error_type).inc()
+    if usage.prompt_tokens:
+        LLM_TOKENS.labels(usage.step, "prompt").inc(usage.prompt_tokens)
+    if usage.completion_tokens:
+        LLM_TOKENS.labels(usage.step, "completion").inc(usage.completion_tokens)
+    if usage.cached_tokens:
+        LLM_TOKENS.labels(usage.step, "cached").inc(usage.cached_tokens)
+    if usage.success and usage.provider in ("openrouter", "gemini"):
+        LLM_PROMPT_CACHE.labels(
+            usage.step, usage.provider, "hit" if usage.cache_hit else "miss"
+        ).inc()
+    if usage.tokens_saved:
+        LLM_TOKENS.labels(usage.step, "saved").inc(usage.tokens_saved)
+
+
+# ───────────────────────────────────────────
+# DATABASE
+# ───────────────────────────────────────────
+
+def instrument_engine(engine) -> None:
+    """Time every statement executed on a SQLAlchemy engine."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("_metrics_start")
+        if not starts:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        DB_QUERY_SECONDS.labels(operation).observe(time.perf_counter() - starts.pop())
+
+
+# ───────────────────────────────────────────
+# CELERY QUEUE DEPTH
+# ───────────────────────────────────────────
+
+class CeleryQueueCollector:
+    """Reads queue lengths from the Redis broker on each scrape."""
+
+    def __init__(self, broker_url: str, queues: Iterable[str] = ("celery",)):
+        self.broker_url = broker_url
+        self.queues = list(queues)
+        self._client = None
+
+    def _redis(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(
+                self.broker_url, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+        return self._client
+
+    @staticmethod
+    def _family() -> GaugeMetricFamily:
+        return GaugeMetricFamily(
+            "applymate_celery_queue_depth",
+            "Messages waiting in the Celery broker queue",
+            labels=["queue"],
+        )
+
+    def describe(self):
+        # Without describe(), registering calls collect(): a redis import and a
+        # broker round trip during app startup
+        yield self._family()
+
+    def collect(self):
+        family = self._family()
+        try:
+            client = self._redis()
+            for queue in self.queues:
+                family.add_metric([queue], client.llen(queue))
+        except Exception as e:
+            logger.debug(f"celery queue depth unavailable: {e}")
+            return
+        yield family
+
+
+_queue_collector: Optional[CeleryQueueCollector] = None
+
+
+def register_celery_queue_collector(broker_url: Optional[str] = None, queues: Iterable[str] = ("celery",)) -> None:
+    """Register the broker queue collector once (no-op for non-Redis brokers)."""
+    global _queue_collector
+    broker_url = broker_url or os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+    if _queue_collector is not None or not broker_url.startswith(("redis://", "rediss://")):
+        return
+    _queue_collector = CeleryQueueCollector(broker_url, queues)
+    REGISTRY.register(_queue_collector)
+
+
+# ───────────────────────────────────────────
+# EXPOSITION
+# ───────────────────────────────────────────
+
+def render_metrics() -> tuple[bytes, str]:
+    """Serialize all metrics. Aggregates worker processes in multiprocess mode."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        if _queue_collector is not None:
+            registry.register(_queue_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
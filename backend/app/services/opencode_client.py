@@ -3,7 +3,7 @@
 import os
 import uuid
 
-import httpx
+from app.services.tracing import httpx_inject_hook
 
 SIDECAR_URL = os.getenv("SIDECAR_URL", "http://localhost:4197")
 HTTP_TIMEOUT = 10.0
@@ -11,8 +11,12 @@ HTTP_TIMEOUT = 10.0
 
 class OpencodeClient:
     def __init__(self, base_url: str = SIDECAR_URL):
+        import httpx
+
         self.base_url = base_url.rstrip("/")
-        self._client = httpx.AsyncClient(timeout=HTTP_TIMEOUT)
+        self._client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT, event_hooks={"request": [httpx_inject_hook]}
+        )
 
     async def trigger_mode(self, mode: str, args: dict | None = None) -> str:
         payload = {"mode": mode, "args": args or {}}
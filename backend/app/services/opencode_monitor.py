@@ -6,6 +6,8 @@ Placeholder for Wave 3. Full implementation in Wave 5.
 import asyncio
 import logging
 
+from app.services.metrics import SIDECAR_CONNECTED
+
 logger = logging.getLogger(__name__)
 
 _sidecar_connected = False
@@ -37,4 +39,5 @@ async def monitor_sidecar(sidecar_url: str = "http://localhost:4197", interval:
                     logger.warning(f"sidecar disconnected: {e}")
                 _sidecar_connected = False
 
+            SIDECAR_CONNECTED.set(1 if _sidecar_connected else 0)
             await asyncio.sleep(interval)
@@ -3,13 +3,40 @@ PDF Generator - Convert HTML resumes to PDF using WeasyPrint
 Properly preserves formatting and styles
 """
 
+import html as html_lib
+import logging
 import os
 import io
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 
 from app.services.resume_schema import TailoredResumeSchema
 from app.services.resume_templates import render_resume
+from app.services.metrics import PDF_RENDER_SECONDS, timed
+from app.services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Where generated resume and cover letter PDFs go (backend/app/uploads)
+OUTPUT_DIR = os.getenv(
+    "UPLOAD_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+)
+
+
+@lru_cache(maxsize=1)
+def weasyprint_html():
+    """
+    weasyprint.HTML, or None when WeasyPrint is not installed or its
+    pango/cairo system libraries are missing (OSError). Imported on first use
+    and cached, so a missing WeasyPrint is not re-imported on every render.
+    """
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError) as e:
+        logger.info(f"WeasyPrint unavailable, using fpdf fallback: {e}")
+        return None
+    return HTML
 
 
 class PDFGenerator:
@@ -19,9 +46,7 @@ class PDFGenerator:
     """
 
     def __init__(self, output_dir: Optional[str] = None):
-        self.output_dir = output_dir or os.getenv(
-            "UPLOAD_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
-        )
+        self.output_dir = output_dir or OUTPUT_DIR
         os.makedirs(self.output_dir, exist_ok=True)
 
     def generate(
@@ -39,14 +64,13 @@ class PDFGenerator:
         """
         html = render_resume(resume, resume.template_used)
 
-        try:
-            from weasyprint import HTML, CSS
-
-            pdf_bytes = HTML(string=html).write_pdf()
-        except ImportError:
-            from fpdf import FPDF
-
-            pdf_bytes = self._fallback_generate(resume)
+        HTML = weasyprint_html()
+        if HTML is not None:
+            with span("pdf.render", engine="weasyprint"), timed(PDF_RENDER_SECONDS, "weasyprint"):
+                pdf_bytes = HTML(string=html).write_pdf()
+        else:
+            with span("pdf.render", engine="fpdf"), timed(PDF_RENDER_SECONDS, "fpdf"):
+                pdf_bytes = self._fallback_generate(resume)
 
         if filename:
             filepath = os.path.join(self.output_dir, f"{filename}.pdf")
@@ -60,14 +84,65 @@ class PDFGenerator:
         """Generate PDF and return as bytes only"""
         html = render_resume(resume, resume.template_used)
 
-        try:
-            from weasyprint import HTML
+        HTML = weasyprint_html()
+        if HTML is not None:
+            with span("pdf.render", engine="weasyprint"), timed(PDF_RENDER_SECONDS, "weasyprint"):
+                return HTML(string=html).write_pdf()
+        with span("pdf.render", engine="fpdf"), timed(PDF_RENDER_SECONDS, "fpdf"):
+            return self._fallback_generate(resume)
 
-            return HTML(string=html).write_pdf()
-        except ImportError:
+    def generate_cover_letter(
+        self, text: str, name: str = "", filename: Optional[str] = None
+    ) -> tuple[bytes, str]:
+        """
+        Cover letter PDF: one paragraph per blank-line separated block.
+        Returns (PDF bytes, full path, or "" without a filename).
+        """
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+        escaped = [html_lib.escape(p).replace("\n", "<br>") for p in paragraphs]
+        body = "".join(f"<p>{p}</p>" for p in escaped)
+        document = f"""<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; font-size: 11pt; }}
+        .name {{ font-size: 16pt; font-weight: bold; margin-bottom: 24px; }}
+        p {{ margin: 0 0 14px 0; }}
+    </style>
+</head>
+<body>
+    <div class="name">{html_lib.escape(name)}</div>
+    {body}
+</body>
+</html>
+"""
+        HTML = weasyprint_html()
+        if HTML is not None:
+            with span("pdf.render", engine="weasyprint"), timed(PDF_RENDER_SECONDS, "weasyprint"):
+                pdf_bytes = HTML(string=document).write_pdf()
+        else:
             from fpdf import FPDF
 
-            return self._fallback_generate(resume)
+            with span("pdf.render", engine="fpdf"), timed(PDF_RENDER_SECONDS, "fpdf"):
+                pdf = FPDF()
+                pdf.add_page()
+                pdf.set_auto_page_break(auto=True, margin=15)
+                if name:
+                    pdf.set_font("Helvetica", "B", 16)
+                    pdf.cell(0, 10, _latin1(name), ln=True)
+                    pdf.ln(4)
+                pdf.set_font("Helvetica", "", 10)
+                for paragraph in paragraphs:
+                    pdf.multi_cell(0, 5, _latin1(paragraph), new_x="LMARGIN", new_y="NEXT")
+                    pdf.ln(3)
+                pdf_bytes = bytes(pdf.output())
+
+        if filename:
+            filepath = os.path.join(self.output_dir, f"{filename}.pdf")
+            with open(filepath, "wb") as f:
+                f.write(pdf_bytes)
+            return pdf_bytes, filepath
+        return pdf_bytes, ""
 
     def _fallback_generate(self, resume: TailoredResumeSchema) -> bytes:
         """Fallback PDF generation using fpdf2 when WeasyPrint unavailable"""
@@ -91,7 +166,7 @@ class PDFGenerator:
             pdf.set_font("Helvetica", "B", 11)
             pdf.cell(0, 8, "Professional Summary", ln=True)
             pdf.set_font("Helvetica", "", 9)
-            pdf.multi_cell(0, 5, resume.basics.summary)
+            pdf.multi_cell(0, 5, resume.basics.summary, new_x="LMARGIN", new_y="NEXT")
             pdf.ln(5)
 
         if resume.skills:
@@ -100,7 +175,7 @@ class PDFGenerator:
             pdf.set_font("Helvetica", "", 9)
             for skill in resume.skills:
                 skills_text = f"{skill.name}: {', '.join(skill.keywords)}"
-                pdf.multi_cell(0, 5, skills_text)
+                pdf.multi_cell(0, 5, skills_text, new_x="LMARGIN", new_y="NEXT")
             pdf.ln(5)
 
         if resume.work:
@@ -116,7 +191,7 @@ class PDFGenerator:
                 if job.highlights:
                     pdf.set_font("Helvetica", "", 8)
                     for h in job.highlights[:3]:
-                        pdf.multi_cell(0, 4, f"  - {h}")
+                        pdf.multi_cell(0, 4, f"  - {h}", new_x="LMARGIN", new_y="NEXT")
                 pdf.ln(3)
 
         if resume.education:
@@ -152,3 +227,23 @@ def generate_resume_pdf(
     """
     generator = PDFGenerator(output_dir)
     return generator.generate(resume, filename)
+
+
+def generate_cover_letter_pdf(
+    text: str,
+    name: str = "",
+    filename: Optional[str] = None,
+    output_dir: Optional[str] = None,
+) -> tuple[bytes, str]:
+    """Convenience function to render a cover letter PDF (see PDFGenerator.generate_cover_letter)."""
+    return PDFGenerator(output_dir).generate_cover_letter(text, name, filename)
+
+
+def _latin1(text: str) -> str:
+    """fpdf core fonts are Latin-1 only; map typographic punctuation, drop the rest."""
+    text = (
+        text.replace("\u2018", "'").replace("\u2019", "'")
+        .replace("\u201c", '"').replace("\u201d", '"')
+        .replace("\u2013", "-").replace("\u2014", "-")
+    )
+    return text.encode("latin-1", "ignore").decode("latin-1")
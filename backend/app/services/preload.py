@@ -0,0 +1,76 @@
+"""
+Preload - Warm a worker before it serves traffic
+
+Heavy libraries (httpx, BeautifulSoup, fpdf, WeasyPrint, PDF/DOCX readers)
+are imported where they are used rather than at module import, so `import
+app.main` stays cheap. This module pays those imports - plus per-process
+caches such as the embedding model - ahead of the first request.
+
+PRELOAD_MODE:
+- "background" (default): after startup, in a worker thread; the server
+  accepts requests meanwhile.
+- "eager": modules at app import, so `gunicorn --preload` imports them once
+  in the master and forked workers share the pages; caches are warmed
+  before startup completes (the worker is ready only once warm).
+- "off": everything loads on first use.
+
+Profile with `python scripts/profile_imports.py --preload`.
+"""
+
+import importlib
+import logging
+import os
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+PRELOAD_MODE = os.getenv("PRELOAD_MODE", "background").lower()
+
+# Imported lazily by routes/services; missing optional ones are skipped
+HEAVY_MODULES = (
+    "httpx",
+    "bs4",
+    "fpdf",
+    "PyPDF2",
+    "docx",
+)
+
+
+def _timed(timings: Dict[str, float], name: str, load) -> None:
+    start = time.perf_counter()
+    try:
+        load()
+    except Exception as e:  # optional dependency or model missing
+        logger.debug(f"preload {name} skipped: {e}")
+        return
+    timings[name] = round(time.perf_counter() - start, 4)
+
+
+def _warm_embedder() -> None:
+    from app.services.embeddings import get_embedder
+
+    get_embedder().embed("warm up")
+
+
+def _warm_weasyprint() -> None:
+    from app.services.pdf_generator import weasyprint_html
+
+    weasyprint_html()
+
+
+def preload(warm_caches: bool = True) -> Dict[str, float]:
+    """
+    Import HEAVY_MODULES and, with warm_caches, load per-process caches
+    (WeasyPrint, embedding model). Idempotent; returns seconds per item.
+    Leave warm_caches off before a fork - model weights and native
+    library state belong in each worker.
+    """
+    timings: Dict[str, float] = {}
+    for name in HEAVY_MODULES:
+        _timed(timings, name, lambda name=name: importlib.import_module(name))
+    if warm_caches:
+        _timed(timings, "weasyprint", _warm_weasyprint)
+        _timed(timings, "embedder", _warm_embedder)
+    logger.info(f"preloaded {len(timings)} items in {sum(timings.values()):.2f}s: {timings}")
+    return timings
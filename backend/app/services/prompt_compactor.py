@@ -0,0 +1,208 @@
+"""
+Prompt Compactor - Token-budgeted prompt assembly for the LLM pipeline
+
+- estimate_tokens(): local BPE-ish estimate (no tokenizer download)
+- strip_jd_boilerplate(): drops benefits / perks / EEO / how-to-apply
+  sections and legal sentences from raw job descriptions
+- Deduper: lets _resume_to_text skip bullets and skill keywords repeated
+  across roles
+- compact_prompt(): assembles named sections and, if the result exceeds the
+  tier's input budget (LLM_<TIER>_PROMPT_BUDGET), trims optional sections
+  line by line from the end, lowest-value section first. Required sections
+  (system prompt, resume) are never cut.
+
+Every compaction returns a CompactionReport; tokens saved are recorded on
+the call's LLMCallUsage (tokens_saved) and exported as
+applymate_llm_tokens_total{kind="saved"}.
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_BUDGETS = {"cheap": 3000, "standard": 4000, "premium": 6000}
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Section headings whose content never helps tailoring. Only whole, known
+# headings: "Privacy Engineering" or "Diversity Data Analyst" are real sections
+_BOILERPLATE_HEADING_RE = re.compile(
+    r"^(?:benefits|perks|perks\s*(?:&|and)\s*benefits|our benefits|what we offer|"
+    r"what's in it for you|why (?:join|work (?:at|with))\b.*|compensation\s*(?:&|and)\s*benefits|"
+    r"equal (?:employment )?opportunity(?: employer| statement| policy)?|eeo(?: statement| policy)?|"
+    r"(?:our commitment to )?diversity,?\s*(?:(?:&|and)\s*)?(?:equity,?\s*(?:(?:&|and)\s*)?)?inclusion(?: statement)?|"
+    r"inclusion\s*(?:&|and)\s*diversity|dei(?: statement)?|"
+    r"how to apply|application process|"
+    r"(?:(?:applicant|candidate|data) )?privacy (?:notice|policy|statement)|"
+    r"(?:reasonable )?accommodations?(?: for applicants| statement| policy| requests?)?|"
+    r"disclaimer|legal (?:notice|disclaimer)s?)$",
+    re.IGNORECASE,
+)
+_HEADING_RE = re.compile(
+    r"^(?:benefits|perks|perks\s*(?:&|and)\s*benefits|our benefits|what we offer|"
+    r"what's in it for you|why (?:join|work (?:at|with))\b.*|compensation\s*(?:&|and)\s*benefits|"
+    r"equal (?:employment )?opportunity.*|eeo\b.*|diversity.*|inclusion.*|"
+    r"how to apply|application process|privacy.*|accommodations?\b.*|disclaimer|legal)$",
+    re.IGNORECASE,
+)
+_HEADING_RE = re.compile(r"^(?:#{1,6}\s*|\*\*)?([A-Za-z][\w &/,'’.-]{1,58}?)(?:\*\*)?\s*:?\s*(?:\*\*)?$")
+_LEGAL_LINE_RE = re.compile(
+    r"equal opportunity employer|without regard to|reasonable accommodation|e-verify|"
+    r"protected veteran|sexual orientation|gender identity|national origin|"
+    r"pay transparency|applicants with disabilities|we are an equal",
+    re.IGNORECASE,
+)
+
+
+# ───────────────────────────────────────────
+# ESTIMATION
+# ───────────────────────────────────────────
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count: one per punctuation mark, roughly one per
+    6 letters of a word and per 3 digits. Within ~10% of cl100k on resumes/JDs.
+    """
+    if not text:
+        return 0
+    total = 0
+    for piece in _PIECE_RE.findall(text):
+        if piece[0].isalpha():
+            total += math.ceil(len(piece) / 6)
+        elif piece[0].isdigit():
+            total += math.ceil(len(piece) / 3)
+        else:
+            total += 1
+    return total
+
+
+def token_budget(tier: str) -> int:
+    """Input token budget for a ModelTier value ("cheap", "standard", "premium")."""
+    return int(os.getenv(f"LLM_{tier.upper()}_PROMPT_BUDGET", DEFAULT_BUDGETS.get(tier, 4000)))
+
+
+# ───────────────────────────────────────────
+# CLEANUP PASSES
+# ───────────────────────────────────────────
+
+def normalize_whitespace(text: str) -> str:
+    """Strip trailing spaces and collapse runs of blank lines."""
+    lines = [line.rstrip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _heading(line: str) -> Optional[str]:
+    stripped = line.strip()
+    if not stripped or (stripped.startswith(("-", "*", "•")) and not stripped.startswith("**")):
+        return None
+    match = _HEADING_RE.match(stripped)
+    return match.group(1).strip() if match else None
+
+
+def strip_jd_boilerplate(text: str) -> str:
+    """Remove benefits / EEO / application-process sections and legal sentences."""
+    kept = []
+    skipping = False
+    for line in text.splitlines():
+        heading = _heading(line)
+        if heading is not None:
+            skipping = bool(_BOILERPLATE_HEADING_RE.match(heading))
+            if skipping:
+                continue
+        if skipping or _LEGAL_LINE_RE.search(line):
+            continue
+        kept.append(line)
+    return normalize_whitespace("\n".join(kept))
+
+
+class Deduper:
+    """Remembers normalized strings; first() is True only the first time one is seen."""
+
+    def __init__(self, min_length: int = 3):
+        self.min_length = min_length
+        self._seen = set()
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return re.sub(r"[\W_]+", " ", text.lower()).strip()
+
+    def first(self, text: str) -> bool:
+        key = self._key(text)
+        if len(key) < self.min_length:
+            return True
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+
+# ───────────────────────────────────────────
+# BUDGETING
+# ───────────────────────────────────────────
+
+@dataclass
+class PromptSection:
+    """A named block of prompt text. trim_priority None = required; lower = trimmed first."""
+
+    name: str
+    text: str
+    trim_priority: Optional[int] = None
+
+
+@dataclass
+class CompactionReport:
+    original_tokens: int
+    compacted_tokens: int
+    budget: int
+    over_budget: bool = False
+    actions: List[str] = field(default_factory=list)
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.original_tokens - self.compacted_tokens)
+
+
+def _trim_lines(text: str, tokens_to_cut: int) -> Tuple[str, int]:
+    lines = text.splitlines()
+    cut = 0
+    while lines and cut < tokens_to_cut:
+        cut += estimate_tokens(lines.pop())
+    return "\n".join(lines), cut
+
+
+def compact_prompt(
+    sections: List[PromptSection],
+    tier: str,
+    original_tokens: Optional[int] = None,
+) -> Tuple[Dict[str, str], CompactionReport]:
+    """
+    Fit sections into the tier's budget. `original_tokens` is the size of the
+    uncompacted prompt (for reporting); defaults to the sections as given.
+    Returns {section name: text} and the report.
+    """
+    budget = token_budget(tier)
+    texts = {s.name: normalize_whitespace(s.text) for s in sections}
+    sizes = {name: estimate_tokens(text) for name, text in texts.items()}
+    total = sum(sizes.values())
+    report = CompactionReport(
+        original_tokens=original_tokens if original_tokens is not None else total,
+        compacted_tokens=total,
+        budget=budget,
+    )
+
+    optional = sorted(
+        (s for s in sections if s.trim_priority is not None), key=lambda s: s.trim_priority
+    )
+    for section in optional:
+        if total <= budget:
+            break
+        texts[section.name], cut = _trim_lines(texts[section.name], total - budget)
+        total -= min(cut, sizes[section.name])
+        report.actions.append(f"trimmed {section.name} by ~{cut} tokens")
+
+    report.compacted_tokens = sum(estimate_tokens(text) for text in texts.values())
+    report.over_budget = report.compacted_tokens > budget
+    return texts, report
@@ -7,13 +7,20 @@ Inspired by career-ops prompting patterns:
 - NEVER invent skills — only reword existing with JD vocabulary
 - JSON schema mode for guaranteed valid outputs
 - Retry loop with LLM feedback
+- Prompts compiled once per process and versioned by content hash (PromptRegistry)
 """
 
-import json
+import hashlib
+import os
 import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 
+from app.services.json_repair import JSONRepairError, repair_json
+from app.services.prompt_compactor import estimate_tokens
+
 
 # ───────────────────────────────────────────
 # BANNED WORDS — AI-slop phrases to remove
@@ -129,9 +136,9 @@ OPENROUTER_JSON_MODE = {
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
 
-def _load_prompt(filename: str, **kwargs) -> str:
+def _load_prompt(filename: str, prompts_dir: Path = PROMPTS_DIR, **kwargs) -> str:
     """Load prompt from markdown file and format with kwargs."""
-    prompt_path = PROMPTS_DIR / filename
+    prompt_path = prompts_dir / filename
     with open(prompt_path, "r", encoding="utf-8") as f:
         template = f.read()
     if kwargs:
@@ -151,8 +158,25 @@ def build_system_prompt(
     include_content_rules: bool = True,
     include_keyword_rules: bool = False,
 ) -> str:
-    """Build a structured system prompt combining reusable rule blocks."""
-
+    """Build a structured system prompt combining reusable rule blocks (compiled once per variant)."""
+    return registry.system_prompt(
+        role,
+        task_specific_rules,
+        include_tone=include_tone,
+        include_bullet_rules=include_bullet_rules,
+        include_content_rules=include_content_rules,
+        include_keyword_rules=include_keyword_rules,
+    ).text
+
+
+def _assemble_system_prompt(
+    role: str,
+    task_specific_rules: str,
+    include_tone: bool,
+    include_bullet_rules: bool,
+    include_content_rules: bool,
+    include_keyword_rules: bool,
+) -> str:
     parts = [f"You are an expert {role}."]
 
     if include_tone:
@@ -176,6 +200,214 @@ def build_system_prompt(
     return "\n\n".join(parts)
 
 
+# ───────────────────────────────────────────
+# BANNED WORD MATCHER
+# ───────────────────────────────────────────
+
+# Banned verbs are listed in the past tense; their other forms read just as badly
+BANNED_WORD_FORMS: Dict[str, Tuple[str, ...]] = {
+    "spearheaded": ("spearhead", "spearheads", "spearheading"),
+    "leveraged": ("leverage", "leverages", "leveraging"),
+    "optimized": ("optimize", "optimizes", "optimizing"),
+    "championed": ("champions", "championing"),
+    "empowered": ("empower", "empowers", "empowering"),
+    "facilitated": ("facilitate", "facilitates", "facilitating"),
+    "synergy": ("synergies",),
+    "game-changer": ("game-changers",),
+    "thought leader": ("thought leaders",),
+    "deep dive": ("deep dives",),
+}
+
+# Plain substitutes that keep the sentence intact (keys normalised: lower
+# case, hyphens as spaces). Anything else still needs the LLM to rephrase.
+BANNED_WORD_REPLACEMENTS: Dict[str, str] = {
+    "spearheaded": "led",
+    "spearhead": "lead",
+    "spearheads": "leads",
+    "spearheading": "leading",
+    "leveraged": "used",
+    "leverage": "use",
+    "leverages": "uses",
+    "leveraging": "using",
+    "optimized": "improved",
+    "optimize": "improve",
+    "optimizes": "improves",
+    "optimizing": "improving",
+    "empowered": "enabled",
+    "empower": "enable",
+    "empowers": "enables",
+    "empowering": "enabling",
+    "drove": "led",
+    "cutting edge": "modern",
+    "extensive experience": "experience",
+    "passionate about": "focused on",
+}
+
+# JSON keys of prose in tailored output; names, URLs, dates and skill
+# keywords are never rewritten
+BANNED_WORD_FIELDS = frozenset({"summary", "highlights", "description"})
+
+
+def _normalise(phrase: str) -> str:
+    return re.sub(r"[\s-]+", " ", phrase.lower()).strip()
+
+
+def _trie_pattern(phrases: List[str]) -> str:
+    """
+    Regex alternation of normalised phrases, factored by common prefix so the
+    engine tests one character per position instead of every phrase in turn.
+    A space matches any run of whitespace or hyphens.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [
+            (r"[\s-]+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Phrase may end here; greedy, so the longer form wins
+            return (body if len(branches) > 1 else f"(?:{body})") + "?"
+        return body
+
+    return build(trie)
+
+
+@dataclass(frozen=True)
+class BannedWordMatch:
+    word: str  # BANNED_WORDS entry
+    text: str  # as written in the output
+    start: int
+    end: int
+
+
+class BannedWordMatcher:
+    """
+    All banned words (and their forms) in one compiled pattern, so a scan is
+    a single pass over the text. Matches whole words only ("drove" does not
+    hit "drover"); hyphens and whitespace inside a phrase are interchangeable.
+    """
+
+    def __init__(
+        self,
+        words: List[str] = BANNED_WORDS,
+        forms: Dict[str, Tuple[str, ...]] = BANNED_WORD_FORMS,
+        replacements: Dict[str, str] = BANNED_WORD_REPLACEMENTS,
+    ):
+        self._entry: Dict[str, str] = {}
+        for word in words:
+            for form in (word, *forms.get(word, ())):
+                self._entry.setdefault(_normalise(form), word)
+        self.replacements = {_normalise(k): v for k, v in replacements.items()}
+        self.pattern = re.compile(
+            rf"(?<![A-Za-z0-9])(?:{_trie_pattern(list(self._entry))})(?![A-Za-z0-9])",
+            re.IGNORECASE,
+        )
+        # Upper bound on a match's length (phrases may use runs of whitespace)
+        self.max_len = max((len(v) for v in self._entry), default=0) * 2
+
+    def _word(self, matched: str) -> str:
+        lowered = matched.lower()
+        return self._entry.get(lowered) or self._entry[_normalise(lowered)]
+
+    def _match(self, m: "re.Match", offset: int = 0) -> BannedWordMatch:
+        return BannedWordMatch(
+            word=self._word(m.group(0)),
+            text=m.group(0),
+            start=m.start() + offset,
+            end=m.end() + offset,
+        )
+
+    def find(self, text: str) -> List[BannedWordMatch]:
+        return [self._match(m) for m in self.pattern.finditer(text)]
+
+    def rewrite(self, text: str) -> Tuple[str, List[BannedWordMatch]]:
+        """
+        Replace banned words that have a plain substitute (keeping
+        capitalisation). Returns the new text and the matches left for the
+        LLM, with positions in the new text.
+        """
+        parts: List[str] = []
+        remaining: List[BannedWordMatch] = []
+        last = 0
+        length = 0
+        for m in self.pattern.finditer(text):
+            before = text[last:m.start()]
+            parts.append(before)
+            length += len(before)
+            replacement = self.replacements.get(_normalise(m.group(0)))
+            if replacement is None:
+                replacement = m.group(0)
+                remaining.append(self._match(m, length - m.start()))
+            elif m.group(0)[:1].isupper():
+                replacement = replacement[:1].upper() + replacement[1:]
+            parts.append(replacement)
+            length += len(replacement)
+            last = m.end()
+        parts.append(text[last:])
+        return "".join(parts), remaining
+
+    def stream(self) -> "BannedWordStream":
+        return BannedWordStream(self)
+
+
+class BannedWordStream:
+    """
+    Incremental scan of streamed output: feed() each chunk and get the matches
+    that are settled so far, with positions in the whole output. Only a tail
+    of max_len characters is rescanned, so a word split across chunks is
+    still found exactly once.
+    """
+
+    def __init__(self, matcher: BannedWordMatcher):
+        self.matcher = matcher
+        self._buffer = ""
+        self._offset = 0  # position of _buffer[0] in the whole output
+        self._reported = 0  # matches starting before this were already returned
+
+    def feed(self, chunk: str, final: bool = False) -> List[BannedWordMatch]:
+        self._buffer += chunk
+        found: List[BannedWordMatch] = []
+        # A match is settled once every character it could still grow into has arrived
+        unsettled = len(self._buffer) if final else len(self._buffer) - self.matcher.max_len
+        keep_from = max(unsettled, 0)
+        for m in self.matcher.pattern.finditer(self._buffer):
+            if m.start() >= unsettled:
+                keep_from = min(keep_from, m.start())
+                break
+            if m.start() + self._offset >= self._reported:
+                found.append(self.matcher._match(m, self._offset))
+                self._reported = m.end() + self._offset
+        # One character before the tail is kept for the word-boundary check
+        keep_from = max(keep_from - 1, 0)
+        self._buffer = self._buffer[keep_from:]
+        self._offset += keep_from
+        return found
+
+    def close(self) -> List[BannedWordMatch]:
+        return self.feed("", final=True)
+
+    def pending(self) -> List[BannedWordMatch]:
+        """Matches in the unsettled tail, not yet returned by feed()."""
+        return [
+            self.matcher._match(m, self._offset)
+            for m in self.matcher.pattern.finditer(self._buffer)
+            if m.start() + self._offset >= self._reported
+        ]
+
+
+banned_word_matcher = BannedWordMatcher()
+
+
 # ───────────────────────────────────────────
 # OUTPUT VALIDATOR
 # ───────────────────────────────────────────
@@ -185,46 +417,65 @@ class OutputValidator:
 
     @staticmethod
     def extract_json(raw_response: str) -> Optional[str]:
-        """Extract JSON from LLM response, handling markdown and malformed output."""
-        text = raw_response.strip()
+        """Extract JSON from LLM response, handling markdown and malformed output.
 
-        # Remove markdown code blocks
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-
-        text = text.strip()
-
-        # Try direct parse first
+        Fixable output (trailing commas, truncation, unquoted keys...) is
+        repaired locally; None means only a retry with build_feedback can help.
+        """
         try:
-            json.loads(text)
-            return text
-        except json.JSONDecodeError:
-            pass
-
-        # Try regex extraction
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if match:
-            try:
-                json.loads(match.group())
-                return match.group()
-            except json.JSONDecodeError:
-                pass
-
-        return None
+            return repair_json(raw_response)[0]
+        except JSONRepairError:
+            return None
 
     @staticmethod
     def validate_no_banned_words(text: str) -> List[str]:
         """Check for banned AI-slop words. Returns list of found banned words."""
-        found = []
-        text_lower = text.lower()
-        for word in BANNED_WORDS:
-            if word.lower() in text_lower:
-                found.append(word)
-        return found
+        return list(dict.fromkeys(m.word for m in banned_word_matcher.find(text)))
+
+    @staticmethod
+    def find_banned_words(text: str) -> List[BannedWordMatch]:
+        """Every banned word occurrence with its position."""
+        return banned_word_matcher.find(text)
+
+    @staticmethod
+    def rewrite_banned_words(text: str) -> Tuple[str, List[str]]:
+        """
+        Substitute banned words that have a plain replacement locally.
+        Returns (new text, banned words still present) — only the latter
+        need build_feedback and an LLM retry.
+        """
+        rewritten, remaining = banned_word_matcher.rewrite(text)
+        return rewritten, list(dict.fromkeys(m.word for m in remaining))
+
+    @staticmethod
+    def rewrite_banned_fields(
+        data: Any, fields: frozenset = BANNED_WORD_FIELDS
+    ) -> Tuple[Any, List[str]]:
+        """
+        rewrite_banned_words over the strings under `fields` keys (at any
+        depth) of parsed JSON output. Returns (data, banned words still
+        present); data is the same object when nothing was rewritten.
+        """
+        remaining: List[str] = []
+
+        def walk(value: Any, prose: bool) -> Any:
+            if isinstance(value, str):
+                if not prose:
+                    return value
+                rewritten, left = banned_word_matcher.rewrite(value)
+                remaining.extend(m.word for m in left)
+                return value if rewritten == value else rewritten
+            if isinstance(value, dict):
+                items = {k: walk(v, prose or k in fields) for k, v in value.items()}
+                changed = any(items[k] is not v for k, v in value.items())
+                return items if changed else value
+            if isinstance(value, list):
+                items = [walk(v, prose) for v in value]
+                changed = any(new is not old for new, old in zip(items, value))
+                return items if changed else value
+            return value
+
+        return walk(data, False), list(dict.fromkeys(remaining))
 
     @staticmethod
     def validate_json_schema(
@@ -269,33 +520,138 @@ class OutputValidator:
 
 
 # ───────────────────────────────────────────
-# STEP 1: STRUCTURE EXTRACTION PROMPT
+# STEP PROMPTS (loaded on first access)
 # ───────────────────────────────────────────
 
-STRUCTURE_EXTRACTION_PROMPT = _load_prompt("structure_extraction.md")
-
-# ───────────────────────────────────────────
-# STEP 2: JOB ANALYSIS PROMPT
-# ───────────────────────────────────────────
-
-JOB_ANALYSIS_PROMPT = _load_prompt("job_analysis.md")
-
-# ───────────────────────────────────────────
-# STEP 3: MATCH CALCULATION PROMPT
-# ───────────────────────────────────────────
+# Module attribute -> (prompt file, format kwargs). Read on first attribute
+# access rather than at import so importing this module touches no files.
+_PROMPT_FILES: Dict[str, Tuple[str, Dict[str, str]]] = {
+    # Step 1: structure extraction
+    "STRUCTURE_EXTRACTION_PROMPT": ("structure_extraction.md", {}),
+    # Step 2: job analysis
+    "JOB_ANALYSIS_PROMPT": ("job_analysis.md", {}),
+    # Step 3: match calculation
+    "MATCH_CALCULATION_PROMPT": ("match_calculation.md", {}),
+    # Step 4: resume tailoring (the money step)
+    "TAILORING_SYSTEM_PROMPT": (
+        "tailoring_system.md",
+        {
+            "TONE_GUIDELINES": TONE_GUIDELINES,
+            "BULLET_FORMAT_RULES": BULLET_FORMAT_RULES,
+            "CONTENT_PRESERVATION_RULES": CONTENT_PRESERVATION_RULES,
+            "KEYWORD_INTEGRATION_RULES": KEYWORD_INTEGRATION_RULES,
+        },
+    ),
+    "TAILORING_USER_MESSAGE": ("tailoring_user.md", {}),
+}
 
-MATCH_CALCULATION_PROMPT = _load_prompt("match_calculation.md")
 
 # ───────────────────────────────────────────
-# STEP 4: RESUME TAILORING PROMPT (THE MONEY STEP)
+# PROMPT REGISTRY
 # ───────────────────────────────────────────
 
-TAILORING_SYSTEM_PROMPT = _load_prompt(
-    "tailoring_system.md",
-    TONE_GUIDELINES=TONE_GUIDELINES,
-    BULLET_FORMAT_RULES=BULLET_FORMAT_RULES,
-    CONTENT_PRESERVATION_RULES=CONTENT_PRESERVATION_RULES,
-    KEYWORD_INTEGRATION_RULES=KEYWORD_INTEGRATION_RULES,
-)
-
-TAILORING_USER_MESSAGE = _load_prompt("tailoring_user.md")
+# Development: recompile file prompts when a file under PROMPTS_DIR changes
+PROMPT_HOT_RELOAD = os.getenv("PROMPT_HOT_RELOAD", "false").lower() == "true"
+
+# System prompt variants kept per process (callers pass constant rule text)
+MAX_PROMPT_VARIANTS = 256
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    name: str
+    text: str
+    version: str  # content hash; changes exactly when the text does
+    tokens: int  # estimate_tokens(text), for prompt budgets
+
+    @property
+    def cache_key(self) -> str:
+        """Stable key for downstream LLM/response caches: name@version."""
+        return f"{self.name}@{self.version}"
+
+
+def compile_prompt(name: str, text: str) -> CompiledPrompt:
+    version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+    return CompiledPrompt(name=name, text=text, version=version, tokens=estimate_tokens(text))
+
+
+class PromptRegistry:
+    """
+    Builds every prompt variant once and serves the compiled result: file
+    prompts by name, system prompts by their build_system_prompt arguments.
+    With hot_reload, a changed prompt file clears the compiled prompts on the
+    next lookup (one stat per file per lookup — development only).
+    """
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR, hot_reload: bool = PROMPT_HOT_RELOAD):
+        self.prompts_dir = prompts_dir
+        self.hot_reload = hot_reload
+        self._lock = threading.Lock()
+        self._compiled: Dict[Any, CompiledPrompt] = {}
+        self._mtimes = self._scan() if hot_reload else {}
+
+    def _scan(self) -> Dict[str, float]:
+        return {path.name: path.stat().st_mtime for path in self.prompts_dir.glob("*.md")}
+
+    def _check_reload(self) -> None:
+        mtimes = self._scan()
+        if mtimes != self._mtimes:
+            with self._lock:
+                self._mtimes = mtimes
+                self._compiled.clear()
+
+    def _lookup(self, key: Any, build) -> CompiledPrompt:
+        if self.hot_reload:
+            self._check_reload()
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = build()
+            with self._lock:
+                if len(self._compiled) < MAX_PROMPT_VARIANTS:
+                    compiled = self._compiled.setdefault(key, compiled)
+        return compiled
+
+    def get(self, name: str) -> CompiledPrompt:
+        """A file prompt from _PROMPT_FILES (KeyError for unknown names)."""
+        filename, kwargs = _PROMPT_FILES[name]
+        return self._lookup(name, lambda: compile_prompt(name, _load_prompt(filename, self.prompts_dir, **kwargs)))
+
+    def system_prompt(
+        self,
+        role: str,
+        task_specific_rules: str,
+        include_tone: bool = True,
+        include_bullet_rules: bool = True,
+        include_content_rules: bool = True,
+        include_keyword_rules: bool = False,
+    ) -> CompiledPrompt:
+        flags = (include_tone, include_bullet_rules, include_content_rules, include_keyword_rules)
+        return self._lookup(
+            ("system", role, task_specific_rules, flags),
+            lambda: compile_prompt(
+                f"system:{role}", _assemble_system_prompt(role, task_specific_rules, *flags)
+            ),
+        )
+
+    def versions(self) -> Dict[str, str]:
+        """Version of every file prompt (compiles any not built yet)."""
+        return {name: self.get(name).version for name in _PROMPT_FILES}
+
+    def reload(self) -> None:
+        """Drop all compiled prompts; the next lookup rebuilds from disk."""
+        with self._lock:
+            self._compiled.clear()
+            if self.hot_reload:
+                self._mtimes = self._scan()
+
+
+registry = PromptRegistry()
+
+
+def __getattr__(name: str) -> str:
+    if name in _PROMPT_FILES:
+        value = registry.get(name).text
+        if not registry.hot_reload:
+            globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
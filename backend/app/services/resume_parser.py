@@ -1,10 +1,17 @@
 """
 Resume Parser Service - Extract and structure resume text into JSON Resume schema
 Handles PDF and DOCX extraction with intelligent section detection
+
+parse_with_confidence() also scores how much of the resume the regexes
+captured (contact details, section coverage, parsed dates, bullets) so the
+LLM pipeline can skip step 1 for well-formatted resumes, or only ask the
+LLM for the sections listed in ParseConfidence.gaps.
 """
 
+import os
 import re
-from typing import Optional, List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 
 from app.services.resume_schema import (
@@ -20,6 +27,46 @@ from app.services.resume_schema import (
 )
 
 
+HIGH_CONFIDENCE = float(os.getenv("RESUME_PARSE_HIGH_CONFIDENCE", "0.8"))
+MEDIUM_CONFIDENCE = float(os.getenv("RESUME_PARSE_MEDIUM_CONFIDENCE", "0.5"))
+
+CONFIDENCE_WEIGHTS = {"contact": 0.2, "coverage": 0.35, "dates": 0.2, "bullets": 0.25}
+
+# Section heading lines -> ResumeSchema field
+HEADING_PATTERNS = {
+    "work": r"(?:professional |work |relevant )?experience|employment(?: history)?|work history|career history",
+    "education": r"education(?: (?:&|and) (?:training|certifications?))?|academic background",
+    "skills": r"(?:technical |core |key )?skills(?: (?:&|and) \w+)?|technologies|tech stack|competencies",
+    "projects": r"(?:personal |selected |key )?projects|portfolio",
+    "certificates": r"certifications?|certificates|licenses(?: (?:&|and) certifications)?|credentials",
+}
+_HEADING_RE = {
+    section: re.compile(rf"^\s*(?:{pattern})\s*:?\s*$", re.IGNORECASE)
+    for section, pattern in HEADING_PATTERNS.items()
+}
+_BULLET_LINE_RE = re.compile(r"^\s*[-•*▪●◦]\s+\S")
+_PARSED_DATE_RE = re.compile(r"^\d{4}-\d{2}$")
+_MONTH_YEAR = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{4}"
+
+
+@dataclass
+class ParseConfidence:
+    """How far a ResumeParser result can be trusted without the LLM."""
+
+    score: float
+    signals: Dict[str, float] = field(default_factory=dict)
+    # ResumeSchema fields the parse probably missed or got wrong
+    gaps: List[str] = field(default_factory=list)
+
+    @property
+    def level(self) -> str:
+        if self.score >= HIGH_CONFIDENCE and not self.gaps:
+            return "high"
+        if self.score >= MEDIUM_CONFIDENCE:
+            return "medium"
+        return "low"
+
+
 class ResumeParser:
     """
     Parse raw resume text into structured JSON Resume format.
@@ -179,7 +226,7 @@ class ResumeParser:
         for pattern in patterns:
             match = re.search(pattern, self.cleaned_text, re.DOTALL | re.IGNORECASE)
             if match:
-                text = match.group(1) if "(" in pattern else match.group(0)
+                text = match.group(1) if match.groups() else match.group(0)
                 text = text.strip()
                 if len(text) > 50 and len(text) < 1000:
                     return text
@@ -202,7 +249,11 @@ class ResumeParser:
         experiences: List[WorkExperience] = []
 
         exp_pattern = r"([A-Z][^0-9\n]+(?:Inc|LLC|Corp|Ltd|Company|Co\.|Technologies|Technologies?|Solutions|Software| Labs?|Studio|Group|Services)?)\s*[\|\n]\s*([^\n]+)\s*[\|\n]\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{4})\s*[-–]\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{4}|Present|Current)"
-        matches = re.finditer(exp_pattern, self.cleaned_text, re.IGNORECASE)
+        # One-line "Company | Position | Jan 2020 - Present" headers first
+        line_pattern = rf"^([^|\n]+?)\s*\|\s*([^|\n]+?)\s*\|\s*({_MONTH_YEAR})\s*[-–]\s*({_MONTH_YEAR}|Present|Current)\s*$"
+        matches = list(re.finditer(line_pattern, self.cleaned_text, re.IGNORECASE | re.MULTILINE))
+        if not matches:
+            matches = re.finditer(exp_pattern, self.cleaned_text, re.IGNORECASE)
 
         for match in matches:
             company = match.group(1).strip()
@@ -253,7 +304,11 @@ class ResumeParser:
         education: List[Education] = []
 
         edu_pattern = r"((?:Bachelor|Master|PhD|B\.S\.|M\.S\.|B\.A\.|M\.A\.|MBA|Associate)[^\n]+)\s*[-–|\n]\s*([^\n]+?)(?:\s*[-–|\n]\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{4}))?"
-        matches = re.finditer(edu_pattern, self.cleaned_text, re.IGNORECASE)
+        # Line-anchored variant, so "Degree - Institution - May 2016" keeps the whole institution
+        line_pattern = rf"^((?:Bachelor|Master|PhD|B\.S\.|M\.S\.|B\.A\.|M\.A\.|MBA|Associate)[^\n]*?)(?:\s+[-–]\s+|\s*[|\n]\s*)([^\n]+?)(?:(?:\s+[-–]\s+|\s*[|,\n]\s*)({_MONTH_YEAR}|\d{{4}}))?\s*$"
+        matches = list(re.finditer(line_pattern, self.cleaned_text, re.IGNORECASE | re.MULTILINE))
+        if not matches:
+            matches = re.finditer(edu_pattern, self.cleaned_text, re.IGNORECASE)
 
         for match in matches:
             degree = match.group(1).strip()
@@ -484,6 +539,88 @@ class ResumeParser:
             certificates=certifications,
         )
 
+    def parse_with_confidence(self) -> Tuple[ResumeSchema, ParseConfidence]:
+        """parse() plus a confidence score for the result."""
+        resume = self.parse()
+        return resume, self.confidence(resume)
+
+    def _detected_sections(self) -> List[str]:
+        """ResumeSchema fields whose section heading appears in the text."""
+        found = []
+        for line in self.cleaned_text.split("\n"):
+            if len(line) > 40:
+                continue
+            for section, pattern in _HEADING_RE.items():
+                if section not in found and pattern.match(line):
+                    found.append(section)
+        return found
+
+    @staticmethod
+    def _plausible_entry(name: Optional[str], detail: Optional[str]) -> bool:
+        """Looks like a real entry rather than a heading, fragment or merged line."""
+        if not name or not detail or not 2 < len(name) <= 80:
+            return False
+        if name[0].islower() or "|" in name or "|" in detail:
+            return False
+        return not any(pattern.match(name) for pattern in _HEADING_RE.values())
+
+    def confidence(self, resume: ResumeSchema) -> ParseConfidence:
+        """
+        Score a parse between 0 and 1 from four signals:
+        - contact: name, email and phone found
+        - coverage: share of detected section headings that produced entries
+        - dates: share of work entries with a parsed start date
+        - bullets: bullet lines in the text that ended up as highlights
+        """
+        basics = resume.basics
+        has_name = bool(basics and basics.name and basics.name != "Candidate")
+        has_email = bool(basics and basics.email)
+        has_phone = bool(basics and basics.phone and len(re.sub(r"\D", "", basics.phone)) >= 10)
+        contact = (has_name + has_email + has_phone) / 3
+
+        # Regex misfires produce entries named after headings or bullet fragments
+        work = [w for w in resume.work if self._plausible_entry(w.name, w.position)]
+        plausible = {
+            "work": work,
+            "education": [e for e in resume.education if self._plausible_entry(e.institution, e.area)],
+            "skills": resume.skills,
+            "projects": [p for p in resume.projects if self._plausible_entry(p.name, p.description)],
+            "certificates": resume.certificates,
+        }
+
+        detected = self._detected_sections()
+        covered = [s for s in detected if plausible[s]]
+        coverage = len(covered) / len(detected) if detected else 0.0
+        dated = sum(1 for w in work if w.start_date and _PARSED_DATE_RE.match(w.start_date))
+        dates = dated / len(work) if work else 0.0
+
+        bullet_lines = sum(1 for line in self.cleaned_text.split("\n") if _BULLET_LINE_RE.match(line))
+        captured = sum(len(w.highlights) for w in work) + sum(
+            1 + len(p.highlights) for p in resume.projects
+        )
+        with_highlights = sum(1 for w in work if w.highlights) / len(work) if work else 0.0
+        bullet_share = min(1.0, captured / bullet_lines) if bullet_lines else 0.5
+        bullets = (bullet_share + with_highlights) / 2
+
+        signals = {
+            "contact": round(contact, 3),
+            "coverage": round(coverage, 3),
+            "dates": round(dates, 3),
+            "bullets": round(bullets, 3),
+        }
+        score = sum(CONFIDENCE_WEIGHTS[name] * value for name, value in signals.items())
+        if resume.work:
+            score *= len(work) / len(resume.work)
+
+        gaps = []
+        if not has_name or not (has_email or has_phone):
+            gaps.append("basics")
+        if not work or len(work) < len(resume.work) or dates < 0.5 or with_highlights < 0.5:
+            gaps.append("work")
+        gaps.extend(s for s in detected if s != "work" and s not in covered)
+
+        return ParseConfidence(score=round(score, 3), signals=signals, gaps=gaps)
+
     def get_all_text(self) -> str:
         """Return cleaned raw text for LLM processing"""
         return self.cleaned_text
@@ -3,6 +3,8 @@ Resume Templates - Factory module
 """
 
 from app.services.resume_schema import TailoredResumeSchema
+from app.services.metrics import TEMPLATE_RENDER_SECONDS, timed
+from app.services.tracing import span
 from app.services.resume_templates.modern_tech import render_modern_tech
 from app.services.resume_templates.clean_professional import render_clean_professional
 from app.services.resume_templates.executive import render_executive
@@ -44,7 +46,10 @@ def render_resume(
         HTML string of the rendered resume
     """
     renderer = get_template_renderer(template_name)
-    return renderer(resume)
+    if template_name not in TEMPLATE_REGISTRY:
+        template_name = "modern_tech"
+    with span("template.render", template=template_name), timed(TEMPLATE_RENDER_SECONDS, template_name):
+        return renderer(resume)
 
 
 def list_templates() -> list[dict]:
@@ -0,0 +1,247 @@
+"""
+Section Tailor - Section-level tailoring and incremental re-tailoring
+
+Step 4 rewrites a whole resume in one premium call. Here a resume is split
+into sections that can be tailored on their own:
+- "summary"                      basics.label and basics.summary
+- "skills"                       all skill groups
+- "work:<company>|<position>|<start>"   one work entry ("#2", "#3"... appended
+                                        when the same job appears again)
+- "projects"                     all projects
+Contact details, education, certificates etc. are never rewritten and are
+copied from the source resume.
+
+Every section gets a fingerprint of its source content plus the part of the
+job it can legitimately use (job terms it already mentions; the title and
+all resume-backed terms for the summary). Fingerprints are stored in the
+tailored resume's meta, so a later run re-tailors only the sections whose
+fingerprint changed and reuses the previous output for the rest.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, Field
+
+from app.services.resume_schema import (
+    JobAnalysis,
+    Project,
+    ResumeBasics,
+    ResumeSchema,
+    Skill,
+    TailoredResumeSchema,
+    WorkExperience,
+)
+
+
+SECTION_META_KEY = "sections"
+
+
+class SummarySection(BaseModel):
+    label: Optional[str] = None
+    summary: str = ""
+
+
+class SkillsSection(BaseModel):
+    skills: List[Skill] = Field(default_factory=list)
+
+
+class ProjectsSection(BaseModel):
+    projects: List[Project] = Field(default_factory=list)
+
+
+# kind -> (output model, JSON shape shown to the model)
+SECTION_KINDS: Dict[str, Tuple[Type[BaseModel], str]] = {
+    "summary": (
+        SummarySection,
+        '{"label": "Job title matching the target role", "summary": "2-3 sentence summary"}',
+    ),
+    "skills": (
+        SkillsSection,
+        '{"skills": [{"name": "Category", "keywords": ["Skill1", "Skill2"]}]}',
+    ),
+    "work": (
+        WorkExperience,
+        '{"name": "Company", "position": "Title", "start_date": "YYYY-MM or null", '
+        '"end_date": "YYYY-MM or null", "summary": "Brief description", "highlights": ["Achievement"]}',
+    ),
+    "projects": (
+        ProjectsSection,
+        '{"projects": [{"name": "Project", "description": "Description", "highlights": ["Feature"], '
+        '"keywords": ["Tech"]}]}',
+    ),
+}
+
+
+# ───────────────────────────────────────────
+# SECTIONS & FINGERPRINTS
+# ───────────────────────────────────────────
+
+def section_kind(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def work_key(entry: WorkExperience) -> str:
+    start = (entry.start_date or "").strip().lower()
+    return f"work:{entry.name.strip().lower()}|{entry.position.strip().lower()}|{start}"
+
+
+def work_keys(work: List[WorkExperience]) -> List[str]:
+    """One unique section key per work entry, in order (repeated stints get a #n suffix)."""
+    keys: List[str] = []
+    seen: Dict[str, int] = {}
+    for entry in work:
+        key = work_key(entry)
+        seen[key] = seen.get(key, 0) + 1
+        keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+    return keys
+
+
+def section_sources(resume: ResumeSchema) -> Dict[str, Any]:
+    """Section key -> the source content that section is tailored from, in resume order."""
+    sources: Dict[str, Any] = {}
+    if resume.basics:
+        sources["summary"] = {
+            "label": resume.basics.label,
+            "summary": resume.basics.summary,
+            # New skills or roles are worth mentioning in the summary
+            "skills": sorted({k for skill in resume.skills for k in skill.keywords}),
+            "roles": [f"{w.position} at {w.name}" for w in resume.work],
+        }
+    if resume.skills:
+        sources["skills"] = [skill.model_dump(mode="json") for skill in resume.skills]
+    for key, entry in zip(work_keys(resume.work), resume.work):
+        sources[key] = entry.model_dump(mode="json")
+    if resume.projects:
+        sources["projects"] = [project.model_dump(mode="json") for project in resume.projects]
+    return sources
+
+
+def job_terms(job: JobAnalysis) -> List[str]:
+    terms = job.required_skills + job.tools_and_technologies + job.preferred_skills + job.ats_keywords
+    return list(dict.fromkeys(t for t in terms if t))
+
+
+def section_fingerprints(resume: ResumeSchema, job: JobAnalysis) -> Dict[str, str]:
+    sources = section_sources(resume)
+    terms = job_terms(job)
+    resume_text = json.dumps(sources, sort_keys=True).lower()
+    fingerprints = {}
+    for key, source in sources.items():
+        if key == "summary":
+            usable = [job.job_title] + [t for t in terms if t.lower() in resume_text]
+        else:
+            text = json.dumps(source, sort_keys=True).lower()
+            usable = [t for t in terms if t.lower() in text]
+        payload = json.dumps([source, usable], sort_keys=True, default=str)
+        fingerprints[key] = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    return fingerprints
+
+
+def previous_sections(previous: Optional[TailoredResumeSchema]) -> Dict[str, Any]:
+    """Tailored output of the previous run per section key (only sections it fingerprinted)."""
+    fingerprints = (previous.meta or {}).get(SECTION_META_KEY) if previous else None
+    if not fingerprints:
+        return {}
+    outputs: Dict[str, Any] = {}
+    if previous.basics:
+        outputs["summary"] = SummarySection(
+            label=previous.basics.label, summary=previous.basics.summary or ""
+        )
+    if previous.skills:
+        outputs["skills"] = SkillsSection(skills=previous.skills)
+    fingerprinted = [key for key in fingerprints if section_kind(key) == "work"]
+    if len(fingerprinted) == len(previous.work):
+        # Tailored entries follow source order; the model may have reworded a company name
+        outputs.update(zip(fingerprinted, previous.work))
+    else:
+        # Tailored entries keep the source company, title and dates (_pinned_work)
+        outputs.update(zip(work_keys(previous.work), previous.work))
+    if previous.projects:
+        outputs["projects"] = ProjectsSection(projects=previous.projects)
+    return outputs
+
+
+def plan_retailoring(
+    resume: ResumeSchema,
+    job: JobAnalysis,
+    previous: Optional[TailoredResumeSchema],
+) -> Tuple[Dict[str, str], List[str], Dict[str, Any]]:
+    """
+    (new fingerprints, section keys to re-tailor, reusable previous outputs).
+    Without fingerprints on the previous run every section is stale.
+    """
+    fingerprints = section_fingerprints(resume, job)
+    old = (previous.meta or {}).get(SECTION_META_KEY, {}) if previous else {}
+    reusable = previous_sections(previous)
+    stale = [
+        key for key, fingerprint in fingerprints.items()
+        if old.get(key) != fingerprint or key not in reusable
+    ]
+    return fingerprints, stale, {k: v for k, v in reusable.items() if k not in stale}
+
+
+# ───────────────────────────────────────────
+# MERGE
+# ───────────────────────────────────────────
+
+def _pinned_work(source: WorkExperience, tailored: WorkExperience) -> WorkExperience:
+    """Company, title and dates always come from the source entry."""
+    return tailored.model_copy(update={
+        "name": source.name,
+        "position": source.position,
+        "start_date": source.start_date,
+        "end_date": source.end_date,
+        "url": source.url,
+        "location": source.location,
+    })
+
+
+def merge_sections(
+    resume: ResumeSchema,
+    outputs: Dict[str, Any],
+    fingerprints: Dict[str, str],
+    base: Optional[TailoredResumeSchema] = None,
+) -> TailoredResumeSchema:
+    """
+    Assemble a tailored resume from per-section outputs; sections without an
+    output keep their source content. Tailoring metadata is copied from
+    `base` (the previous run) when given.
+    """
+    data = resume.model_dump()
+    if base is not None:
+        for field in ("matched_keywords", "missing_keywords", "added_keywords", "optimization_notes"):
+            data[field] = list(getattr(base, field))
+    tailored = TailoredResumeSchema(**data)
+
+    summary = outputs.get("summary")
+    if summary is not None and tailored.basics is not None:
+        tailored.basics = tailored.basics.model_copy(update={
+            "label": summary.label or tailored.basics.label,
+            "summary": summary.summary or tailored.basics.summary,
+        })
+    if outputs.get("skills") is not None and outputs["skills"].skills:
+        tailored.skills = outputs["skills"].skills
+    tailored.work = [
+        _pinned_work(entry, outputs[key]) if key in outputs else entry
+        for key, entry in zip(work_keys(resume.work), resume.work)
+    ]
+    if outputs.get("projects") is not None and outputs["projects"].projects:
+        tailored.projects = outputs["projects"].projects
+
+    tailored.meta = {**(tailored.meta or {}), SECTION_META_KEY: fingerprints}
+    return tailored
+
+
+def section_source_model(resume: ResumeSchema, key: str) -> BaseModel:
+    """The source section as its output model (what the LLM is asked to rewrite)."""
+    kind = section_kind(key)
+    if kind == "summary":
+        basics = resume.basics or ResumeBasics(name="")
+        return SummarySection(label=basics.label, summary=basics.summary or "")
+    if kind == "skills":
+        return SkillsSection(skills=resume.skills)
+    if kind == "projects":
+        return ProjectsSection(projects=resume.projects)
+    return next(entry for k, entry in zip(work_keys(resume.work), resume.work) if k == key)
@@ -0,0 +1,74 @@
+"""
+Serialization - Fast JSON for API responses
+
+FastAPI runs every returned dict through jsonable_encoder (a recursive
+Python walk) and then json.dumps. For large payloads such as a tailored
+resume both steps show up in request latency. Here:
+- dumps(): orjson when installed (stdlib json otherwise), handling Pydantic
+  models, dataclasses, datetimes and UUIDs directly
+- FastJSONResponse: response class rendering with dumps(). Routes that
+  return one directly skip jsonable_encoder; as the app's default response
+  class it speeds up the final encode of every other route
+- to_jsonable(): JSON-ready data from a model or dataclass, with the
+  serializer built once per type (replaces dataclasses.asdict, which
+  deep-copies)
+
+Blob payloads keep their own canonical encoding (blob_store._serialize):
+their hashes must not change with the JSON library.
+"""
+
+import json
+from dataclasses import is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _adapter(cls: type) -> TypeAdapter:
+    return TypeAdapter(cls)
+
+
+def to_jsonable(obj: Any) -> Any:
+    """JSON-ready Python data for a Pydantic model or dataclass instance."""
+    if isinstance(obj, BaseModel):
+        # Pydantic compiles one serializer per model class
+        return obj.model_dump(mode="json")
+    return _adapter(type(obj)).dump_python(obj, mode="json")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel) or is_dataclass(obj):
+        return to_jsonable(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (UUID, Decimal, Path)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
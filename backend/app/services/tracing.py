@@ -0,0 +1,236 @@
+"""
+Tracing - OpenTelemetry spans for the tailoring pipeline
+
+Spans cover each HTTP request, orchestrator step, LLM attempt and backoff
+sleep, ATS analysis, template rendering, PDF generation and DB flushes.
+Context propagates over W3C `traceparent` headers to the OpenCode sidecar
+and through Celery task headers.
+
+Exporters (either or both, enabled by env):
+- TRACE_FILE=/path/spans.jsonl      one JSON span per line
+- OTEL_EXPORTER_OTLP_ENDPOINT=...   OTLP/HTTP to a local collector
+                                    (needs opentelemetry-exporter-otlp-proto-http)
+
+Without opentelemetry-sdk installed, or with no exporter configured, every
+helper here is a no-op.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from opentelemetry import context, propagate, trace
+from opentelemetry.trace import Status, StatusCode
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+except ImportError:  # optional dependency
+    TracerProvider = None
+    SpanExporter = object
+
+try:
+    import fastapi.telemetry  # noqa: F401 — newer FastAPI emits its own server spans
+
+    FASTAPI_NATIVE_TRACING = True
+except ImportError:
+    FASTAPI_NATIVE_TRACING = False
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("applymate")
+
+_configured = False
+
+
+# ───────────────────────────────────────────
+# SETUP
+# ───────────────────────────────────────────
+
+class JsonFileSpanExporter(SpanExporter):
+    """Append finished spans to a JSON-lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans):
+        lines = [s.to_json(indent=None) + "\n" for s in spans]
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except OSError as e:
+            logger.warning(f"trace export to {self.path} failed: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def setup_tracing(service_name: str = "applymate-api") -> bool:
+    """Install the tracer provider once per process. Returns True if spans are exported."""
+    global _configured
+    if _configured:
+        return True
+
+    trace_file = os.getenv("TRACE_FILE")
+    otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or os.getenv(
+        "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"
+    )
+    if not trace_file and not otlp_endpoint:
+        return False
+    if TracerProvider is None:
+        logger.warning("Tracing requested but opentelemetry-sdk is not installed")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create(
+            {"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}
+        )
+    )
+    if trace_file:
+        provider.add_span_processor(BatchSpanProcessor(JsonFileSpanExporter(trace_file)))
+    if otlp_endpoint:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            # Endpoint / headers are read from the standard OTEL_EXPORTER_OTLP_* env vars
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        except ImportError:
+            logger.warning(
+                "OTEL_EXPORTER_OTLP_ENDPOINT set but opentelemetry-exporter-otlp-proto-http is not installed"
+            )
+
+    trace.set_tracer_provider(provider)
+    _configured = True
+    return True
+
+
+# ───────────────────────────────────────────
+# SPANS
+# ───────────────────────────────────────────
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """Start a child span of the current context; exceptions mark it as errored."""
+    with tracer.start_as_current_span(
+        name, attributes={k: v for k, v in attributes.items() if v is not None}
+    ) as current:
+        yield current
+
+
+def traced(name: str):
+    """Decorator form of span() for sync and async functions."""
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ───────────────────────────────────────────
+# PROPAGATION
+# ───────────────────────────────────────────
+
+@contextmanager
+def server_span(name: str, headers):
+    """Root span for an incoming request, continuing the caller's trace if any."""
+    with tracer.start_as_current_span(
+        name, context=propagate.extract(headers), kind=trace.SpanKind.SERVER
+    ) as current:
+        yield current
+
+
+async def httpx_inject_hook(request) -> None:
+    """httpx request event hook: forward the current trace to the callee."""
+    propagate.inject(request.headers)
+
+
+def instrument_session(session_factory) -> None:
+    """One span per ORM flush (INSERT/UPDATE/DELETE batch)."""
+    from sqlalchemy import event
+
+    @event.listens_for(session_factory, "before_flush")
+    def _start_flush_span(session, flush_context, instances):
+        current = tracer.start_span(
+            "db.flush",
+            attributes={
+                "db.new": len(session.new),
+                "db.dirty": len(session.dirty),
+                "db.deleted": len(session.deleted),
+            },
+        )
+        session.info["_flush_span"] = current
+
+    @event.listens_for(session_factory, "after_flush_postexec")
+    def _end_flush_span(session, flush_context):
+        current = session.info.pop("_flush_span", None)
+        if current is not None:
+            current.end()
+
+    @event.listens_for(session_factory, "after_soft_rollback")
+    def _fail_flush_span(session, previous_transaction):
+        current = session.info.pop("_flush_span", None)
+        if current is not None:
+            current.set_status(Status(StatusCode.ERROR, "flush rolled back"))
+            current.end()
+
+
+def instrument_celery() -> None:
+    """Carry trace context from the publisher into the worker's task span."""
+    from celery import signals
+
+    active: Dict[str, tuple] = {}
+
+    @signals.before_task_publish.connect(weak=False)
+    def _inject(headers=None, **kwargs):
+        if headers is not None:
+            propagate.inject(headers)
+
+    @signals.task_prerun.connect(weak=False)
+    def _start(task_id=None, task=None, **kwargs):
+        setup_tracing("applymate-worker")
+        request_headers = getattr(task.request, "headers", None) or {}
+        carrier = {**request_headers, **{k: v for k, v in vars(task.request).items() if isinstance(v, str)}}
+        parent = propagate.extract(carrier)
+        current = tracer.start_span(f"celery.task {task.name}", context=parent)
+        token = context.attach(trace.set_span_in_context(current))
+        active[task_id] = (current, token)
+
+    @signals.task_postrun.connect(weak=False)
+    def _end(task_id=None, state=None, **kwargs):
+        entry = active.pop(task_id, None)
+        if entry is None:
+            return
+        current, token = entry
+        current.set_attribute("celery.state", state or "")
+        if state == "FAILURE":
+            current.set_status(Status(StatusCode.ERROR))
+        context.detach(token)
+        current.end()
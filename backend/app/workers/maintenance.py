@@ -0,0 +1,8 @@
+from celery_app import celery_app
+from app.services.compaction import run_compaction
+
+
+@celery_app.task(time_limit=3600, soft_time_limit=3300)
+def compact_database_task(dry_run: bool = False):
+    """Nightly retention: roll up old events, prune stale rows and files, vacuum."""
+    return run_compaction(dry_run=dry_run)
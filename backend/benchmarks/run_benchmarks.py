@@ -0,0 +1,419 @@
+r"""
+Offline benchmark harness for the resume tailoring pipeline.
+
+Runs against the fixed corpus in benchmarks/corpus with LLM_MOCK_MODE, so no
+network or API key is needed. LLM_MOCK_LATENCY_MS (or --llm-latency-ms)
+adds a simulated provider delay to every LLM call. With --replay-dir the
+pipeline answers from recorded provider responses (see llm_replay) with
+their original latencies instead.
+
+Benchmarks:
+    resume_parser      ResumeParser.parse on each corpus resume
+    full_pipeline      LLMOrchestrator.full_pipeline, one request at a time
+    full_pipeline_xN   N concurrent full_pipeline requests (--concurrency)
+    ats_analyze        ATSAnalyzer.analyze on each resume x job pair
+    render_resume      render_resume for each template
+    pdf_generate       PDFGenerator.generate_to_bytes
+    serialize_std      tailor-v3 response body the old way on a large tailored
+                       resume (model_dump per use, asdict, jsonable_encoder, json)
+    serialize_fast     the same body via app.services.serialization (one dump,
+                       cached serializers, FastJSONResponse)
+
+Reports p50/p95/mean latency, throughput and peak traced memory per
+benchmark. Compares against benchmarks/baseline.json and exits 1 when p50
+latency, p95 latency or peak memory regresses beyond its tolerance (p50 is
+the stable signal; p95 gets a looser bound because tail samples are noisy).
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --iterations 50 --llm-latency-ms 150 --concurrency 8
+    python benchmarks/run_benchmarks.py --update-baseline
+    LLM_REPLAY_MODE=record python benchmarks/run_benchmarks.py --iterations 1 --concurrency 1 --only full_pipeline  # real API
+    python benchmarks/run_benchmarks.py --replay-dir llm_recordings
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# Must be set before the orchestrator reads it on each call
+os.environ["LLM_MOCK_MODE"] = "true"
+
+
+@dataclass
+class BenchResult:
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    throughput_per_s: float
+    peak_mem_kb: float
+
+
+# ───────────────────────────────────────────
+# HELPERS
+# ───────────────────────────────────────────
+
+def load_corpus() -> Dict[str, Dict[str, str]]:
+    corpus = {}
+    for kind in ("resumes", "jobs"):
+        directory = os.path.join(CORPUS_DIR, kind)
+        corpus[kind] = {
+            os.path.splitext(name)[0]: open(os.path.join(directory, name), encoding="utf-8").read()
+            for name in sorted(os.listdir(directory))
+            if name.endswith(".txt")
+        }
+    return corpus
+
+
+def pdf_engine() -> str:
+    """PDF numbers are only comparable between runs using the same engine."""
+    try:
+        import weasyprint  # noqa: F401
+
+        return "weasyprint"
+    except (ImportError, OSError):
+        return "fpdf"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(name: str, samples_ms: List[float], wall_s: float, peak_bytes: int) -> BenchResult:
+    return BenchResult(
+        name=name,
+        iterations=len(samples_ms),
+        p50_ms=round(percentile(samples_ms, 50), 3),
+        p95_ms=round(percentile(samples_ms, 95), 3),
+        mean_ms=round(statistics.fmean(samples_ms), 3),
+        throughput_per_s=round(len(samples_ms) / wall_s, 2) if wall_s else 0.0,
+        peak_mem_kb=round(peak_bytes / 1024, 1),
+    )
+
+
+def peak_memory(fn: Callable[[], None]) -> int:
+    """Peak traced allocation of one extra call (kept out of the timed loop)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name: str, fn: Callable[[], None], iterations: int, warmup: int) -> BenchResult:
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    wall = time.perf_counter() - wall_start
+
+    return summarize(name, samples, wall, peak_memory(fn))
+
+
+def measure_concurrent(name: str, make_coro, iterations: int, concurrency: int, loop) -> BenchResult:
+    """Run `iterations` coroutines with at most `concurrency` in flight."""
+
+    async def run_batch(count: int) -> List[float]:
+        semaphore = asyncio.Semaphore(concurrency)
+        samples: List[float] = []
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                await make_coro()
+                samples.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(one() for _ in range(count)))
+        return samples
+
+    loop.run_until_complete(run_batch(concurrency))  # warmup
+    wall_start = time.perf_counter()
+    samples = loop.run_until_complete(run_batch(iterations))
+    wall = time.perf_counter() - wall_start
+    peak = peak_memory(lambda: loop.run_until_complete(run_batch(concurrency)))
+    return summarize(name, samples, wall, peak)
+
+
+# ───────────────────────────────────────────
+# BENCHMARKS
+# ───────────────────────────────────────────
+
+def large_tailored(tailored):
+    """A tailored resume with 10x the work history and projects (large response payloads)."""
+    return tailored.model_copy(update={
+        "work": [
+            entry.model_copy(update={"highlights": entry.highlights * 3})
+            for entry in tailored.work * 10
+        ],
+        "projects": tailored.projects * 10,
+    })
+
+
+def run_benchmarks(iterations: int, warmup: int, concurrency: int, only: Optional[List[str]] = None) -> List[BenchResult]:
+    from dataclasses import asdict as dataclass_asdict
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.services.ats_analyzer import ATSAnalyzer
+    from app.services.llm_orchestrator import LLMOrchestrator
+    from app.services.pdf_generator import PDFGenerator
+    from app.services.resume_parser import ResumeParser
+    from app.services.resume_templates import TEMPLATE_REGISTRY, render_resume
+    from app.services.serialization import FastJSONResponse, to_jsonable
+
+    corpus = load_corpus()
+    resumes = list(corpus["resumes"].values())
+    jobs = list(corpus["jobs"].values())
+    pairs = list(itertools.product(resumes, jobs))
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    async def pipeline(resume_text: str, job_text: str):
+        orchestrator = LLMOrchestrator(api_key=os.getenv("OPENROUTER_API_KEY", "benchmark"))
+        return await orchestrator.full_pipeline(resume_text, job_text)
+
+    # Pipeline outputs feed the ATS / render / PDF benchmarks
+    outputs = [loop.run_until_complete(pipeline(r, j)) for r, j in pairs]
+    templates = list(TEMPLATE_REGISTRY)
+    pdf_dir = tempfile.mkdtemp(prefix="applymate-bench-")
+
+    resume_cycle = itertools.cycle(resumes)
+    pair_cycle = itertools.cycle(pairs)
+    output_cycle = itertools.cycle(outputs)
+    render_cycle = itertools.cycle(itertools.product(outputs, templates))
+    concurrent_cycle = itertools.cycle(pairs)
+
+    def parse_one():
+        ResumeParser(next(resume_cycle)).parse()
+
+    def pipeline_one():
+        loop.run_until_complete(pipeline(*next(pair_cycle)))
+
+    def ats_one():
+        tailored, job, _ = next(output_cycle)
+        ATSAnalyzer().analyze(tailored, job)
+
+    def render_one():
+        (tailored, _, _), template = next(render_cycle)
+        render_resume(tailored, template)
+
+    generator = PDFGenerator(output_dir=pdf_dir)
+
+    def pdf_one():
+        generator.generate_to_bytes(next(output_cycle)[0])
+
+    payloads = [
+        (large_tailored(tailored), ATSAnalyzer().analyze(tailored, job), match)
+        for tailored, job, match in outputs
+    ]
+    payload_cycle = itertools.cycle(payloads)
+
+    def serialize_std_one():
+        tailored, ats, match = next(payload_cycle)
+        stored = tailored.model_dump(mode="json")  # noqa: F841 — DB copy
+        body = {
+            "tailored_resume": tailored.model_dump(mode="json"),
+            "ats_analysis": dataclass_asdict(ats),
+            "match_score": match.model_dump(),
+        }
+        JSONResponse(jsonable_encoder(body)).body
+
+    def serialize_fast_one():
+        tailored, ats, match = next(payload_cycle)
+        body = {
+            "tailored_resume": tailored.model_dump(mode="json"),
+            "ats_analysis": to_jsonable(ats),
+            "match_score": match.model_dump(mode="json"),
+        }
+        FastJSONResponse(body).body
+
+    benches = [
+        ("resume_parser", lambda: measure("resume_parser", parse_one, iterations, warmup)),
+        ("full_pipeline", lambda: measure("full_pipeline", pipeline_one, iterations, warmup)),
+        ("ats_analyze", lambda: measure("ats_analyze", ats_one, iterations, warmup)),
+        ("render_resume", lambda: measure("render_resume", render_one, iterations, warmup)),
+        ("pdf_generate", lambda: measure("pdf_generate", pdf_one, iterations, warmup)),
+        ("serialize_std", lambda: measure("serialize_std", serialize_std_one, iterations, warmup)),
+        ("serialize_fast", lambda: measure("serialize_fast", serialize_fast_one, iterations, warmup)),
+    ]
+    if concurrency > 1:
+        name = f"full_pipeline_x{concurrency}"
+        benches.insert(
+            2,
+            (
+                name,
+                lambda: measure_concurrent(
+                    name, lambda: pipeline(*next(concurrent_cycle)), iterations, concurrency, loop
+                ),
+            ),
+        )
+
+    results = []
+    try:
+        for name, bench in benches:
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            results.append(bench())
+    finally:
+        loop.close()
+    return results
+
+
+# ───────────────────────────────────────────
+# BASELINE
+# ───────────────────────────────────────────
+
+def compare_to_baseline(
+    results: List[BenchResult],
+    baseline: dict,
+    tolerance: float,
+    p95_tolerance: float,
+    mem_tolerance: float,
+) -> List[str]:
+    regressions = []
+    base = baseline.get("results", {})
+    for result in results:
+        previous = base.get(result.name)
+        if not previous:
+            continue
+        for metric, allowed in (("p50_ms", tolerance), ("p95_ms", p95_tolerance)):
+            current, reference = getattr(result, metric), previous[metric]
+            # Ignore sub-50µs jitter on very fast benchmarks
+            if current > reference * (1 + allowed) and current - reference > 0.05:
+                regressions.append(
+                    f"{result.name}: {metric[:3]} {current:.3f}ms > baseline {reference:.3f}ms (+{allowed:.0%})"
+                )
+        mem_limit = previous["peak_mem_kb"] * (1 + mem_tolerance)
+        if result.peak_mem_kb > mem_limit and result.peak_mem_kb - previous["peak_mem_kb"] > 64:
+            regressions.append(
+                f"{result.name}: peak memory {result.peak_mem_kb:.0f}KB > baseline {previous['peak_mem_kb']:.0f}KB (+{mem_tolerance:.0%})"
+            )
+    return regressions
+
+
+def print_results(results: List[BenchResult], baseline: dict):
+    base = baseline.get("results", {})
+    print(f"\n{'='*60}")
+    print(f"{'benchmark':<22}{'p50 ms':>9}{'p95 ms':>9}{'ops/s':>9}{'peak KB':>10}  vs base p95")
+    print(f"{'-'*60}")
+    for r in results:
+        delta = ""
+        if r.name in base and base[r.name]["p95_ms"]:
+            delta = f"{(r.p95_ms / base[r.name]['p95_ms'] - 1):+.0%}"
+        print(f"{r.name:<22}{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}{r.throughput_per_s:>9.1f}{r.peak_mem_kb:>10.0f}  {delta}")
+    print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the tailoring pipeline")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=4, help="In-flight requests for full_pipeline_xN (1 disables)")
+    parser.add_argument("--llm-latency-ms", type=float, default=None, help="Simulated LLM latency per call (default: LLM_MOCK_LATENCY_MS or 0)")
+    parser.add_argument("--replay-dir", help="Replay recorded LLM responses from this directory")
+    parser.add_argument("--only", nargs="*", help="Run only benchmarks whose name starts with one of these")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed p50 regression (0.5 = +50%%)")
+    parser.add_argument("--p95-tolerance", type=float, default=1.0, help="Allowed p95 regression")
+    parser.add_argument("--mem-tolerance", type=float, default=0.25, help="Allowed peak memory regression")
+    parser.add_argument("--output", help="Also write results JSON here")
+    args = parser.parse_args()
+
+    if args.llm_latency_ms is not None:
+        os.environ["LLM_MOCK_LATENCY_MS"] = str(args.llm_latency_ms)
+    if args.replay_dir:
+        os.environ["LLM_REPLAY_MODE"] = "replay"
+        os.environ["LLM_REPLAY_DIR"] = os.path.abspath(args.replay_dir)
+    elif os.getenv("LLM_REPLAY_MODE") == "record":
+        # Recording needs the real provider
+        os.environ.pop("LLM_MOCK_MODE", None)
+    settings = {
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "llm_latency_ms": float(os.getenv("LLM_MOCK_LATENCY_MS", "0")),
+        "llm_replay": bool(args.replay_dir),
+        "pdf_engine": pdf_engine(),
+    }
+
+    results = run_benchmarks(args.iterations, args.warmup, args.concurrency, args.only)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    payload = {"settings": settings, "results": {r.name: asdict(r) for r in results}}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(payload, f, indent=2)
+
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            # Keep entries for benchmarks skipped with --only
+            payload["results"] = {**previous.get("results", {}), **payload["results"]}
+        with open(args.baseline, "w") as f:
+            json.dump(payload, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not baseline:
+        print("No baseline found — run with --update-baseline to create one")
+        return
+
+    if baseline.get("settings") != settings:
+        print(f"Baseline was recorded with {baseline.get('settings')}, this run used {settings}.")
+        print("Rerun with the same settings or pass --update-baseline.")
+        sys.exit(2)
+
+    regressions = compare_to_baseline(
+        results, baseline, args.tolerance, args.p95_tolerance, args.mem_tolerance
+    )
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
 from celery import Celery
+from celery.schedules import crontab
 import os
 
+from app.services.tracing import instrument_celery
+
 celery_app = Celery(
     "applymate",
     broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
     backend=os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1"),
     include=[
-        "app.workers.applicator"
+        "app.workers.applicator",
+        "app.workers.maintenance",
     ]
 )
 
@@ -19,4 +23,14 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=300,
     task_soft_time_limit=270,
+    beat_schedule={
+        "compact-database": {
+            "task": "app.workers.maintenance.compact_database_task",
+            "schedule": crontab(
+                hour=int(os.getenv("COMPACTION_HOUR_UTC", "3")), minute=0
+            ),
+        },
+    },
 )
+
+instrument_celery()
@@ -0,0 +1,55 @@
+r"""
+Run the retention / compaction job by hand (same code as the nightly Celery beat task).
+
+Usage:
+    python scripts/compact_db.py --dry-run
+    python scripts/compact_db.py --resume-events-days 14 --skip-vacuum
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.database import init_db
+from app.services.compaction import RETENTION_DEFAULTS, get_retention_days, run_compaction
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact event/scan tables and delete orphaned files")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without writing")
+    parser.add_argument("--skip-vacuum", action="store_true", help="Do not run VACUUM/ANALYZE afterwards")
+    for name, (env, default) in RETENTION_DEFAULTS.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}-days",
+            type=int,
+            default=None,
+            dest=name,
+            help=f"Retention for {name} in days (env {env}, default {default}, 0 disables)",
+        )
+    args = parser.parse_args()
+
+    overrides = {name: getattr(args, name) for name in RETENTION_DEFAULTS}
+    days = get_retention_days(overrides)
+
+    init_db()
+
+    print(f"\n{'='*60}")
+    print(f"Mode: {'DRY RUN' if args.dry_run else 'LIVE'}")
+    for name, value in days.items():
+        print(f"  {name}: {value} days" if value else f"  {name}: disabled")
+    print(f"{'='*60}")
+
+    stats = run_compaction(overrides, dry_run=args.dry_run, vacuum=not args.skip_vacuum)
+
+    print()
+    for step, count in stats.items():
+        print(f"  {step}: {count}")
+    print(f"\n{'='*60}")
+    print("DRY RUN complete, nothing was changed." if args.dry_run else "Compaction complete.")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
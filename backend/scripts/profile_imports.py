@@ -0,0 +1,112 @@
+r"""
+Import-time profile of the API (what a cold worker pays before serving a request).
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and
+summarises the per-module timings by top-level package.
+
+Usage:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --top 30 --module app.api.routes.jobs
+    python scripts/profile_imports.py --preload    # also time app.services.preload.preload()
+    python scripts/profile_imports.py --json > import_profile.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import time
+t = time.perf_counter()
+import {module}
+print("IMPORT_SECONDS", time.perf_counter() - t)
+if {preload}:
+    from app.services.preload import preload
+    t = time.perf_counter()
+    preload()
+    print("PRELOAD_SECONDS", time.perf_counter() - t)
+"""
+
+
+def run_profile(module: str, preload: bool = False) -> Tuple[List[Tuple[str, int, int, int]], Dict[str, float]]:
+    """((module, depth, self_us, cumulative_us) rows, wall-clock timings) from a fresh interpreter."""
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR}
+    env.setdefault("PRELOAD_MODE", "off")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, preload=preload)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(proc.returncode)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    timings = {}
+    for line in proc.stdout.splitlines():
+        key, _, value = line.partition(" ")
+        if key in ("IMPORT_SECONDS", "PRELOAD_SECONDS"):
+            timings[key.lower()] = round(float(value), 4)
+    return rows, timings
+
+
+def by_package(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """Self time (us) summed per top-level package."""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, _, self_us, _ in rows:
+        totals[name.split(".", 1)[0]] += self_us
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile module import time of the API")
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=20, help="Rows to show per table")
+    parser.add_argument("--preload", action="store_true", help="Also time app.services.preload.preload() after the import")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    rows, timings = run_profile(args.module, args.preload)
+    packages = by_package(rows)
+    slowest = sorted(rows, key=lambda r: -r[3])
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            **timings,
+            "modules_imported": len(rows),
+            "packages_ms": {k: round(v / 1000, 1) for k, v in list(packages.items())[: args.top]},
+            "slowest_cumulative_ms": {r[0]: round(r[3] / 1000, 1) for r in slowest[: args.top]},
+        }, indent=2))
+        return
+
+    print(f"\n{'='*60}")
+    print(f"import {args.module}: {timings.get('import_seconds', 0) * 1000:.0f} ms wall, {len(rows)} modules")
+    if "preload_seconds" in timings:
+        print(f"preload(): {timings['preload_seconds'] * 1000:.0f} ms")
+    print(f"{'='*60}")
+    print(f"\n{'Package':<40} {'self ms':>10}")
+    for name, self_us in list(packages.items())[: args.top]:
+        print(f"{name:<40} {self_us / 1000:>10.1f}")
+    print(f"\n{'Module (cumulative)':<50} {'ms':>10}")
+    for name, depth, _, cumulative_us in slowest[: args.top]:
+        print(f"{name:<50} {cumulative_us / 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Tests for batch job scoring with and without numpy
+"""
+
+import pytest
+
+from app.services import embeddings
+from app.services.embeddings import batch_match_scores
+
+
+RESUME = """Jane Doe
+Backend Engineer
+
+Skills
+Python, FastAPI, PostgreSQL, AWS, Docker, Kubernetes
+
+Experience
+Senior Engineer, Acme (2019 - 2024)
+- Built Python APIs with FastAPI and PostgreSQL
+- Ran services on AWS with Docker and Kubernetes
+"""
+
+JOBS = [
+    """Backend Engineer
+Requirements
+- 3+ years of Python
+- Experience with FastAPI or Django
+- PostgreSQL and AWS
+""",
+    """Line Cook
+Responsibilities
+- Prepare meals to recipe standards
+- Keep the kitchen clean
+""",
+    "Platform engineer running Kubernetes and Docker on AWS",
+    "",
+]
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    monkeypatch.setattr(embeddings, "np", None)
+
+
+def test_pure_python_scores(pure_python):
+    scores = batch_match_scores(RESUME, JOBS)
+    assert len(scores) == len(JOBS)
+    assert all(0 <= score <= 100 for score in scores)
+    assert scores[0] > scores[1]
+    assert batch_match_scores(RESUME, []) == []
+
+
+def test_numpy_matches_pure_python(monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = batch_match_scores(RESUME, JOBS)
+    monkeypatch.setattr(embeddings, "np", None)
+    assert with_numpy == batch_match_scores(RESUME, JOBS)
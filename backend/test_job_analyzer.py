@@ -0,0 +1,38 @@
+"""
+Tests for verifying an LLM job analysis against the local one
+"""
+
+from app.services.job_analyzer import analyze_job_locally, verify_with_local
+from app.services.resume_schema import JobAnalysis
+
+
+JD = """Backend Engineer
+
+Requirements
+- 3+ years building RESTful services in Python
+- ReactJS for internal tools
+- Strong stakeholder management
+"""
+
+
+def _verify(skills):
+    llm = JobAnalysis(raw_text=JD, required_skills=skills)
+    return verify_with_local(llm, analyze_job_locally(JD))
+
+
+def test_reworded_taxonomy_skills_are_kept():
+    analysis, changes = _verify(["REST APIs", "React", "python"])
+    assert {"REST APIs", "React", "python"} <= set(analysis.required_skills)
+    assert changes["dropped"] == []
+
+
+def test_skills_outside_the_taxonomy_are_kept():
+    analysis, changes = _verify(["Stakeholder Management", "Vendor negotiation"])
+    assert "Vendor negotiation" in analysis.required_skills
+    assert changes["dropped"] == []
+
+
+def test_unmentioned_taxonomy_skills_are_dropped():
+    analysis, changes = _verify(["Kubernetes", "Django"])
+    assert "Kubernetes" not in analysis.required_skills
+    assert changes["dropped"] == ["Kubernetes", "Django"]
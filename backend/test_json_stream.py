@@ -0,0 +1,46 @@
+"""
+Tests for StreamSink ownership of partial fields
+"""
+
+from app.services.json_stream import StreamSink
+
+
+def _events(sink):
+    events = []
+    while not sink._queue.empty():
+        events.append(sink._queue.get_nowait())
+    return events
+
+
+def test_racing_streams_do_not_interleave_after_reset():
+    sink = StreamSink()
+    first, second = object(), object()
+
+    sink.publish_partial(first, "basics", "first basics")
+    sink.publish_partial(second, "basics", "second basics")
+    sink.publish_partial(first, "work", "first work")
+    sink.publish_partial(second, "work", "second work")
+    sink.release(first)
+    sink.publish_partial(second, "skills", "second skills")
+    # A late write from the abandoned attempt must not reach the client
+    sink.publish_partial(first, "skills", "first skills")
+
+    events = _events(sink)
+    reset = events.index(("reset", {}))
+    assert [data["value"] for _, data in events[:reset]] == ["first basics", "first work"]
+    assert [data["value"] for _, data in events[reset + 1:]] == [
+        "second basics", "second work", "second skills",
+    ]
+
+
+def test_released_loser_leaves_owner_alone():
+    sink = StreamSink()
+    winner, loser = object(), object()
+    sink.publish_partial(winner, "basics", 1)
+    sink.publish_partial(loser, "basics", 2)
+    sink.release(loser)
+    sink.publish_partial(winner, "work", 3)
+    assert _events(sink) == [
+        ("partial", {"field": "basics", "value": 1}),
+        ("partial", {"field": "work", "value": 3}),
+    ]
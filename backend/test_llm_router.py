@@ -0,0 +1,79 @@
+"""
+Tests for LLM route selection and hedging
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+from app.services import llm_router
+from app.services.llm_router import GEMINI_FALLBACK_MODEL, Route, routes_for
+
+
+def test_direct_gemini_route_uses_gemini_model_name(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "key")
+    monkeypatch.delenv("LLM_PREMIUM_ROUTES", raising=False)
+    routes = routes_for("premium", "google/gemini-2.0-flash-001:free")
+    assert routes[0] == Route("gemini", "gemini-2.0-flash-001")
+    assert routes[1].provider == "openrouter"
+
+
+def test_configured_gemini_route_is_normalised(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "key")
+    monkeypatch.setenv("LLM_CHEAP_ROUTES", "openrouter:qwen/qwen3-coder:free,gemini:google/gemini-2.5-pro")
+    assert routes_for("cheap", "qwen/qwen3-coder:free")[1] == Route("gemini", "gemini-2.5-pro")
+
+
+def test_non_gemini_model_falls_back_to_default_gemini(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "key")
+    monkeypatch.setenv("LLM_CHEAP_ROUTES", "gemini:anthropic/claude-3-haiku")
+    assert routes_for("cheap", "x") == [Route("gemini", GEMINI_FALLBACK_MODEL)]
+
+
+def test_gemini_routes_need_a_key(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.delenv("LLM_STANDARD_ROUTES", raising=False)
+    assert routes_for("standard", "google/gemini-2.0-flash-001") == [
+        Route("openrouter", "google/gemini-2.0-flash-001")
+    ]
+
+
+@dataclass
+class Usage:
+    step: str = "test"
+    tier: str = "premium"
+    provider: str = ""
+    model: str = ""
+    latency_ms: float = 0.0
+    success: bool = False
+    error: str = ""
+    retries: int = 0
+    hedged: bool = False
+    fallbacks: int = 0
+
+
+def _race(monkeypatch, warm: bool):
+    monkeypatch.setattr(llm_router, "HEDGE_MIN_DELAY_S", 0.01)
+    router = llm_router.LLMRouter()
+    slow, fast = Route("openrouter", "slow"), Route("gemini", "fast")
+    if warm:
+        for _ in range(llm_router.HEDGE_MIN_SAMPLES):
+            router._observe_latency(slow, 0.01)
+    called = []
+
+    async def call(route, usage, retries):
+        called.append(route.model_id)
+        await asyncio.sleep(0.2 if route is slow else 0)
+        return route.model_id
+
+    usage = Usage()
+    result = asyncio.run(router.call([slow, fast], call, usage, 1))
+    return result, called, usage.hedged
+
+
+def test_cold_route_is_not_hedged(monkeypatch):
+    monkeypatch.setattr(llm_router, "HEDGE_COLD_DELAY_S", None)
+    assert _race(monkeypatch, warm=False) == ("slow", ["slow"], False)
+
+
+def test_warm_route_is_hedged_after_p95(monkeypatch):
+    assert _race(monkeypatch, warm=True) == ("fast", ["slow", "fast"], True)
@@ -0,0 +1,49 @@
+"""
+Tests for job description boilerplate stripping
+"""
+
+import pytest
+
+from app.services.prompt_compactor import strip_jd_boilerplate
+
+
+JD = """Senior Engineer
+
+{heading}
+- Design data retention controls
+- Review systems with product teams
+
+Requirements
+- 5+ years of Python
+"""
+
+
+@pytest.mark.parametrize("heading", [
+    "Privacy Engineering Responsibilities",
+    "Diversity Data Analyst duties",
+    "Inclusion Program Manager",
+    "EEO Reporting Analyst",
+    "Accommodations Specialist Duties",
+    "Legal",
+])
+def test_real_sections_are_kept(heading):
+    text = strip_jd_boilerplate(JD.format(heading=heading))
+    assert heading in text
+    assert "Design data retention controls" in text
+
+
+@pytest.mark.parametrize("heading", [
+    "Privacy Notice",
+    "Applicant Privacy Policy",
+    "Diversity, Equity & Inclusion",
+    "Diversity and Inclusion",
+    "Equal Opportunity Employer",
+    "EEO Statement",
+    "Reasonable Accommodations",
+    "Benefits:",
+    "## Legal Disclaimer",
+])
+def test_boilerplate_sections_are_dropped(heading):
+    text = strip_jd_boilerplate(JD.format(heading=heading))
+    assert "Design data retention controls" not in text
+    assert "5+ years of Python" in text
@@ -0,0 +1,73 @@
+"""
+Tests for section-level tailoring: section keys, merge and re-tailoring plans
+"""
+
+from app.services.resume_schema import JobAnalysis, ResumeSchema, WorkExperience
+from app.services.section_tailor import (
+    merge_sections,
+    plan_retailoring,
+    section_sources,
+    work_keys,
+)
+
+
+def _resume():
+    return ResumeSchema(work=[
+        WorkExperience(name="Acme", position="Engineer", start_date="2016", highlights=["Built billing"]),
+        WorkExperience(name="Globex", position="Lead", start_date="2019", highlights=["Ran platform team"]),
+        WorkExperience(name="Acme", position="Engineer", start_date="2022", highlights=["Built search"]),
+    ])
+
+
+def _job():
+    return JobAnalysis(job_title="Engineer", required_skills=["search", "billing"])
+
+
+def test_repeated_company_and_title_get_distinct_keys():
+    resume = _resume()
+    keys = work_keys(resume.work)
+    assert len(set(keys)) == 3
+    sources = section_sources(resume)
+    assert sources[keys[0]]["highlights"] == ["Built billing"]
+    assert sources[keys[2]]["highlights"] == ["Built search"]
+
+
+def test_same_stint_twice_gets_suffix():
+    entry = WorkExperience(name="Acme", position="Engineer", start_date="2016")
+    keys = work_keys([entry, entry])
+    assert keys[1] == f"{keys[0]}#2"
+
+
+def test_merge_keeps_each_stints_own_output():
+    resume = _resume()
+    keys = work_keys(resume.work)
+    outputs = {
+        key: entry.model_copy(update={"highlights": [f"Tailored: {entry.highlights[0]}"]})
+        for key, entry in zip(keys, resume.work)
+    }
+    tailored = merge_sections(resume, outputs, {})
+    assert [w.highlights for w in tailored.work] == [
+        ["Tailored: Built billing"],
+        ["Tailored: Ran platform team"],
+        ["Tailored: Built search"],
+    ]
+    assert [w.start_date for w in tailored.work] == ["2016", "2019", "2022"]
+
+
+def test_retailoring_reuses_repeated_stints_separately():
+    resume, job = _resume(), _job()
+    fingerprints, stale, reusable = plan_retailoring(resume, job, None)
+    outputs = {
+        key: entry.model_copy(update={"summary": f"run 1 #{i}"})
+        for i, (key, entry) in enumerate(zip(work_keys(resume.work), resume.work))
+    }
+    previous = merge_sections(resume, outputs, fingerprints)
+
+    edited = resume.model_copy(deep=True)
+    edited.work[1].highlights.append("Hired four engineers")
+    fingerprints, stale, reusable = plan_retailoring(edited, job, previous)
+
+    keys = work_keys(edited.work)
+    assert stale == [keys[1]]
+    assert reusable[keys[0]].summary == "run 1 #0"
+    assert reusable[keys[2]].summary == "run 1 #2"